@@ -0,0 +1,32 @@
+"""add users.token_generation
+
+Revision ID: 7c1d9e2f4a60
+Revises: 25f41e3ab2e0
+Create Date: 2026-10-17 02:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d9e2f4a60'
+down_revision: Union[str, Sequence[str], None] = '25f41e3ab2e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('token_generation', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_generation')
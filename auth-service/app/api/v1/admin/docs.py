@@ -27,3 +27,20 @@ ADMIN_USER_DATA_DOCS = {
         status.HTTP_401_UNAUTHORIZED: {"description": "Unauthorized access"},
     },
 }
+
+ADMIN_LOCKOUTS_DOCS = {
+    "summary": "Login lockout status",
+    "description": (
+        "Admin-only. Failed-login count and lockout state for up to 100 "
+        "accounts, read from Redis in one round trip. Unknown emails report "
+        "zero failures."
+    ),
+    "responses": {
+        status.HTTP_200_OK: {"description": "Lockout status returned"},
+        status.HTTP_403_FORBIDDEN: {"description": "Forbidden - insufficient role"},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Unauthorized access"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Redis unavailable or its circuit breaker open"
+        },
+    },
+}
@@ -3,15 +3,20 @@ File: app/api/v1/admin/router.py
 Admin-related API routes with RBAC and OpenAPI docs.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, status
+from pydantic import EmailStr
 
+from app.core.circuit_breaker import DependencyUnavailableError
+from app.core.principal import Principal
 from app.core.rbac import require_roles
 from app.db.models import UserRole
+from app.services.login_attempts import get_lockouts
+from app.utils.response import error_response
 
-from .docs import ADMIN_DASHBOARD_DOCS, ADMIN_USER_DATA_DOCS
-from .schemas import AdminDashboardResponse, AdminUserDataEnvelope
+from .docs import ADMIN_DASHBOARD_DOCS, ADMIN_LOCKOUTS_DOCS, ADMIN_USER_DATA_DOCS
+from .schemas import AdminDashboardResponse, AdminUserDataEnvelope, LockoutsResponse
 
 # ⚠ router must be defined BEFORE using @router.get decorators
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -19,19 +24,34 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/dashboard", response_model=AdminDashboardResponse, **ADMIN_DASHBOARD_DOCS)
 async def admin_dashboard(
-    current_user: Dict[str, Any] = Depends(require_roles([UserRole.ADMIN])),
+    current_user: Principal = Depends(require_roles([UserRole.ADMIN])),
 ) -> Dict[str, Any]:
     """Admin-only dashboard endpoint."""
-    message = f"Welcome, admin {current_user['email']} with role {current_user['role']}"
+    message = f"Welcome, admin {current_user.email} with role {current_user.role}"
     return {"message": message}
 
 
 @router.get("/user-data", response_model=AdminUserDataEnvelope, **ADMIN_USER_DATA_DOCS)
 async def admin_user_data(
-    current_user: Dict[str, Any] = Depends(
-        require_roles([UserRole.USER, UserRole.ADMIN])
-    ),
+    current_user: Principal = Depends(require_roles([UserRole.USER, UserRole.ADMIN])),
 ) -> Dict[str, Any]:
     """Endpoint accessible by users or admins to view their own data."""
-    data = {"user": {"email": current_user["email"], "role": current_user["role"]}}
+    data = {"user": {"email": current_user.email, "role": current_user.role}}
     return {"user": data["user"], "message": "User data retrieved successfully"}
+
+
+@router.get("/lockouts", response_model=LockoutsResponse, **ADMIN_LOCKOUTS_DOCS)
+async def admin_lockouts(
+    emails: List[EmailStr] = Query(..., min_length=1, max_length=100),
+    current_user: Principal = Depends(require_roles([UserRole.ADMIN])),
+) -> Dict[str, Any]:
+    """Failed-login counts and lockouts for the given accounts."""
+    try:
+        lockouts = await get_lockouts([str(email) for email in emails])
+    except DependencyUnavailableError as exc:
+        return error_response(
+            code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message="Lockout status unavailable",
+            details=str(exc),
+        )
+    return {"lockouts": lockouts, "message": "Lockout status retrieved successfully"}
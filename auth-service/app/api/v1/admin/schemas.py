@@ -3,6 +3,8 @@ File: app/api/v1/admin/schemas.py
 Pydantic schemas for admin endpoints.
 """
 
+from typing import List
+
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -24,3 +26,19 @@ class AdminUserDataEnvelope(BaseModel):
 
     user: AdminUserDataResponse
     message: str = Field(..., description="Response message")
+
+
+class LockoutStatus(BaseModel):
+    """Failed-login state of one account."""
+
+    email: EmailStr = Field(..., description="Account email")
+    failures: int = Field(..., description="Failed logins in the current window")
+    locked: bool = Field(..., description="Whether logins are currently refused")
+    retry_after: float = Field(..., description="Seconds until the lock expires")
+
+
+class LockoutsResponse(BaseModel):
+    """Response schema for bulk lockout status."""
+
+    lockouts: List[LockoutStatus]
+    message: str = Field(..., description="Response message")
@@ -15,6 +15,9 @@ REGISTER_DOCS = {
         status.HTTP_201_CREATED: {"description": "User registered successfully"},
         status.HTTP_400_BAD_REQUEST: {"description": "User already exists"},
         status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Password hashing overloaded, see Retry-After"
+        },
     },
 }
 
@@ -23,35 +26,86 @@ LOGIN_DOCS = {
     "description": (
         "Authenticates a user with email and password. "
         "Returns access and refresh tokens. "
-        "Rate limited per IP + email to prevent brute force attacks."
+        "Rate limited per IP + email to prevent brute force attacks. "
+        "Repeated failures lock the account for progressively longer."
     ),
     "responses": {
         status.HTTP_200_OK: {"description": "Login successful"},
         status.HTTP_401_UNAUTHORIZED: {"description": "Invalid credentials"},
-        status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Rate limit exceeded"},
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Rate limit exceeded or account locked, see Retry-After"
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Password hashing overloaded, see Retry-After"
+        },
     },
 }
 
 REFRESH_DOCS = {
     "summary": "Refresh access token",
     "description": (
-        "Generates a new access token using a valid refresh token. "
-        "Refresh tokens may be revoked (blacklisted)."
+        "Exchanges a refresh token for a new access and refresh token pair. "
+        "Each refresh token works once: presenting one that was already "
+        "rotated away revokes its whole session, except within "
+        "REFRESH_TOKEN_GRACE_SECONDS of the rotation, when concurrent "
+        "requests (e.g. several tabs) all receive the same new pair. Access "
+        "tokens and refresh tokens issued before rotation are rejected."
     ),
     "responses": {
-        status.HTTP_200_OK: {"description": "Access token refreshed"},
-        status.HTTP_401_UNAUTHORIZED: {"description": "Invalid or revoked token"},
+        status.HTTP_200_OK: {"description": "Tokens refreshed"},
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Invalid, revoked or reused refresh token"
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Session store unavailable, see Retry-After"
+        },
     },
 }
 
 LOGOUT_DOCS = {
     "summary": "Logout (revoke refresh token)",
     "description": (
-        "Invalidates a refresh token by adding it to the blacklist. "
-        "Prevents further use of this token."
+        "Invalidates a refresh token by adding it to the blacklist, and "
+        "revokes every later token rotated from the same login."
     ),
     "responses": {
         status.HTTP_200_OK: {"description": "Token revoked successfully"},
         status.HTTP_401_UNAUTHORIZED: {"description": "Invalid refresh token"},
     },
 }
+
+LOGOUT_ALL_DOCS = {
+    "summary": "Log out everywhere",
+    "description": (
+        "Revokes every access and refresh token issued to the current user "
+        "so far, on all devices. Tokens issued afterwards are unaffected. "
+        "Takes effect on every worker within a pub/sub round trip."
+    ),
+    "responses": {
+        status.HTTP_200_OK: {"description": "All sessions revoked"},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Revocation could not be published, retry"
+        },
+    },
+}
+
+INTROSPECT_DOCS = {
+    "summary": "Batch token introspection",
+    "description": (
+        "Verifies up to 100 tokens in one call for gateways and internal "
+        "services. Signatures are checked locally and all revocation "
+        "lookups are resolved in a single Redis round trip. Returns claims, "
+        "expiry and revocation status per token, in request order. A token "
+        "only reveals its own claims, so no extra credentials are required."
+    ),
+    "responses": {
+        status.HTTP_200_OK: {"description": "Per-token results returned"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Empty list or more than 100 tokens"
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Revocation status unavailable"
+        },
+    },
+}
@@ -3,26 +3,89 @@ File: app/api/v1/auth/router.py
 Authentication endpoints with JWT, Redis-based rate limiting, and robust error handling.
 """
 
+import math
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.hashing import hash_password, verify_password
+from app.core.circuit_breaker import DependencyUnavailableError
+from app.core.hashing import (
+    HashingOverloadedError,
+    hash_password_async,
+    verify_and_update_password_async,
+)
+from app.core.principal import Principal, get_principal
 from app.core.rate_limiter import RateLimiter, get_rate_limiter
-from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    is_refresh_token,
+)
 from app.db import crud
 from app.db.models import User, UserRole
+from app.db.replicas import get_read_db, replica_router
 from app.db.schemas import UserCreate, UserLogin
 from app.db.session import get_db
-from app.services.token_blacklist import add_to_blacklist, is_blacklisted
+from app.services.auth_service import introspect_tokens
+from app.services.login_attempts import (
+    clear_failures,
+    lockout_remaining,
+    record_failure,
+)
+from app.services.refresh_tokens import revoke_family, rotate_refresh_token
+from app.services.token_blacklist import (
+    add_to_blacklist,
+    is_blacklisted,
+    session_generation,
+)
+from app.services.user_cache import user_cache
+from app.services.user_service import (
+    revoke_all_sessions,
+    store_upgraded_password_hash,
+)
 from app.utils.response import error_response, success_response
 
-from .schemas import TokenLogoutRequest, TokenRefreshRequest
+from .docs import INTROSPECT_DOCS, LOGOUT_ALL_DOCS, REFRESH_DOCS
+from .schemas import (
+    LogoutAllEnvelope,
+    TokenIntrospectRequest,
+    TokenIntrospectResponse,
+    TokenLogoutRequest,
+    TokenRefreshRequest,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _overloaded_response(exc: HashingOverloadedError) -> Dict[str, Any]:
+    """503 telling the client when the hashing backlog should have drained."""
+    return error_response(
+        code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        message="Service is busy, please retry shortly",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _unavailable_response(exc: DependencyUnavailableError) -> Dict[str, Any]:
+    """503 while a Redis-backed check that fails closed is unavailable."""
+    return error_response(
+        code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        message="Service temporarily unavailable, please retry shortly",
+        headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+    )
+
+
+def _locked_response(retry_after: float) -> Dict[str, Any]:
+    """429 for an account locked after repeated failed logins."""
+    return error_response(
+        code=status.HTTP_429_TOO_MANY_REQUESTS,
+        message="Too many failed login attempts, please retry later",
+        headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+    )
+
+
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(
     request: Request,
@@ -31,9 +94,9 @@ async def register(
     limiter: RateLimiter = Depends(get_rate_limiter),
     role: Optional[UserRole] = UserRole.USER,
 ) -> Dict[str, Any]:
-    """Register a new user (rate limited per IP)."""
+    """Register a new user (rate limited by the ``register`` policies)."""
     try:
-        await limiter.check(request)
+        await limiter.enforce(request, "register")
 
         existing_user = await crud.get_user_by_email(db, user.email)
         if existing_user:
@@ -42,15 +105,23 @@ async def register(
                 message="User with this email already exists",
             )
 
-        hashed_pw = hash_password(user.password)
+        hashed_pw = await hash_password_async(user.password)
         new_user = User(email=user.email, hashed_password=hashed_pw, role=role)
         db.add(new_user)
         await db.commit()
         await db.refresh(new_user)
+        replica_router.mark_written(user.email)
+        await user_cache.invalidate(user.email)
 
         data = {"user_id": new_user.id, "role": new_user.role.value}
         return success_response(data=data, message="User registered successfully")
 
+    except HTTPException:
+        raise
+    except HashingOverloadedError as exc:
+        return _overloaded_response(exc)
+    except DependencyUnavailableError as exc:
+        return _unavailable_response(exc)
     except Exception as exc:
         return error_response(
             code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -63,27 +134,56 @@ async def register(
 async def login(
     request: Request,
     user: UserLogin,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_read_db),
     limiter: RateLimiter = Depends(get_rate_limiter),
 ) -> Dict[str, Any]:
-    """Authenticate user and return JWT tokens (rate limited per IP + email)."""
+    """Authenticate user and return JWT tokens (``login`` rate limit policies)."""
     try:
-        await limiter.check(request, identifier=user.email)
+        await limiter.enforce(request, "login", email=user.email)
+
+        # Locked accounts are rejected before the user lookup and bcrypt
+        locked_for = await lockout_remaining(user.email)
+        if locked_for:
+            return _locked_response(locked_for)
 
-        db_user = await crud.get_user_by_email(db, user.email)
+        db_user = await user_cache.get_by_email(db, user.email, with_password=True)
         if not db_user or not isinstance(db_user.hashed_password, str):
+            await record_failure(user.email)
+            await limiter.count_failure(request, "login", email=user.email)
             return error_response(
                 code=status.HTTP_401_UNAUTHORIZED, message="Invalid credentials"
             )
 
-        if not verify_password(user.password, db_user.hashed_password):
+        valid, upgraded_hash = await verify_and_update_password_async(
+            user.password, db_user.hashed_password
+        )
+        if not valid:
+            await record_failure(user.email)
+            await limiter.count_failure(request, "login", email=user.email)
             return error_response(
                 code=status.HTTP_401_UNAUTHORIZED, message="Invalid credentials"
             )
+        await clear_failures(user.email)
+        if upgraded_hash:
+            background_tasks.add_task(
+                store_upgraded_password_hash,
+                db_user.id,
+                db_user.email,
+                db_user.hashed_password,
+                upgraded_hash,
+            )
 
-        access_token = create_access_token(email=db_user.email, role=db_user.role.value)
+        # A cached record or a lagging replica may predate a recent
+        # "log out everywhere"
+        generation = max(
+            db_user.token_generation, await session_generation(db_user.email)
+        )
+        access_token = create_access_token(
+            email=db_user.email, role=db_user.role.value, generation=generation
+        )
         refresh_token, _ = create_refresh_token(
-            email=db_user.email, role=db_user.role.value
+            email=db_user.email, role=db_user.role.value, generation=generation
         )
 
         data = {
@@ -95,6 +195,12 @@ async def login(
         }
         return success_response(data=data, message="Login successful")
 
+    except HTTPException:
+        raise
+    except HashingOverloadedError as exc:
+        return _overloaded_response(exc)
+    except DependencyUnavailableError as exc:
+        return _unavailable_response(exc)
     except Exception as exc:
         return error_response(
             code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -103,13 +209,19 @@ async def login(
         )
 
 
-@router.post("/refresh")
+@router.post("/refresh", **REFRESH_DOCS)
 async def refresh_token(token_request: TokenRefreshRequest) -> Dict[str, Any]:
-    """Refresh access token using a valid refresh token."""
+    """Rotate a refresh token: issue a new token pair and retire the old one."""
     try:
         payload = decode_token(token_request.refresh_token)
+        # Access tokens (and pre-rotation refresh tokens, which had no family)
+        # must not be renewable here
+        if not is_refresh_token(payload):
+            return error_response(
+                code=status.HTTP_401_UNAUTHORIZED, message="Not a refresh token"
+            )
         jti: str = payload.get("jti", "")
-        if jti and await is_blacklisted(jti):
+        if jti and await is_blacklisted(jti, payload.get("exp")):
             return error_response(
                 code=status.HTTP_401_UNAUTHORIZED, message="Refresh token revoked"
             )
@@ -120,17 +232,43 @@ async def refresh_token(token_request: TokenRefreshRequest) -> Dict[str, Any]:
             return error_response(
                 code=status.HTTP_401_UNAUTHORIZED, message="Invalid token payload"
             )
+        generation = payload.get("gen", 0)
+        if generation < await session_generation(email):
+            return error_response(
+                code=status.HTTP_401_UNAUTHORIZED, message="Refresh token revoked"
+            )
+
+        access_token = create_access_token(
+            email=email, role=role, generation=generation
+        )
+        family: str = payload["fam"]
+        new_refresh_token, new_jti = create_refresh_token(
+            email=email, role=role, generation=generation, family=family
+        )
+        rotation = await rotate_refresh_token(
+            family,
+            jti,
+            new_jti,
+            {"access_token": access_token, "refresh_token": new_refresh_token},
+        )
+        if rotation.tokens is None:
+            message = (
+                "Refresh token reuse detected, please log in again"
+                if rotation.status == "reused"
+                else "Refresh token revoked"
+            )
+            return error_response(code=status.HTTP_401_UNAUTHORIZED, message=message)
 
-        access_token = create_access_token(email=email, role=role)
         data = {
-            "access_token": access_token,
-            "refresh_token": None,
+            **rotation.tokens,
             "token_type": "bearer",
             "role": role,
             "email": email,
         }
-        return success_response(data=data, message="Access token refreshed")
+        return success_response(data=data, message="Tokens refreshed")
 
+    except DependencyUnavailableError as exc:
+        return _unavailable_response(exc)
     except Exception as exc:
         return error_response(
             code=status.HTTP_401_UNAUTHORIZED,
@@ -152,11 +290,57 @@ async def logout(token_request: TokenLogoutRequest) -> Dict[str, Any]:
             )
 
         await add_to_blacklist(jti, exp)
+        family = payload.get("fam")
+        if family:
+            await revoke_family(family)
         return success_response(data={}, message="Refresh token revoked successfully")
 
+    except DependencyUnavailableError as exc:
+        return _unavailable_response(exc)
     except Exception as exc:
         return error_response(
             code=status.HTTP_401_UNAUTHORIZED,
             message="Invalid refresh token",
             details=str(exc),
         )
+
+
+@router.post("/logout-all", response_model=LogoutAllEnvelope, **LOGOUT_ALL_DOCS)
+async def logout_all(
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Revoke every token issued to the current user so far."""
+    if principal.email is None:
+        return error_response(
+            code=status.HTTP_401_UNAUTHORIZED, message="Invalid token payload"
+        )
+    try:
+        generation = await revoke_all_sessions(db, principal.email)
+    except Exception as exc:
+        return error_response(
+            code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message="Session revocation failed, please retry",
+            details=str(exc),
+        )
+    if generation is None:
+        return error_response(
+            code=status.HTTP_401_UNAUTHORIZED, message="User no longer exists"
+        )
+    return success_response(
+        data={"token_generation": generation}, message="All sessions revoked"
+    )
+
+
+@router.post("/introspect", response_model=TokenIntrospectResponse, **INTROSPECT_DOCS)
+async def introspect(body: TokenIntrospectRequest) -> Dict[str, Any]:
+    """Verify a batch of tokens and report claims and revocation status."""
+    try:
+        results = await introspect_tokens(body.tokens)
+    except Exception as exc:
+        return error_response(
+            code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message="Token revocation status unavailable",
+            details=str(exc),
+        )
+    return success_response(data={"results": results}, message="Tokens introspected")
@@ -3,8 +3,12 @@ File: app/api/v1/auth/schemas.py
 Pydantic schemas for authentication endpoints.
 """
 
+from typing import Any, Dict, List
+
 from pydantic import BaseModel, EmailStr, Field
 
+MAX_INTROSPECT_TOKENS = 100
+
 
 class TokenRefreshRequest(BaseModel):
     """Request schema for refreshing an access token."""
@@ -23,16 +27,70 @@ class AuthTokensResponse(BaseModel):
 
     access_token: str = Field(..., description="JWT access token")
     refresh_token: str | None = Field(
-        None, description="JWT refresh token (login only)"
+        None, description="JWT refresh token, rotated on every refresh"
     )
     token_type: str = Field(default="bearer", description="Token type")
     role: str = Field(..., description="User role")
     email: EmailStr = Field(..., description="User email")
 
 
+class LogoutAllResponse(BaseModel):
+    """Response schema for revoking every session of the current user."""
+
+    token_generation: int = Field(
+        ..., description="New token generation; older tokens are rejected"
+    )
+
+
+class LogoutAllEnvelope(BaseModel):
+    """Envelope response for /logout-all endpoint."""
+
+    status: str = Field("success", description="Response status")
+    message: str = Field(..., description="Response message")
+    data: LogoutAllResponse
+
+
 class RegisterResponse(BaseModel):
     """Response schema for user registration."""
 
     message: str = Field(..., description="Response message")
     user_id: int = Field(..., description="Newly created user ID")
     role: str = Field(..., description="Assigned user role")
+
+
+class TokenIntrospectRequest(BaseModel):
+    """Request schema for batch token introspection."""
+
+    tokens: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_INTROSPECT_TOKENS,
+        description=f"Up to {MAX_INTROSPECT_TOKENS} access or refresh tokens",
+    )
+
+
+class TokenIntrospectResult(BaseModel):
+    """Verification result for one token."""
+
+    active: bool = Field(..., description="Valid signature, not expired or revoked")
+    revoked: bool = Field(
+        ...,
+        description="Token ID is on the blacklist, or all sessions of the user "
+        "were revoked after it was issued",
+    )
+    typ: str | None = Field(
+        None,
+        description="Token type, access or refresh; only access tokens "
+        "authenticate requests",
+    )
+    exp: int | None = Field(None, description="Expiry timestamp (Unix epoch)")
+    claims: Dict[str, Any] | None = Field(None, description="Verified claims")
+    error: str | None = Field(None, description="Why verification failed")
+
+
+class TokenIntrospectResponse(BaseModel):
+    """Response schema for batch token introspection."""
+
+    results: List[TokenIntrospectResult] = Field(
+        ..., description="One result per requested token, in order"
+    )
@@ -29,7 +29,10 @@ DATABASE_HEALTH_DOCS = {
 
 REDIS_HEALTH_DOCS = {
     "summary": "Redis health",
-    "description": "Check Redis cache connectivity.",
+    "description": (
+        "Check Redis cache connectivity and report the state of the "
+        "circuit breakers around Redis-backed features."
+    ),
     "responses": {
         status.HTTP_200_OK: {"description": "Redis is healthy"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
@@ -40,7 +43,10 @@ REDIS_HEALTH_DOCS = {
 
 FULL_HEALTH_DOCS = {
     "summary": "Full system health",
-    "description": "Check server, database, and Redis in a combined response.",
+    "description": (
+        "Check server, database, and Redis in a combined response, with "
+        "circuit breaker states."
+    ),
     "responses": {
         status.HTTP_200_OK: {"description": "All services are healthy"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
@@ -48,3 +54,22 @@ FULL_HEALTH_DOCS = {
         },
     },
 }
+
+METRICS_DOCS = {
+    "summary": "Runtime metrics",
+    "description": (
+        "Worker-local counters for capacity planning: password hashing "
+        "queue depth, wait time and load shedding; verified-token cache "
+        "hit/miss/eviction counts; forward-auth micro-cache counts; Redis "
+        "connection pool in-use/idle connections; database pool "
+        "checked-out/overflow connections and wait time; read replica "
+        "health, lag, latency and routing counters; local rate limit tier "
+        "and IP blocklist counters (null when disabled); local revocation "
+        "filter sync state; user cache hit ratios per tier, age of served "
+        "records and invalidations; user lookup batch counts, size and fill "
+        "rate; circuit breaker state, policy and counters."
+    ),
+    "responses": {
+        status.HTTP_200_OK: {"description": "Metrics snapshot returned"},
+    },
+}
@@ -4,13 +4,24 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.redis_cache import redis_client
-from app.db.session import get_db
+from app.core.circuit_breaker import breaker_states, circuit_breakers
+from app.core.forward_auth import forward_auth_app
+from app.core.hashing import hashing_pool
+from app.core.middleware import ip_blocklist
+from app.core.rate_limiter import local_tier
+from app.core.redis_cache import redis_manager
+from app.core.token_cache import verified_token_cache
+from app.db.batch_loader import user_by_email_loader
+from app.db.replicas import replica_router
+from app.db.session import get_db, pool_stats
+from app.services.token_blacklist import revocation_filter
+from app.services.user_cache import user_cache
 from app.utils.response import success_response
 
 from .docs import (
     DATABASE_HEALTH_DOCS,
     FULL_HEALTH_DOCS,
+    METRICS_DOCS,
     REDIS_HEALTH_DOCS,
     SERVER_HEALTH_DOCS,
 )
@@ -48,10 +59,15 @@ async def redis_health() -> Dict[str, Any]:
     """Check Redis connectivity."""
 
     async def redis_check() -> bool:
-        pong = await redis_client.ping()
+        pong = await redis_manager.client.ping()
         return bool(pong)
 
-    return await _check_health("Redis", redis_check, details_key="redis")
+    return await _check_health(
+        "Redis",
+        redis_check,
+        details_key="redis",
+        extra={"circuit_breakers": breaker_states()},
+    )
 
 
 @router.get("/", response_model=HealthCheckResponse, **FULL_HEALTH_DOCS)
@@ -66,13 +82,36 @@ async def full_health(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
         results["database"] = "fail"
 
     try:
-        pong = await redis_client.ping()
+        pong = await redis_manager.client.ping()
         results["redis"] = "ok" if pong else "fail"
     except Exception:
         results["redis"] = "fail"
 
     overall_status = "ok" if all(val == "ok" for val in results.values()) else "fail"
+    details: Dict[str, Any] = {**results, "circuit_breakers": breaker_states()}
     return success_response(
-        data={"status": overall_status, "details": results},
+        data={"status": overall_status, "details": details},
         message="Full system health check completed",
     )
+
+
+@router.get("/metrics", **METRICS_DOCS)
+async def metrics() -> Dict[str, Any]:
+    """Snapshot of this worker's runtime metrics."""
+    return success_response(
+        data={
+            "hashing": hashing_pool.stats(),
+            "token_cache": verified_token_cache.stats(),
+            "forward_auth_cache": forward_auth_app.cache.stats(),
+            "redis_pool": redis_manager.stats(),
+            "db_pool": pool_stats(),
+            "db_replicas": replica_router.stats(),
+            "rate_limit_local": local_tier.stats() if local_tier else None,
+            "ip_blocklist": ip_blocklist.stats() if ip_blocklist else None,
+            "revocation_filter": revocation_filter.stats(),
+            "user_cache": user_cache.stats(),
+            "user_loaders": {user_by_email_loader.name: user_by_email_loader.stats()},
+            "circuit_breakers": {b.name: b.stats() for b in circuit_breakers},
+        },
+        message="Metrics snapshot",
+    )
@@ -9,15 +9,17 @@ async def check_health(
     service_name: str,
     check_fn: Callable[..., Any],
     details_key: str | None = None,
+    extra: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
     """
     Generic helper to perform a health check on a given service.
-    Returns a standardized success or error response.
+    Returns a standardized success or error response; ``extra`` is merged
+    into the success details.
     """
     try:
         healthy = await check_fn()
         status_val = "ok" if healthy else "fail"
-        details = {details_key: status_val} if details_key else None
+        details = {details_key: status_val, **(extra or {})} if details_key else None
         return success_response(
             data={"status": status_val, "details": details},
             message=(
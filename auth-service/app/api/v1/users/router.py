@@ -7,6 +7,7 @@ from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
 
+from app.core.principal import Principal
 from app.core.rbac import require_roles
 from app.db.models import UserRole
 from app.utils.response import success_response
@@ -19,17 +20,15 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/user-data", response_model=UserDataEnvelope, **USER_DATA_DOCS)
 async def user_data(
-    current_user: Dict[str, Any] = Depends(
-        require_roles([UserRole.USER, UserRole.ADMIN])
-    ),
+    current_user: Principal = Depends(require_roles([UserRole.USER, UserRole.ADMIN])),
 ) -> Dict[str, Any]:
     """
     Retrieve the authenticated user's email and role.
     """
     data = {
         "user": {
-            "email": current_user["email"],
-            "role": current_user["role"],
+            "email": current_user.email,
+            "role": current_user.role,
         },
         "message": "User data retrieved successfully",
     }
@@ -38,17 +37,15 @@ async def user_data(
 
 @router.get("/profile", response_model=UserProfileResponse, **USER_PROFILE_DOCS)
 async def user_profile(
-    current_user: Dict[str, Any] = Depends(
-        require_roles([UserRole.USER, UserRole.ADMIN])
-    ),
+    current_user: Principal = Depends(require_roles([UserRole.USER, UserRole.ADMIN])),
 ) -> Dict[str, Any]:
     """
     Retrieve user profile details including token metadata.
     """
     data = {
-        "email": current_user["email"],
-        "role": current_user["role"],
-        "issued_at": current_user.get("iat"),
-        "expires_at": current_user.get("exp"),
+        "email": current_user.email,
+        "role": current_user.role,
+        "issued_at": current_user.iat,
+        "expires_at": current_user.exp,
     }
     return success_response(data=data, message="Profile retrieved successfully")
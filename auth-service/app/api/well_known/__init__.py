@@ -0,0 +1,8 @@
+"""
+File: app/api/well_known/__init__.py
+Package entrypoint for /.well-known discovery endpoints.
+"""
+
+from .router import router
+
+__all__ = ["router"]
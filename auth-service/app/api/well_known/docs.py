@@ -0,0 +1,19 @@
+"""
+File: app/api/well_known/docs.py
+OpenAPI documentation for discovery endpoints.
+"""
+
+from fastapi import status
+
+JWKS_DOCS = {
+    "summary": "JSON Web Key Set",
+    "description": (
+        "Public keys for verifying tokens issued by this service, keyed by "
+        "the `kid` token header. Downstream services can cache this and "
+        "verify tokens locally. Empty when tokens are signed with a shared "
+        "HMAC secret."
+    ),
+    "responses": {
+        status.HTTP_200_OK: {"description": "JWK Set returned"},
+    },
+}
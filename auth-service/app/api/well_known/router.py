@@ -0,0 +1,25 @@
+"""
+File: app/api/well_known/router.py
+Discovery endpoints served at the application root.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.security import key_ring
+
+from .docs import JWKS_DOCS
+
+router = APIRouter(prefix="/.well-known", tags=["auth"])
+
+# Verifiers re-fetch on an unknown kid; a short max-age keeps rotation quick.
+JWKS_CACHE_CONTROL = "public, max-age=300"
+
+
+@router.get("/jwks.json", **JWKS_DOCS)
+async def jwks() -> JSONResponse:
+    """Publish the public verification keys."""
+    return JSONResponse(
+        content=key_ring.jwks(),
+        headers={"Cache-Control": JWKS_CACHE_CONTROL},
+    )
@@ -0,0 +1,231 @@
+# app/core/circuit_breaker.py
+"""
+Circuit breakers for Redis-backed auth features.
+
+Every Redis call on a request path runs through the breaker of its
+feature, with a deadline of ``CIRCUIT_CALL_TIMEOUT`` seconds. After
+``CIRCUIT_FAILURE_THRESHOLD`` consecutive failures or timeouts the breaker
+*opens*: calls are rejected at once, without touching Redis, for
+``CIRCUIT_RESET_TIMEOUT`` seconds. Then it goes *half-open* and lets a
+single probe call through; success closes it, failure opens it again.
+
+What a rejected or failed call means is a per-feature policy:
+
+* fail open -- carry on as if Redis had said yes (not revoked, allowed,
+  not locked);
+* fail closed -- raise :class:`DependencyUnavailableError`, which the API
+  turns into ``503`` with ``Retry-After``.
+
+Defaults: the blacklist fails closed, rate limiting and login lockout fail
+open. The user cache always fails open (to the database). Breaker state is
+reported by ``/health/redis``, ``/health/`` and ``/health/metrics``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Literal, TypeVar
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+State = Literal["closed", "open", "half_open"]
+
+# What counts against the breaker; anything else is a bug, not an outage
+FAILURES = (asyncio.TimeoutError, RedisError, OSError)
+
+
+class DependencyUnavailableError(Exception):
+    """
+    A guarded call failed, timed out, or was rejected by an open breaker.
+
+    Parameters
+    ----------
+    name : str
+        Breaker (feature) name.
+    retry_after : float
+        Seconds until the breaker may let calls through again.
+    """
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} unavailable, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(DependencyUnavailableError):
+    """Rejected without calling Redis because the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing.
+
+    Parameters
+    ----------
+    name : str
+        Feature name, used in errors, logs and stats.
+    fail_open : bool
+        Policy of :meth:`guard` when a call cannot be made.
+    failure_threshold : int
+        Consecutive failures that open the breaker.
+    reset_timeout : float
+        Seconds the breaker stays open before a probe.
+    call_timeout : float
+        Deadline of each call, in seconds.
+    clock : Callable[[], float], optional
+        Monotonic time source (default ``time.monotonic``).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fail_open: bool,
+        failure_threshold: int,
+        reset_timeout: float,
+        call_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.fail_open = fail_open
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        self.clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+        # Metrics
+        self.opens = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failed_open = 0
+
+    @property
+    def state(self) -> State:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or self.clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def _retry_after(self) -> float:
+        if self._opened_at is None:
+            return self.reset_timeout
+        return max(self.reset_timeout - (self.clock() - self._opened_at), 0.0)
+
+    def _admit(self) -> bool:
+        """Whether a call may go to Redis; True for the half-open probe too."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def _record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuit %s closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            if self._opened_at is None or self._probing:
+                self.opens += 1
+                logger.warning("Circuit %s opened", self.name)
+            self._opened_at = self.clock()
+            self._probing = False
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``func()`` under the breaker and the call deadline.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the breaker is open (``func`` is not called).
+        DependencyUnavailableError
+            If ``func`` timed out or failed with a Redis/socket error.
+        """
+        if not self._admit():
+            raise CircuitOpenError(self.name, self._retry_after())
+        try:
+            result = await asyncio.wait_for(func(), self.call_timeout)
+        except FAILURES as exc:
+            if isinstance(exc, asyncio.TimeoutError):
+                self.timeouts += 1
+            self._record_failure()
+            raise DependencyUnavailableError(self.name, self._retry_after()) from exc
+        except BaseException:
+            self._probing = False  # cancelled or a bug: not evidence either way
+            raise
+        self._record_success()
+        return result
+
+    async def guard(self, func: Callable[[], Awaitable[T]], fail_open_value: T) -> T:
+        """
+        :meth:`call`, applying the feature's policy when Redis is unavailable:
+        return ``fail_open_value`` if failing open, else re-raise.
+        """
+        try:
+            return await self.call(func)
+        except DependencyUnavailableError:
+            if not self.fail_open:
+                raise
+            self.failed_open += 1
+            return fail_open_value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state, policy and counters."""
+        return {
+            "state": self.state,
+            "policy": "fail_open" if self.fail_open else "fail_closed",
+            "consecutive_failures": self._failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failed_open": self.failed_open,
+        }
+
+
+def _breaker(name: str, fail_open: bool) -> CircuitBreaker:
+    config = settings.circuit_breaker
+    return CircuitBreaker(
+        name,
+        fail_open=fail_open,
+        failure_threshold=config.failure_threshold,
+        reset_timeout=config.reset_timeout,
+        call_timeout=config.call_timeout,
+    )
+
+
+blacklist_breaker = _breaker("blacklist", settings.circuit_breaker.blacklist_fail_open)
+rate_limit_breaker = _breaker(
+    "rate_limit", settings.circuit_breaker.rate_limit_fail_open
+)
+lockout_breaker = _breaker("lockout", settings.circuit_breaker.lockout_fail_open)
+# A cache miss only costs a database query, so the cache always fails open
+user_cache_breaker = _breaker("user_cache", fail_open=True)
+
+circuit_breakers = (
+    blacklist_breaker,
+    rate_limit_breaker,
+    lockout_breaker,
+    user_cache_breaker,
+)
+
+
+def breaker_states() -> Dict[str, State]:
+    """Current state of every breaker, by name."""
+    return {breaker.name: breaker.state for breaker in circuit_breakers}
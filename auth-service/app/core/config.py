@@ -1,6 +1,8 @@
 # app/core/config.py
 """Application settings using Pydantic Settings (async ready)."""
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,8 +13,21 @@ class DatabaseSettings(BaseSettings):
     uri: str = Field(..., alias="DB_URI")
     pool_min: int = Field(10, alias="DB_POOL_MIN")
     pool_max: int = Field(50, alias="DB_POOL_MAX")
+    pool_timeout: float = Field(5.0, alias="DB_POOL_TIMEOUT")
+    pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+    pool_warm_up: bool = Field(True, alias="DB_POOL_WARM_UP")
+    statement_cache_size: int = Field(100, alias="DB_STATEMENT_CACHE_SIZE")
+    ssl: str | None = Field("require", alias="DB_SSL")
+    echo: bool = Field(False, alias="DB_ECHO")
     replica1_host: str | None = Field(None, alias="DB_REPLICA1_HOST")
     replica2_host: str | None = Field(None, alias="DB_REPLICA2_HOST")
+    replica_strategy: Literal["round_robin", "least_latency"] = Field(
+        "round_robin", alias="DB_REPLICA_STRATEGY"
+    )
+    replica_max_lag: float = Field(1.0, alias="DB_REPLICA_MAX_LAG")
+    replica_check_interval: float = Field(2.0, alias="DB_REPLICA_CHECK_INTERVAL")
+    read_your_writes_seconds: float = Field(5.0, alias="DB_READ_YOUR_WRITES_SECONDS")
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
@@ -25,6 +40,11 @@ class RedisSettings(BaseSettings):
     password: str = Field(..., alias="REDIS_PASSWORD")
     db: int = Field(..., alias="REDIS_DB")
     cache_ttl: int = Field(..., alias="REDIS_CACHE_TTL")
+    max_connections: int = Field(50, alias="REDIS_MAX_CONNECTIONS")
+    pool_timeout: int = Field(1, alias="REDIS_POOL_TIMEOUT")
+    socket_timeout: float = Field(0.5, alias="REDIS_SOCKET_TIMEOUT")
+    socket_connect_timeout: float = Field(1.0, alias="REDIS_SOCKET_CONNECT_TIMEOUT")
+    health_check_interval: int = Field(30, alias="REDIS_HEALTH_CHECK_INTERVAL")
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
@@ -32,10 +52,72 @@ class RedisSettings(BaseSettings):
 class JWTSettings(BaseSettings):
     """JWT authentication settings."""
 
-    secret_key: str = Field(..., alias="JWT_SECRET_KEY")
+    secret_key: str | None = Field(None, alias="JWT_SECRET_KEY")
     algorithm: str = Field(..., alias="JWT_ALGORITHM")
+    keys_dir: str | None = Field(None, alias="JWT_KEYS_DIR")
+    active_kid: str | None = Field(None, alias="JWT_ACTIVE_KID")
     access_expire_minutes: int = Field(..., alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     refresh_expire_days: int = Field(..., alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    refresh_grace_seconds: float = Field(10.0, alias="REFRESH_TOKEN_GRACE_SECONDS")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class TokenCacheSettings(BaseSettings):
+    """In-process cache of verified access tokens."""
+
+    enabled: bool = Field(True, alias="TOKEN_CACHE_ENABLED")
+    max_entries: int = Field(10000, alias="TOKEN_CACHE_MAX_ENTRIES")
+    max_bytes: int = Field(8 * 1024 * 1024, alias="TOKEN_CACHE_MAX_BYTES")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class UserCacheSettings(BaseSettings):
+    """Two-level (in-process + Redis) cache of user records."""
+
+    enabled: bool = Field(True, alias="USER_CACHE_ENABLED")
+    local_max_entries: int = Field(10000, alias="USER_CACHE_LOCAL_MAX_ENTRIES")
+    local_ttl: float = Field(30.0, alias="USER_CACHE_LOCAL_TTL")
+    ttl: int = Field(300, alias="USER_CACHE_TTL")
+    share_password_hash: bool = Field(False, alias="USER_CACHE_SHARE_PASSWORD_HASH")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class UserLoaderSettings(BaseSettings):
+    """Micro-batching of concurrent user lookups into one query."""
+
+    enabled: bool = Field(True, alias="USER_LOADER_ENABLED")
+    max_batch_size: int = Field(100, alias="USER_LOADER_MAX_BATCH_SIZE")
+    window_ms: float = Field(0.5, alias="USER_LOADER_WINDOW_MS")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class ForwardAuthSettings(BaseSettings):
+    """Traefik forward-auth endpoint configuration."""
+
+    cache_ttl: float = Field(5.0, alias="FORWARD_AUTH_CACHE_TTL")
+    cache_max_entries: int = Field(10000, alias="FORWARD_AUTH_CACHE_MAX_ENTRIES")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class TokenBlacklistSettings(BaseSettings):
+    """How revoked token IDs are stored in Redis."""
+
+    storage: Literal["keys", "buckets"] = Field("keys", alias="TOKEN_BLACKLIST_STORAGE")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class RevocationFilterSettings(BaseSettings):
+    """Worker-local copy of the token blacklist."""
+
+    max_entries: int = Field(200000, alias="REVOCATION_FILTER_MAX_ENTRIES")
+    prune_interval: float = Field(60.0, alias="REVOCATION_FILTER_PRUNE_INTERVAL")
+    retry_delay: float = Field(1.0, alias="REVOCATION_FILTER_RETRY_DELAY")
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
@@ -45,6 +127,72 @@ class RateLimitSettings(BaseSettings):
 
     count: int = Field(5, alias="RATE_LIMIT_COUNT")
     window: int = Field(60, alias="RATE_LIMIT_WINDOW")
+    # Route policies (app/core/rate_limit_policies.py); per RATE_LIMIT_WINDOW
+    # unless named daily
+    register_ip_daily: int = Field(50, alias="RATE_LIMIT_REGISTER_IP_DAILY")
+    register_route: int = Field(1000, alias="RATE_LIMIT_REGISTER_ROUTE")
+    login_ip: int = Field(100, alias="RATE_LIMIT_LOGIN_IP")
+    login_email_failures_daily: int = Field(
+        100, alias="RATE_LIMIT_LOGIN_EMAIL_FAILURES_DAILY"
+    )
+    login_route: int = Field(5000, alias="RATE_LIMIT_LOGIN_ROUTE")
+    algorithm: Literal["fixed_window", "sliding_window", "sliding_log", "gcra"] = Field(
+        "fixed_window", alias="RATE_LIMIT_ALGORITHM"
+    )
+    local_tier: bool = Field(False, alias="RATE_LIMIT_LOCAL_TIER")
+    local_allowance: int = Field(2, alias="RATE_LIMIT_LOCAL_ALLOWANCE")
+    sync_interval: float = Field(0.5, alias="RATE_LIMIT_SYNC_INTERVAL")
+    local_max_keys: int = Field(100000, alias="RATE_LIMIT_LOCAL_MAX_KEYS")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class LoginLockoutSettings(BaseSettings):
+    """Progressive lockout after failed logins."""
+
+    threshold: int = Field(5, alias="LOGIN_LOCKOUT_THRESHOLD")
+    base_seconds: int = Field(30, alias="LOGIN_LOCKOUT_BASE_SECONDS")
+    max_seconds: int = Field(3600, alias="LOGIN_LOCKOUT_MAX_SECONDS")
+    failure_window: int = Field(900, alias="LOGIN_FAILURE_WINDOW")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class IPBlocklistSettings(BaseSettings):
+    """Pre-auth CIDR blocklist."""
+
+    path: str | None = Field(None, alias="IP_BLOCKLIST_PATH")
+    reload_interval: float = Field(5.0, alias="IP_BLOCKLIST_RELOAD_INTERVAL")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class CircuitBreakerSettings(BaseSettings):
+    """Deadlines, breakers and failure policy for Redis-backed features."""
+
+    failure_threshold: int = Field(5, alias="CIRCUIT_FAILURE_THRESHOLD")
+    reset_timeout: float = Field(5.0, alias="CIRCUIT_RESET_TIMEOUT")
+    call_timeout: float = Field(0.25, alias="CIRCUIT_CALL_TIMEOUT")
+    blacklist_fail_open: bool = Field(False, alias="BLACKLIST_FAIL_OPEN")
+    rate_limit_fail_open: bool = Field(True, alias="RATE_LIMIT_FAIL_OPEN")
+    lockout_fail_open: bool = Field(True, alias="LOGIN_LOCKOUT_FAIL_OPEN")
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class HashingSettings(BaseSettings):
+    """Password hashing policy and worker pool configuration."""
+
+    scheme: Literal["bcrypt", "argon2"] = Field("bcrypt", alias="HASH_SCHEME")
+    bcrypt_rounds: int = Field(12, alias="HASH_BCRYPT_ROUNDS")
+    argon2_memory_cost: int = Field(65536, alias="HASH_ARGON2_MEMORY_COST")  # KiB
+    argon2_time_cost: int = Field(3, alias="HASH_ARGON2_TIME_COST")
+    argon2_parallelism: int = Field(4, alias="HASH_ARGON2_PARALLELISM")
+
+    executor: Literal["thread", "process"] = Field("thread", alias="HASH_EXECUTOR")
+    workers: int = Field(4, alias="HASH_WORKERS")
+    queue_size: int = Field(16, alias="HASH_QUEUE_SIZE")
+    queue_timeout: float = Field(2.0, alias="HASH_QUEUE_TIMEOUT")
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
@@ -61,7 +209,17 @@ class Settings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()  # type: ignore[call-arg]
     redis: RedisSettings = RedisSettings()  # type: ignore[call-arg]
     jwt: JWTSettings = JWTSettings()  # type: ignore[call-arg]
+    token_cache: TokenCacheSettings = TokenCacheSettings()  # type: ignore[call-arg]
+    forward_auth: ForwardAuthSettings = ForwardAuthSettings()  # type: ignore[call-arg]
+    user_cache: UserCacheSettings = UserCacheSettings()  # type: ignore[call-arg]
+    user_loader: UserLoaderSettings = UserLoaderSettings()  # type: ignore[call-arg]
+    token_blacklist: TokenBlacklistSettings = TokenBlacklistSettings()  # type: ignore[call-arg]
+    revocation_filter: RevocationFilterSettings = RevocationFilterSettings()  # type: ignore[call-arg]
     rate_limit: RateLimitSettings = RateLimitSettings()  # type: ignore[call-arg]
+    login_lockout: LoginLockoutSettings = LoginLockoutSettings()  # type: ignore[call-arg]
+    ip_blocklist: IPBlocklistSettings = IPBlocklistSettings()  # type: ignore[call-arg]
+    circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()  # type: ignore[call-arg]
+    hashing: HashingSettings = HashingSettings()  # type: ignore[call-arg]
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
 
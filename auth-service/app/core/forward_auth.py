@@ -0,0 +1,109 @@
+# app/core/forward_auth.py
+"""
+Forward-auth endpoint for Traefik.
+
+Traefik calls ``GET /api/v1/auth/verify`` with the original request headers
+before every upstream request. This is a raw ASGI app: no body parsing, no
+Pydantic, no response envelope. It answers 200 with ``X-User-Email`` /
+``X-User-Role`` headers, or 401.
+
+Latency budget (in-process, HS256, excluding network): p99 < 0.5 ms on a
+micro-cache hit and < 1 ms on a miss without a Redis lookup. Enforced by
+``benchmarks/bench_forward_auth.py``.
+
+Decisions for a token are micro-cached for ``FORWARD_AUTH_CACHE_TTL``
+seconds (never past the token's ``exp``), so a revocation can take up to
+that long to be seen here. Unknown revocation status is answered with 503,
+as in :class:`app.core.middleware.JWTAuthMiddleware`.
+"""
+
+import time
+from typing import List, Tuple
+
+import jwt
+from starlette.types import Receive, Scope, Send
+
+from app.core.circuit_breaker import DependencyUnavailableError
+from app.core.config import settings
+from app.core.lru_cache import TTLCache
+from app.core.middleware import (
+    INVALID_TOKEN_BODY,
+    REVOKED_TOKEN_BODY,
+    bearer_token,
+    send_unauthorized,
+    send_unavailable,
+)
+from app.core.token_cache import token_digest, verify_token
+from app.services.token_blacklist import is_revoked
+
+FORWARD_AUTH_PATH = "/api/v1/auth/verify"
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+class ForwardAuthApp:
+    """
+    ASGI endpoint answering Traefik forwardAuth sub-requests.
+
+    Parameters
+    ----------
+    cache_ttl : float
+        Seconds a positive decision is reused for the same token.
+    cache_max_entries : int
+        Maximum number of cached decisions.
+    """
+
+    def __init__(self, cache_ttl: float, cache_max_entries: int) -> None:
+        self.cache_ttl = cache_ttl
+        self.cache: TTLCache[bytes, Headers] = TTLCache(max_entries=cache_max_entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = bearer_token(scope["headers"])
+        if token is None:
+            await send_unauthorized(send, INVALID_TOKEN_BODY)
+            return
+
+        key = token_digest(token)
+        headers = self.cache.get(key)
+        if headers is None:
+            try:
+                principal = verify_token(token)
+                if principal.is_refresh:
+                    raise jwt.InvalidTokenError("Refresh token used as access token")
+                email, role = principal.email, principal.role
+                if email is None or role is None:
+                    raise jwt.InvalidTokenError("Identity claims missing")
+            except Exception:
+                await send_unauthorized(send, INVALID_TOKEN_BODY)
+                return
+
+            try:
+                revoked = await is_revoked(principal)
+            except DependencyUnavailableError as exc:
+                await send_unavailable(send, exc.retry_after)
+                return
+            except Exception:
+                await send_unavailable(send, 1)
+                return
+            if revoked:
+                await send_unauthorized(send, REVOKED_TOKEN_BODY)
+                return
+
+            headers = [
+                (b"x-user-email", email.encode()),
+                (b"x-user-role", role.encode()),
+                (b"content-length", b"0"),
+            ]
+            expires_at = time.time() + self.cache_ttl
+            if principal.exp is not None:
+                expires_at = min(expires_at, principal.exp)
+            self.cache.set(key, headers, expires_at)
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+
+forward_auth_app = ForwardAuthApp(
+    cache_ttl=settings.forward_auth.cache_ttl,
+    cache_max_entries=settings.forward_auth.cache_max_entries,
+)
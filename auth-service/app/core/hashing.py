@@ -1,12 +1,88 @@
 # app/core/hashing.py
+"""
+Password hashing helpers.
+
+The synchronous helpers call passlib directly. The ``*_async`` variants run
+the same work in a bounded worker pool so a bcrypt/argon2 round (~250 ms)
+never blocks the event loop, and shed load once the pool's wait queue is
+full. The scheme and cost come from ``HashingSettings``.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
 from passlib.context import CryptContext
 
-# Use only bcrypt, avoids the deprecated crypt backend
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+T = TypeVar("T")
+
+SUPPORTED_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_crypt_context(
+    scheme: str,
+    bcrypt_rounds: int,
+    argon2_memory_cost: int,
+    argon2_time_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    """
+    Build the password hashing policy.
+
+    ``scheme`` is used for new hashes; the other supported scheme is kept
+    for verification only and marked deprecated. Cost parameters are
+    pinned (min == max == default), so any stored hash with different
+    parameters reports ``needs_update`` and is re-hashed on next login.
+
+    Parameters
+    ----------
+    scheme : str
+        ``"bcrypt"`` or ``"argon2"`` (argon2id).
+    bcrypt_rounds : int
+        bcrypt log2 cost factor.
+    argon2_memory_cost : int
+        argon2 memory in KiB.
+    argon2_time_cost : int
+        argon2 iterations.
+    argon2_parallelism : int
+        argon2 lanes.
+
+    Returns
+    -------
+    CryptContext
+        Configured passlib context.
+    """
+    schemes = [scheme] + [s for s in SUPPORTED_SCHEMES if s != scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__time_cost=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+# bcrypt/argon2 only, avoids the deprecated crypt backend
+pwd_context = build_crypt_context(
+    scheme=settings.hashing.scheme,
+    bcrypt_rounds=settings.hashing.bcrypt_rounds,
+    argon2_memory_cost=settings.hashing.argon2_memory_cost,
+    argon2_time_cost=settings.hashing.argon2_time_cost,
+    argon2_parallelism=settings.hashing.argon2_parallelism,
+)
 
 
 def hash_password(password: str) -> str:
-    """Generate a bcrypt hash for the given password."""
+    """Hash a password with the configured scheme and cost."""
     # Passlib.hash returns Any, but we know it's str
     return str(pwd_context.hash(password))
 
@@ -15,3 +91,222 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify that a plain password matches the hashed password."""
     # Passlib.verify returns Any, but we know it's bool
     return bool(pwd_context.verify(plain_password, hashed_password))
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and re-hash it if it no longer matches the policy.
+
+    Returns
+    -------
+    tuple[bool, str | None]
+        ``(valid, new_hash)``; ``new_hash`` is set only when the password is
+        valid and the stored hash uses an outdated scheme or cost.
+    """
+    valid, new_hash = pwd_context.verify_and_update(plain_password, hashed_password)
+    return bool(valid), (str(new_hash) if new_hash else None)
+
+
+class HashingOverloadedError(Exception):
+    """Raised when the hashing pool sheds load instead of queueing a job."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Bounded worker pool with admission control for password hashing.
+
+    bcrypt releases the GIL, so a thread pool gives real parallelism; a
+    process pool is available for hashers that do not. At most ``workers``
+    jobs run at once and at most ``queue_size`` callers wait for a slot.
+    When the wait queue is full, or a caller waits longer than
+    ``queue_timeout`` seconds, :class:`HashingOverloadedError` is raised so
+    the request fails fast instead of stalling behind thousands of jobs.
+
+    Parameters
+    ----------
+    executor : str
+        ``"thread"`` or ``"process"``.
+    workers : int
+        Number of worker threads/processes (= max in-flight jobs).
+    queue_size : int
+        Callers allowed to wait for a free worker.
+    queue_timeout : float
+        Maximum seconds a caller may wait for a worker.
+    """
+
+    def __init__(
+        self,
+        executor: str,
+        workers: int,
+        queue_size: int,
+        queue_timeout: float,
+    ) -> None:
+        self.executor_kind = executor
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+        # Metrics
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="hashing"
+                )
+        return self._executor
+
+    def retry_after(self) -> int:
+        """Estimate seconds until the current backlog drains."""
+        completed = self.admitted - self._in_flight
+        avg_run = self.run_seconds_total / completed if completed > 0 else 0.25
+        backlog = self._in_flight + len(self._waiters)
+        return max(1, math.ceil(backlog * avg_run / self.workers))
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.workers and not self._waiters:
+            self._in_flight += 1
+            self._record_admission(0.0)
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise HashingOverloadedError(self.retry_after())
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on.
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self.timed_out += 1
+                raise HashingOverloadedError(self.retry_after()) from None
+            raise
+        self._record_admission(time.perf_counter() - started)
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next live waiter, if any.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def _record_admission(self, waited: float) -> None:
+        self.admitted += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` in the pool without blocking the event loop.
+
+        Parameters
+        ----------
+        fn : Callable
+            Picklable callable (module-level function for process pools).
+        *args : Any
+            Positional arguments for ``fn``.
+
+        Returns
+        -------
+        T
+            Result of ``fn``.
+
+        Raises
+        ------
+        HashingOverloadedError
+            If the wait queue is full or the wait exceeds ``queue_timeout``.
+        """
+        await self._acquire()
+        started = time.perf_counter()
+
+        def on_done(_: "asyncio.Future[T]") -> None:
+            self.run_seconds_total += time.perf_counter() - started
+            self._release()
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(on_done)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait time and shedding counters."""
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_ms_avg": (
+                round(self.wait_seconds_total / self.admitted * 1000, 3)
+                if self.admitted
+                else 0.0
+            ),
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    executor=settings.hashing.executor,
+    workers=settings.hashing.workers,
+    queue_size=settings.hashing.queue_size,
+    queue_timeout=settings.hashing.queue_timeout,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the hashing pool."""
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash in the hashing pool."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Run :func:`verify_and_update_password` in the hashing pool."""
+    return await hashing_pool.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
@@ -0,0 +1,140 @@
+# app/core/hashing_calibration.py
+"""
+Pick password hashing cost parameters for the current hardware.
+
+Measures verify latency while raising the cost until it would exceed the
+target, then prints the matching ``HASH_*`` settings.
+
+Usage
+-----
+    uv run python -m app.core.hashing_calibration --target-ms 250
+    uv run python -m app.core.hashing_calibration --scheme argon2 --target-ms 250
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict
+
+from passlib.hash import argon2, bcrypt
+
+SAMPLE_PASSWORD = "Calibration$Password123"
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+MAX_ARGON2_TIME_COST = 20
+
+
+def measure_verify_ms(verify: Callable[[str], bool], samples: int) -> float:
+    """Median wall time of ``verify(SAMPLE_PASSWORD)`` in milliseconds."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        verify(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int = 3) -> Dict[str, int]:
+    """
+    Highest bcrypt cost whose verify time stays within ``target_ms``.
+
+    Parameters
+    ----------
+    target_ms : float
+        Target verify latency per login.
+    samples : int
+        Measurements per cost level.
+
+    Returns
+    -------
+    dict
+        ``{"HASH_BCRYPT_ROUNDS": rounds}``; never below ``MIN_BCRYPT_ROUNDS``.
+    """
+    chosen = MIN_BCRYPT_ROUNDS
+    for rounds in range(MIN_BCRYPT_ROUNDS, MAX_BCRYPT_ROUNDS + 1):
+        hashed = bcrypt.using(rounds=rounds).hash(SAMPLE_PASSWORD)
+        elapsed = measure_verify_ms(lambda pw: bcrypt.verify(pw, hashed), samples)
+        print(f"  bcrypt rounds={rounds:<3} verify={elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = rounds
+    return {"HASH_BCRYPT_ROUNDS": chosen}
+
+
+def calibrate_argon2(
+    target_ms: float,
+    memory_cost: int,
+    parallelism: int,
+    samples: int = 3,
+) -> Dict[str, int]:
+    """
+    Highest argon2id time cost within ``target_ms`` at a fixed memory cost.
+
+    Memory is the main defence against GPU cracking, so it is held fixed
+    and only the iteration count is tuned.
+
+    Parameters
+    ----------
+    target_ms : float
+        Target verify latency per login.
+    memory_cost : int
+        argon2 memory in KiB.
+    parallelism : int
+        argon2 lanes.
+    samples : int
+        Measurements per cost level.
+
+    Returns
+    -------
+    dict
+        ``HASH_ARGON2_*`` settings; time cost is at least 1.
+    """
+    chosen = 1
+    for time_cost in range(1, MAX_ARGON2_TIME_COST + 1):
+        handler = argon2.using(
+            type="ID",
+            memory_cost=memory_cost,
+            time_cost=time_cost,
+            parallelism=parallelism,
+        )
+        hashed = handler.hash(SAMPLE_PASSWORD)
+        elapsed = measure_verify_ms(lambda pw: handler.verify(pw, hashed), samples)
+        print(f"  argon2id t={time_cost:<3} verify={elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = time_cost
+    return {
+        "HASH_ARGON2_MEMORY_COST": memory_cost,
+        "HASH_ARGON2_TIME_COST": chosen,
+        "HASH_ARGON2_PARALLELISM": parallelism,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate password hashing cost.")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--argon2-memory-cost", type=int, default=65536)
+    parser.add_argument("--argon2-parallelism", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Calibrating {args.scheme} for {args.target_ms:.0f} ms per verify...")
+    if args.scheme == "bcrypt":
+        result = calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        result = calibrate_argon2(
+            args.target_ms,
+            args.argon2_memory_cost,
+            args.argon2_parallelism,
+            args.samples,
+        )
+
+    print("\nRecommended settings:")
+    print(f"HASH_SCHEME={args.scheme}")
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# app/core/ip_blocklist.py
+"""
+Memory-mapped CIDR blocklist.
+
+The blocklist is compiled offline into a flat binary file of sorted,
+merged, non-overlapping address ranges and memory-mapped read-only by every
+worker. The pages live once in the OS page cache however many workers map
+them, and no per-range Python objects are created: a range costs 8 bytes
+(IPv4) or 32 bytes (IPv6) once per host, not once per worker.
+
+File layout (all integers little-endian, addresses big-endian)::
+
+    magic  8 bytes   b"IPBL\\x00\\x00\\x00\\x01"
+    n4     uint64    number of IPv4 ranges
+    n6     uint64    number of IPv6 ranges
+    n4 x (start 4 bytes, end 4 bytes)
+    n6 x (start 16 bytes, end 16 bytes)
+
+Big-endian addresses compare as bytes in numeric order, so a lookup is a
+binary search over slices of the map: O(log n), no unpacking.
+
+The file is re-checked every ``IP_BLOCKLIST_RELOAD_INTERVAL`` seconds and
+re-mapped when its mtime, size or inode changes. Publish a new list with
+an atomic rename; the compile command does that::
+
+    uv run python -m app.core.ip_blocklist ranges.txt blocklist.bin
+"""
+
+import argparse
+import ipaddress
+import logging
+import mmap
+import os
+import socket
+import struct
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"IPBL\x00\x00\x00\x01"
+_HEADER = struct.Struct("<8sQQ")
+_V4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
+Range = Tuple[int, int]
+
+
+def _find(buf: Any, offset: int, count: int, width: int, addr: bytes) -> bool:
+    """Whether ``addr`` falls in one of ``count`` ranges stored at ``offset``."""
+    record = 2 * width
+    lo, hi = 0, count
+    while lo < hi:  # first range whose start is > addr
+        mid = (lo + hi) // 2
+        start = offset + mid * record
+        if buf[start : start + width] <= addr:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo == 0:
+        return False
+    end = offset + (lo - 1) * record + width
+    return bool(addr <= buf[end : end + width])
+
+
+class IPBlocklist:
+    """
+    Read-only view of a compiled blocklist file, reloaded when it changes.
+
+    Parameters
+    ----------
+    path : str
+        Compiled blocklist file.
+    reload_interval : float
+        Minimum seconds between checks of the file for changes.
+    clock : Callable[[], float], optional
+        Monotonic time source (default ``time.monotonic``).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        reload_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = path
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self._map: Optional[mmap.mmap] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._last_error: Optional[str] = None
+        self.n4 = 0
+        self.n6 = 0
+
+        # Metrics
+        self.reloads = 0
+        self.blocked = 0
+        self._reload()
+
+    def _reload(self) -> None:
+        try:
+            st = os.stat(self.path)
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            if signature == self._signature:
+                return
+            with open(self.path, "rb") as fh:
+                new_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, n4, n6 = _HEADER.unpack_from(new_map)
+            if magic != MAGIC or new_map.size() != _HEADER.size + 8 * n4 + 32 * n6:
+                new_map.close()
+                raise ValueError(f"{self.path} is not a compiled blocklist")
+        except (OSError, ValueError, struct.error) as exc:
+            if repr(exc) != self._last_error:  # warn once per distinct problem
+                self._last_error = repr(exc)
+                logger.warning("Keeping current IP blocklist: %s", exc)
+            return
+
+        old, self._map = self._map, new_map
+        self.n4, self.n6 = n4, n6
+        self._signature = signature
+        self._last_error = None
+        self.reloads += 1
+        if old is not None:
+            old.close()  # lookups are synchronous, so nothing still reads it
+        logger.info("Loaded IP blocklist: %d IPv4 and %d IPv6 ranges", n4, n6)
+
+    def contains(self, ip: str) -> bool:
+        """Whether ``ip`` (IPv4 or IPv6 text form) is blocklisted."""
+        now = self.clock()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval
+            self._reload()
+        if self._map is None:
+            return False
+
+        try:
+            addr = socket.inet_pton(socket.AF_INET, ip)
+        except OSError:
+            try:
+                addr = socket.inet_pton(socket.AF_INET6, ip.split("%", 1)[0])
+            except OSError:
+                return False
+            if addr[:12] == _V4_MAPPED_PREFIX:
+                addr = addr[12:]
+
+        if len(addr) == 4:
+            hit = _find(self._map, _HEADER.size, self.n4, 4, addr)
+        else:
+            hit = _find(self._map, _HEADER.size + 8 * self.n4, self.n6, 16, addr)
+        if hit:
+            self.blocked += 1
+        return hit
+
+    def stats(self) -> Dict[str, Any]:
+        """Return range counts and reload/block counters."""
+        return {
+            "ipv4_ranges": self.n4,
+            "ipv6_ranges": self.n6,
+            "reloads": self.reloads,
+            "blocked": self.blocked,
+        }
+
+
+def _merge(ranges: List[Range]) -> List[Range]:
+    ranges.sort()
+    merged: List[Range] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_ranges(lines: Iterable[str]) -> Tuple[List[Range], List[Range]]:
+    """
+    Parse CIDRs (``10.0.0.0/8``), single addresses, or ``first-last`` ranges,
+    one per line; ``#`` starts a comment.
+
+    Returns
+    -------
+    tuple[list, list]
+        Merged IPv4 and IPv6 ranges as inclusive integer pairs.
+    """
+    v4: List[Range] = []
+    v6: List[Range] = []
+    for line in lines:
+        entry = line.split("#", 1)[0].strip()
+        if not entry:
+            continue
+        if "-" in entry:
+            first_text, last_text = entry.split("-", 1)
+            first = ipaddress.ip_address(first_text.strip())
+            last = ipaddress.ip_address(last_text.strip())
+            if first.version != last.version or int(first) > int(last):
+                raise ValueError(f"Bad range {entry!r}")
+            version, bounds = first.version, (int(first), int(last))
+        else:
+            network = ipaddress.ip_network(entry, strict=False)
+            version = network.version
+            bounds = (int(network.network_address), int(network.broadcast_address))
+        (v4 if version == 4 else v6).append(bounds)
+    return _merge(v4), _merge(v6)
+
+
+def compile_blocklist(lines: Iterable[str], out_path: str) -> Tuple[int, int]:
+    """
+    Write the compiled blocklist for ``lines`` to ``out_path`` atomically.
+
+    Returns
+    -------
+    tuple[int, int]
+        Number of IPv4 and IPv6 ranges written.
+    """
+    v4, v6 = parse_ranges(lines)
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, len(v4), len(v6)))
+        for start, end in v4:
+            fh.write(start.to_bytes(4, "big") + end.to_bytes(4, "big"))
+        for start, end in v6:
+            fh.write(start.to_bytes(16, "big") + end.to_bytes(16, "big"))
+    os.replace(tmp_path, out_path)
+    return len(v4), len(v6)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile an IP blocklist.")
+    parser.add_argument("source", help="Text file of CIDRs, addresses or ranges")
+    parser.add_argument("out", help="Compiled file (IP_BLOCKLIST_PATH)")
+    args = parser.parse_args()
+    with open(args.source) as fh:
+        n4, n6 = compile_blocklist(fh, args.out)
+    print(f"Wrote {args.out}: {n4} IPv4 and {n6} IPv6 ranges")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,10 @@ JWT utility functions for access and refresh token handling.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, cast
-
-import jwt
+from typing import Any, Dict
 
 from app.core.config import settings
+from app.core.security import key_ring
 
 
 def create_access_token(data: Dict[str, Any]) -> str:
@@ -28,9 +27,7 @@ def create_access_token(data: Dict[str, Any]) -> str:
         minutes=settings.jwt.access_expire_minutes
     )
     payload: Dict[str, Any] = {**data, "exp": expire, "type": "access"}
-    return str(
-        jwt.encode(payload, settings.jwt.secret_key, algorithm=settings.jwt.algorithm)
-    )
+    return key_ring.encode(payload)
 
 
 def create_refresh_token(data: Dict[str, Any]) -> str:
@@ -51,9 +48,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         days=settings.jwt.refresh_expire_days
     )
     payload: Dict[str, Any] = {**data, "exp": expire, "type": "refresh"}
-    return str(
-        jwt.encode(payload, settings.jwt.secret_key, algorithm=settings.jwt.algorithm)
-    )
+    return key_ring.encode(payload)
 
 
 def decode_token(token: str) -> Dict[str, Any]:
@@ -70,9 +65,4 @@ def decode_token(token: str) -> Dict[str, Any]:
     dict
         Decoded token payload.
     """
-    payload = jwt.decode(
-        token,
-        settings.jwt.secret_key,
-        algorithms=[settings.jwt.algorithm],
-    )
-    return cast(Dict[str, Any], payload)
+    return key_ring.decode(token)
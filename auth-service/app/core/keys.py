@@ -0,0 +1,245 @@
+# app/core/keys.py
+"""
+JWT signing key ring.
+
+Two modes, picked by ``JWT_ALGORITHM``:
+
+* ``HS*`` - one shared secret (``JWT_SECRET_KEY``), as before.
+* ``RS256`` / ``ES256`` / ``EdDSA`` - PEM files in ``JWT_KEYS_DIR`` named
+  ``<kid>.pem``. Private keys can sign and verify, public keys only verify.
+  ``JWT_ACTIVE_KID`` selects the signing key; every token carries its
+  ``kid`` header and every public key is published at
+  ``/.well-known/jwks.json`` so other services verify locally.
+
+Rotation without downtime: add the new private key file to every pod
+(verification only), then switch ``JWT_ACTIVE_KID`` to it, then delete the
+old file once the longest-lived token signed with it has expired. While
+migrating from HS256, keep ``JWT_SECRET_KEY`` set: tokens without a ``kid``
+are still verified with it.
+
+Keys are parsed once at startup and the parsed objects are handed to
+PyJWT, so ``jwt.encode``/``jwt.decode`` never re-parse PEM data.
+
+Generate a key::
+
+    uv run python -m app.core.keys --algorithm EdDSA --kid 2025-01 --out keys/
+"""
+
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt.algorithms import get_default_algorithms
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+class KeyRingError(Exception):
+    """Raised when the configured key material is unusable."""
+
+
+class SigningKey:
+    """
+    One JWT key with its PyJWT-ready key objects.
+
+    Parameters
+    ----------
+    kid : str, optional
+        Key ID written to (and matched against) the token header.
+    algorithm : str
+        JWS algorithm this key is used with.
+    verify_key : Any
+        Public key object, or the secret for HMAC.
+    sign_key : Any, optional
+        Private key object, or the secret for HMAC; None for verify-only keys.
+    """
+
+    __slots__ = ("kid", "algorithm", "verify_key", "sign_key")
+
+    def __init__(
+        self,
+        kid: Optional[str],
+        algorithm: str,
+        verify_key: Any,
+        sign_key: Any = None,
+    ) -> None:
+        self.kid = kid
+        self.algorithm = algorithm
+        self.verify_key = verify_key
+        self.sign_key = sign_key
+
+
+def algorithm_for_key(key: Any) -> str:
+    """Map a parsed public or private key to its JWS algorithm."""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if not isinstance(key.curve, ec.SECP256R1):
+            raise KeyRingError(f"Unsupported EC curve {key.curve.name}")
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise KeyRingError(f"Unsupported key type {type(key).__name__}")
+
+
+def load_pem_key(path: Path) -> SigningKey:
+    """Parse ``<kid>.pem`` into a :class:`SigningKey`."""
+    data = path.read_bytes()
+    kid = path.stem
+    if b"PRIVATE KEY" in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        return SigningKey(
+            kid=kid,
+            algorithm=algorithm_for_key(private_key),
+            verify_key=private_key.public_key(),
+            sign_key=private_key,
+        )
+    public_key = serialization.load_pem_public_key(data)
+    return SigningKey(
+        kid=kid, algorithm=algorithm_for_key(public_key), verify_key=public_key
+    )
+
+
+class KeyRing:
+    """
+    Active signing key plus every key still accepted for verification.
+
+    Parameters
+    ----------
+    active : SigningKey
+        Key used to sign new tokens.
+    keys : list[SigningKey]
+        All verification keys, including ``active``.
+    """
+
+    def __init__(self, active: SigningKey, keys: List[SigningKey]) -> None:
+        if active.sign_key is None:
+            raise KeyRingError(f"Active key {active.kid!r} has no private key")
+        self.active = active
+        self._by_kid: Dict[Optional[str], SigningKey] = {k.kid: k for k in keys}
+        self._jwks = self._build_jwks(keys)
+
+    @classmethod
+    def load(
+        cls,
+        algorithm: str,
+        secret_key: Optional[str],
+        keys_dir: Optional[str],
+        active_kid: Optional[str],
+    ) -> "KeyRing":
+        """
+        Build the key ring from configuration.
+
+        Raises
+        ------
+        KeyRingError
+            If the configuration does not yield a usable signing key.
+        """
+        legacy: List[SigningKey] = []
+        if secret_key:
+            hs_algorithm = algorithm if algorithm.startswith("HS") else "HS256"
+            legacy.append(SigningKey(None, hs_algorithm, secret_key, secret_key))
+
+        if algorithm.startswith("HS"):
+            if not legacy:
+                raise KeyRingError(f"{algorithm} requires JWT_SECRET_KEY")
+            return cls(active=legacy[0], keys=legacy)
+
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise KeyRingError(f"Unsupported JWT algorithm {algorithm}")
+        if not keys_dir or not active_kid:
+            raise KeyRingError(f"{algorithm} requires JWT_KEYS_DIR and JWT_ACTIVE_KID")
+
+        keys = [load_pem_key(path) for path in sorted(Path(keys_dir).glob("*.pem"))]
+        active = next((k for k in keys if k.kid == active_kid), None)
+        if active is None:
+            raise KeyRingError(f"No key file {active_kid}.pem in {keys_dir}")
+        if active.algorithm != algorithm:
+            raise KeyRingError(
+                f"Active key {active_kid!r} is {active.algorithm}, not {algorithm}"
+            )
+        return cls(active=active, keys=keys + legacy)
+
+    @staticmethod
+    def _build_jwks(keys: List[SigningKey]) -> Dict[str, Any]:
+        algorithms = get_default_algorithms()
+        published = []
+        for key in keys:
+            if key.kid is None or key.algorithm.startswith("HS"):
+                continue  # shared secrets are never published
+            jwk = algorithms[key.algorithm].to_jwk(key.verify_key, as_dict=True)
+            jwk.update({"kid": key.kid, "alg": key.algorithm, "use": "sig"})
+            published.append(jwk)
+        return {"keys": published}
+
+    def jwks(self) -> Dict[str, Any]:
+        """Public verification keys as a JWK Set."""
+        return self._jwks
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        """Sign ``payload`` with the active key."""
+        headers = {"kid": self.active.kid} if self.active.kid else None
+        return jwt.encode(
+            payload,
+            self.active.sign_key,
+            algorithm=self.active.algorithm,
+            headers=headers,
+        )
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify ``token`` with the key named by its ``kid`` header.
+
+        The algorithm is fixed per key, never taken from the token header.
+
+        Raises
+        ------
+        jwt.PyJWTError
+            If the kid is unknown or the token is invalid or expired.
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._by_kid.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown signing key {kid!r}")
+        payload: Dict[str, Any] = jwt.decode(
+            token, key.verify_key, algorithms=[key.algorithm]
+        )
+        return payload
+
+
+def generate_private_key(algorithm: str) -> Any:
+    """Create a new private key for ``algorithm``."""
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise KeyRingError(f"Unsupported JWT algorithm {algorithm}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key.")
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, required=True)
+    parser.add_argument("--kid", required=True)
+    parser.add_argument("--out", default=".")
+    args = parser.parse_args()
+
+    private_key = generate_private_key(args.algorithm)
+    path = Path(args.out) / f"{args.kid}.pem"
+    path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    path.chmod(0o600)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
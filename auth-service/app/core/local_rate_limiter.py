@@ -0,0 +1,205 @@
+# app/core/local_rate_limiter.py
+"""
+In-process tier in front of the Redis rate limiter.
+
+Each worker counts hits per key locally and only talks to Redis when a key
+has used up its local allowance; everything else is reconciled in batched
+``INCRBY`` calls every ``RATE_LIMIT_SYNC_INTERVAL`` seconds. A key whose
+last known global count plus local hits has reached the limit is rejected
+without a Redis round trip, so an abusive client costs one dict lookup per
+request.
+
+Global counts live in fixed-window buckets ``<key>:<window index>``.
+
+Overshoot: a worker admits at most ``RATE_LIMIT_LOCAL_ALLOWANCE`` requests
+per key beyond the global count it last saw, so with N workers a key can
+get up to ``limit + N * allowance`` requests per window. An allowance of 0
+syncs every request (exact, no saving).
+
+When Redis is unreachable the tier runs local-only: each worker enforces
+the full limit on its own counts (up to ``N * limit`` in total) until a
+background sync succeeds again.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.rate_limit_scripts import RateLimitDecision
+
+logger = logging.getLogger(__name__)
+
+
+class _KeyState:
+    __slots__ = ("window", "window_idx", "known", "pending")
+
+    def __init__(self, window: int, window_idx: int) -> None:
+        self.window = window
+        self.window_idx = window_idx
+        self.known = 0  # global count at last sync
+        self.pending = 0  # local hits not yet in Redis
+
+
+class LocalRateTier:
+    """
+    Per-worker counters reconciled to Redis in batches.
+
+    Parameters
+    ----------
+    allowance : int
+        Requests a worker may admit per key before syncing with Redis.
+    sync_interval : float
+        Seconds between background batch syncs.
+    max_keys : int
+        Keys tracked locally; beyond this, new keys go straight to Redis.
+    clock : Callable[[], float], optional
+        Time source (default ``time.time``).
+    """
+
+    def __init__(
+        self,
+        allowance: int,
+        sync_interval: float,
+        max_keys: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.allowance = allowance
+        self.sync_interval = sync_interval
+        self.max_keys = max_keys
+        self.clock = clock
+        self._keys: Dict[str, _KeyState] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.degraded = False
+
+        # Metrics
+        self.local_allowed = 0
+        self.local_rejected = 0
+        self.redis_syncs = 0
+        self.sync_errors = 0
+
+    async def hit(
+        self, redis: Redis, key: str, limit: int, window: int
+    ) -> RateLimitDecision:
+        """Count one request against ``key`` (``limit`` per ``window`` s)."""
+        now = self.clock()
+        idx = int(now // window)
+        retry_after = (idx + 1) * window - now
+
+        state = self._keys.get(key)
+        if state is None or state.window_idx != idx:
+            if state is None and len(self._keys) >= self.max_keys:
+                state = _KeyState(window, idx)  # untracked: sync this hit directly
+                state.pending = 1
+                return await self._decide(redis, key, state, limit, retry_after)
+            state = self._keys[key] = _KeyState(window, idx)
+
+        if state.known + state.pending >= limit:
+            self.local_rejected += 1
+            return RateLimitDecision(False, retry_after, 0)
+
+        state.pending += 1
+        if state.pending <= self.allowance or self.degraded:
+            self.local_allowed += 1
+            return RateLimitDecision(True, 0, limit - state.known - state.pending)
+        return await self._decide(redis, key, state, limit, retry_after)
+
+    def check(self, key: str, limit: int, window: int) -> RateLimitDecision:
+        """Decision for ``key`` from local counts, without counting a hit."""
+        now = self.clock()
+        idx = int(now // window)
+        state = self._keys.get(key)
+        if state is None or state.window_idx != idx:
+            return RateLimitDecision(True, 0, limit)
+        count = state.known + state.pending
+        if count >= limit:
+            self.local_rejected += 1
+            return RateLimitDecision(False, (idx + 1) * window - now, 0)
+        return RateLimitDecision(True, 0, limit - count)
+
+    async def _decide(
+        self,
+        redis: Redis,
+        key: str,
+        state: _KeyState,
+        limit: int,
+        retry_after: float,
+    ) -> RateLimitDecision:
+        try:
+            await self._sync(redis, [(key, state)])
+        except (RedisError, OSError):
+            self._mark_degraded()
+        count = state.known + state.pending
+        if count > limit:
+            return RateLimitDecision(False, retry_after, 0)
+        return RateLimitDecision(True, 0, limit - count)
+
+    async def _sync(self, redis: Redis, batch: List[Tuple[str, _KeyState]]) -> None:
+        """Push pending counts for ``batch`` and refresh the global counts."""
+        sent = [state.pending for _, state in batch]
+        pipe = redis.pipeline(transaction=False)
+        for (key, state), amount in zip(batch, sent):
+            bucket = f"{key}:{state.window_idx}"
+            pipe.incrby(bucket, amount)
+            pipe.expire(bucket, state.window)
+        results = await pipe.execute()
+        self.redis_syncs += 1
+        self.degraded = False
+        for (_, state), amount, count in zip(batch, sent, results[::2]):
+            # Hits counted while the pipeline was in flight stay pending
+            state.pending -= amount
+            state.known = count
+
+    async def flush(self, redis: Redis) -> None:
+        """Sync every key with pending hits and drop finished windows."""
+        now = self.clock()
+        batch = []
+        for key, state in list(self._keys.items()):
+            if state.window_idx != int(now // state.window):
+                del self._keys[key]
+            elif state.pending:
+                batch.append((key, state))
+        if not batch:
+            return
+        try:
+            await self._sync(redis, batch)
+        except (RedisError, OSError):
+            self._mark_degraded()
+
+    def _mark_degraded(self) -> None:
+        self.sync_errors += 1
+        if not self.degraded:
+            logger.warning("Redis unreachable; rate limiting is local-only")
+        self.degraded = True
+
+    async def _run(self, redis: Redis) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.flush(redis)
+
+    def start(self, redis: Redis) -> None:
+        """Start the background sync task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self, redis: Redis) -> None:
+        """Stop the background task and push what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush(redis)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return local tier counters."""
+        return {
+            "keys": len(self._keys),
+            "allowance": self.allowance,
+            "degraded": self.degraded,
+            "local_allowed": self.local_allowed,
+            "local_rejected": self.local_rejected,
+            "redis_syncs": self.redis_syncs,
+            "sync_errors": self.sync_errors,
+        }
@@ -0,0 +1,115 @@
+# app/core/lru_cache.py
+"""
+Bounded in-process LRU cache with per-entry expiry.
+
+Used for worker-local caches on the request path. It is not thread-safe:
+all access is expected to happen on the event loop thread.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU cache capped by entry count and approximate memory.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of entries.
+    max_bytes : int, optional
+        Cap on the sum of the sizes passed to :meth:`set`.
+    clock : Callable[[], float], optional
+        Time source for expiry timestamps (default ``time.time``).
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._data: "OrderedDict[K, Tuple[V, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the live value for ``key`` (marking it recently used) or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= self.clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float, size: int = 0) -> None:
+        """
+        Store ``value`` until the absolute time ``expires_at``.
+
+        Least recently used entries are evicted until both caps hold.
+        """
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (value, expires_at, size)
+        self._bytes += size
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove ``key`` and return its value, if present."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        self._remove(key)
+        return entry[0]
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._data.clear()
+        self._bytes = 0
+
+    def _remove(self, key: K) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
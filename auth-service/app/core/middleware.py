@@ -1,31 +1,194 @@
-# app/core/middlewere.py
+# app/core/middleware.py
+"""
+Pure-ASGI authentication middleware.
 
-from fastapi import HTTPException, Request
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.middleware.base import BaseHTTPMiddleware
+:class:`IPBlocklistMiddleware` runs first and rejects blocklisted networks
+before any token, Redis or password work.
 
-from app.core.security import decode_token
-from app.services.token_blacklist import is_blacklisted
+Parses the bearer token straight from the raw ASGI headers, verifies it
+once (through the verified-token cache), checks revocation and stores the
+resulting :class:`Principal` in the request state. Invalid tokens get a 401
+written directly to the transport, without building a ``Request`` or
+raising through the exception stack. If revocation status is unknown (Redis
+down or its circuit breaker open) the answer is 503 with ``Retry-After``,
+not 401, so clients keep the token and retry.
+"""
 
+import json
+import math
+from typing import Iterable, List, Optional, Tuple
 
-class JWTBlacklistMiddleware(BaseHTTPMiddleware):
+import jwt
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.circuit_breaker import DependencyUnavailableError
+from app.core.config import settings
+from app.core.ip_blocklist import IPBlocklist
+from app.core.token_cache import verify_token
+from app.services.token_blacklist import is_revoked
+
+# Routes that never need a bearer token; skipped with one set lookup.
+PUBLIC_PATHS = frozenset(
+    {
+        "/api/v1/health/",
+        "/api/v1/health/server",
+        "/api/v1/health/database",
+        "/api/v1/health/redis",
+        "/api/v1/health/metrics",
+        "/api/v1/auth/register",
+        "/api/v1/auth/login",
+        "/api/v1/auth/refresh",
+        "/api/v1/auth/logout",
+        "/api/v1/auth/introspect",
+        "/api/v1/auth/verify",
+        "/.well-known/jwks.json",
+        "/docs",
+        "/docs/oauth2-redirect",
+        "/redoc",
+        "/openapi.json",
+    }
+)
+
+
+def _error_body(message: str) -> bytes:
+    # Same envelope as app.utils.response.error_response
+    return json.dumps({"status": "error", "message": message}).encode()
+
+
+INVALID_TOKEN_BODY = _error_body("Invalid or expired token")
+REVOKED_TOKEN_BODY = _error_body("Token has been revoked")
+FORBIDDEN_BODY = _error_body("Forbidden")
+UNAVAILABLE_BODY = _error_body("Token revocation status unavailable")
+
+ip_blocklist: Optional[IPBlocklist] = (
+    IPBlocklist(settings.ip_blocklist.path, settings.ip_blocklist.reload_interval)
+    if settings.ip_blocklist.path
+    else None
+)
+
+
+def bearer_token(headers: Iterable[Tuple[bytes, bytes]]) -> Optional[str]:
+    """
+    Extract the bearer token from raw ASGI headers.
+
+    Returns
+    -------
+    str | None
+        The token, or None if there is no ``Authorization: Bearer`` header.
+    """
+    for name, value in headers:
+        if name == b"authorization":
+            if value[:7].lower() == b"bearer ":
+                token = value[7:].strip()
+                return token.decode("latin-1") if token else None
+            return None
+    return None
+
+
+async def send_unauthorized(send: Send, body: bytes) -> None:
+    """Write a complete 401 JSON response."""
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"www-authenticate", b"Bearer"),
+    ]
+    await send({"type": "http.response.start", "status": 401, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_unavailable(send: Send, retry_after: float) -> None:
+    """Write a complete 503 JSON response with ``Retry-After``."""
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(UNAVAILABLE_BODY)).encode()),
+        (b"retry-after", str(max(math.ceil(retry_after), 1)).encode()),
+    ]
+    await send({"type": "http.response.start", "status": 503, "headers": headers})
+    await send({"type": "http.response.body", "body": UNAVAILABLE_BODY})
+
+
+class JWTAuthMiddleware:
     """
-    Middleware to check if access or refresh token has been revoked.
-    Assumes JWT is sent via Authorization header as Bearer token.
+    Verify bearer tokens and reject revoked ones.
+
+    Only access tokens authenticate; a refresh token is answered with 401.
+    Requests without a token pass through unauthenticated; protected routes
+    then fail in :func:`app.core.principal.get_principal`.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        Wrapped application.
+    public_paths : Iterable[str], optional
+        Exact paths that skip token checks entirely.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        auth: HTTPAuthorizationCredentials = await HTTPBearer(auto_error=False)(request)
-        if auth:
-            token = auth.credentials
+    def __init__(self, app: ASGIApp, public_paths: Iterable[str] = PUBLIC_PATHS):
+        self.app = app
+        self.public_paths = frozenset(public_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.public_paths:
+            await self.app(scope, receive, send)
+            return
+
+        token = bearer_token(scope["headers"])
+        if token is not None:
             try:
-                payload = decode_token(token)
-                jti = payload.get("jti")
-                if jti and await is_blacklisted(jti):
-                    raise HTTPException(
-                        status_code=401, detail="Token has been revoked"
-                    )
+                principal = verify_token(token)
+                if principal.is_refresh:
+                    raise jwt.InvalidTokenError("Refresh token used as access token")
+            except jwt.PyJWTError:
+                await send_unauthorized(send, INVALID_TOKEN_BODY)
+                return
+
+            try:
+                revoked = await is_revoked(principal)
+            except DependencyUnavailableError as exc:
+                await send_unavailable(send, exc.retry_after)
+                return
             except Exception:
-                raise HTTPException(status_code=401, detail="Invalid token")
-        response = await call_next(request)
-        return response
+                # Revocation status unknown (e.g. database fallback failed)
+                await send_unavailable(send, 1)
+                return
+            if revoked:
+                await send_unauthorized(send, REVOKED_TOKEN_BODY)
+                return
+
+            scope.setdefault("state", {})["principal"] = principal
+
+        await self.app(scope, receive, send)
+
+
+class IPBlocklistMiddleware:
+    """
+    Reject requests from blocklisted networks with 403.
+
+    The client address is ``scope["client"]``; behind a proxy, run uvicorn
+    with ``--proxy-headers`` so it is the real client, not the proxy.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        Wrapped application.
+    blocklist : IPBlocklist
+        Memory-mapped CIDR blocklist.
+    """
+
+    def __init__(self, app: ASGIApp, blocklist: IPBlocklist):
+        self.app = app
+        self.blocklist = blocklist
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        client = scope.get("client")
+        if scope["type"] == "http" and client and self.blocklist.contains(client[0]):
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(FORBIDDEN_BODY)).encode()),
+            ]
+            await send(
+                {"type": "http.response.start", "status": 403, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": FORBIDDEN_BODY})
+            return
+        await self.app(scope, receive, send)
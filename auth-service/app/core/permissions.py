@@ -1,26 +1,21 @@
-# app/core/permissions.py
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.jwt import decode_token
-from app.db.models import User, UserRole
-from app.db.session import get_db
+from app.core.principal import Principal, get_principal
+from app.db.models import UserRole
+from app.db.replicas import get_read_db
+from app.services.user_cache import CachedUser, user_cache
 
 
-async def get_current_user(token: str, db: AsyncSession = Depends(get_db)) -> User:
-    """Get current user from JWT token."""
+async def get_current_user(
+    principal: Principal = Depends(get_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> CachedUser:
+    """Load the user behind the principal verified by the auth middleware."""
+    if not principal.email:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    try:
-        payload = decode_token(token)
-        user_id: str = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    from app.db import crud
-
-    user = await crud.get_user_by_id(db, int(user_id))
+    user = await user_cache.get_by_email(db, principal.email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -30,8 +25,8 @@ def require_roles(*roles: UserRole):
     """Dependency generator to require specific user roles."""
 
     async def role_checker(
-        current_user: User = Depends(get_current_user),
-    ) -> User:
+        current_user: CachedUser = Depends(get_current_user),
+    ) -> CachedUser:
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,106 @@
+# app/core/principal.py
+"""
+Verified identity for the current request.
+
+The auth middleware verifies the bearer token once and stores a
+:class:`Principal` on the request state; RBAC and user lookups read it from
+there instead of decoding the token again.
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.security import ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE, is_refresh_token
+
+
+class Principal:
+    """
+    Claims of a verified JWT.
+
+    Parameters
+    ----------
+    email : str, optional
+        Subject email.
+    role : str, optional
+        User role value (``"user"`` | ``"admin"``).
+    jti : str, optional
+        Token ID, present on revocable tokens.
+    iat : int, optional
+        Issued-at timestamp (Unix epoch).
+    exp : int, optional
+        Expiry timestamp (Unix epoch).
+    gen : int, optional
+        User token generation at mint time; the token is void once the
+        user's generation has moved past it.
+    typ : str, optional
+        Token type, ``"access"`` or ``"refresh"``.
+    """
+
+    __slots__ = ("email", "role", "jti", "iat", "exp", "gen", "typ")
+
+    def __init__(
+        self,
+        email: Optional[str],
+        role: Optional[str],
+        jti: Optional[str] = None,
+        iat: Optional[int] = None,
+        exp: Optional[int] = None,
+        gen: int = 0,
+        typ: str = ACCESS_TOKEN_TYPE,
+    ) -> None:
+        self.email = email
+        self.role = role
+        self.jti = jti
+        self.iat = iat
+        self.exp = exp
+        self.gen = gen
+        self.typ = typ
+
+    @classmethod
+    def from_claims(cls, claims: Mapping[str, Any]) -> "Principal":
+        """Build a principal from a decoded payload, dropping ill-typed claims."""
+        email = claims.get("email")
+        # role may be str or enum value at mint time → normalize to str
+        role = claims.get("role")
+        role = getattr(role, "value", role)
+        jti = claims.get("jti")
+        iat = claims.get("iat")
+        exp = claims.get("exp")
+        gen = claims.get("gen")
+        return cls(
+            email=email if isinstance(email, str) else None,
+            role=role if isinstance(role, str) else None,
+            jti=jti if isinstance(jti, str) else None,
+            iat=iat if isinstance(iat, int) else None,
+            exp=exp if isinstance(exp, int) else None,
+            gen=gen if isinstance(gen, int) else 0,
+            typ=REFRESH_TOKEN_TYPE if is_refresh_token(claims) else ACCESS_TOKEN_TYPE,
+        )
+
+    @property
+    def is_refresh(self) -> bool:
+        """Whether the token is a refresh token, which must not authenticate requests."""
+        return self.typ == REFRESH_TOKEN_TYPE
+
+    def __repr__(self) -> str:
+        return f"Principal(email={self.email!r}, role={self.role!r}, jti={self.jti!r})"
+
+
+def get_principal(request: Request) -> Principal:
+    """
+    Dependency returning the principal verified by the auth middleware.
+
+    Raises
+    ------
+    HTTPException
+        401 if the request carried no valid bearer token.
+    """
+    principal: Optional[Principal] = getattr(request.state, "principal", None)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
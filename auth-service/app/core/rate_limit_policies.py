@@ -0,0 +1,100 @@
+# app/core/rate_limit_policies.py
+"""
+Per-route rate limit policies.
+
+Each route declares several limits, set by ``RATE_LIMIT_*`` settings; a
+request is allowed only if every one of them allows it, and is counted
+against them only then, all in one Redis round trip (see
+:meth:`app.core.rate_limiter.RateLimiter.enforce`).
+
+Keys are compact and bounded in size: ``rl:<route>:<policy>:<digest>``,
+where the digest is a 72-bit BLAKE2b hash of the client identity (IP,
+lower-cased email, or both). Raw emails and IPs never appear in Redis.
+"""
+
+import base64
+import hashlib
+from typing import Dict, Literal, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+Scope = Literal["ip", "email", "ip_email", "route"]
+
+
+class RateLimitPolicy(NamedTuple):
+    """
+    One limit on a route.
+
+    Attributes
+    ----------
+    name : str
+        Short name, used in the Redis key.
+    scope : {"ip", "email", "ip_email", "route"}
+        What is counted: the client IP, the submitted email, the pair, or
+        every request to the route.
+    limit : int
+        Maximum requests per window.
+    window : int
+        Window length in seconds.
+    failures_only : bool
+        Checked on every request but counted only by
+        :meth:`~app.core.rate_limiter.RateLimiter.count_failure`.
+    """
+
+    name: str
+    scope: Scope
+    limit: int
+    window: int
+    failures_only: bool = False
+
+
+DAY = 86400
+
+_config = settings.rate_limit
+
+RATE_LIMIT_POLICIES: Dict[str, Tuple[RateLimitPolicy, ...]] = {
+    "register": (
+        RateLimitPolicy("ip", "ip", _config.count, _config.window),
+        RateLimitPolicy("ip_day", "ip", _config.register_ip_daily, DAY),
+        RateLimitPolicy("route", "route", _config.register_route, _config.window),
+    ),
+    "login": (
+        RateLimitPolicy("ip_email", "ip_email", _config.count, _config.window),
+        RateLimitPolicy("ip", "ip", _config.login_ip, _config.window),
+        # Failed logins only: busy accounts must not lock themselves out
+        RateLimitPolicy(
+            "email_day",
+            "email",
+            _config.login_email_failures_daily,
+            DAY,
+            failures_only=True,
+        ),
+        RateLimitPolicy("route", "route", _config.login_route, _config.window),
+    ),
+}
+
+
+def identity_digest(value: str) -> str:
+    """12-character URL-safe digest of a client identity."""
+    digest = hashlib.blake2b(value.encode(), digest_size=9).digest()
+    return base64.urlsafe_b64encode(digest).decode()
+
+
+def policy_key(
+    route: str, policy: RateLimitPolicy, ip: str, email: Optional[str]
+) -> Optional[str]:
+    """
+    Redis key counting ``policy`` for this client, or None if it does not
+    apply (an email-scoped policy on a request without an email).
+    """
+    if policy.scope == "route":
+        return f"rl:{route}:{policy.name}"
+    if policy.scope == "ip":
+        identity = ip
+    elif email is None:
+        return None
+    elif policy.scope == "email":
+        identity = email.lower()
+    else:
+        identity = f"{ip}|{email.lower()}"
+    return f"rl:{route}:{policy.name}:{identity_digest(identity)}"
@@ -0,0 +1,162 @@
+# app/core/rate_limit_scripts.py
+"""
+Server-side Lua rate limiting scripts.
+
+Each script checks any number of counters atomically in a single round
+trip, and counts the request against them only if every one of them allows
+it: a request rejected by one limit (say, per IP) never uses up another
+(say, the route-wide one). Time comes from the Redis server (``TIME``), so
+workers with skewed clocks still agree.
+
+``KEYS`` are the counters. ``ARGV`` holds three values per key: the request
+limit, the window in seconds and ``1`` to count the request or ``0`` to
+only check it. The reply is one ``{allowed, retry_after_ms, remaining}``
+per key.
+
+Algorithms
+----------
+fixed_window
+    Counter reset every window. Cheapest; allows up to ``2 * limit`` across
+    a window boundary.
+sliding_window
+    Weighted count of the previous and current window (one small hash per
+    key). Close to exact with constant memory.
+sliding_log
+    Exact: one sorted-set member per request in the window, so memory grows
+    with ``limit``.
+gcra
+    Generic cell rate algorithm: one timestamp per key, spreads requests
+    evenly while allowing a burst of ``limit``.
+"""
+
+from typing import Dict, NamedTuple
+
+from app.core.redis_scripts import LuaScript
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of one rate limit check."""
+
+    allowed: bool
+    retry_after: float  # seconds; 0 when allowed
+    remaining: int
+
+
+_NOW_MS = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+"""
+
+# Each algorithm defines decide(key, limit, window_ms), returning allowed,
+# retry_ms, remaining and, when allowed, a function that counts the request
+_CHECK_ALL = """
+local replies, commits, all_allowed = {}, {}, true
+for i, key in ipairs(KEYS) do
+  local n = 3 * i
+  local allowed, retry, remaining, commit =
+    decide(key, tonumber(ARGV[n - 2]), tonumber(ARGV[n - 1]) * 1000)
+  if allowed then
+    replies[i] = {1, 0, remaining}
+    if ARGV[n] == '1' then commits[#commits + 1] = commit end
+  else
+    replies[i] = {0, retry, 0}
+    all_allowed = false
+  end
+end
+if all_allowed then
+  for _, commit in ipairs(commits) do commit() end
+end
+return replies
+"""
+
+FIXED_WINDOW = """
+local function decide(key, limit, window)
+  local count = tonumber(redis.call('GET', key) or '0')
+  if count >= limit then
+    local ttl = redis.call('PTTL', key)
+    if ttl < 0 then ttl = window end
+    return false, ttl
+  end
+  return true, 0, limit - count - 1, function()
+    redis.call('INCR', key)
+    if redis.call('PTTL', key) < 0 then
+      redis.call('PEXPIRE', key, window)
+    end
+  end
+end
+""" + _CHECK_ALL
+
+SLIDING_WINDOW = _NOW_MS + """
+local function decide(key, limit, window)
+  local idx = math.floor(now / window)
+  local elapsed = now - idx * window
+  local state = redis.call('HMGET', key, 'w', 'c', 'p')
+  local w = tonumber(state[1])
+  local cur = tonumber(state[2]) or 0
+  local prev = tonumber(state[3]) or 0
+  if w ~= idx then
+    if w == idx - 1 then prev = cur else prev = 0 end
+    cur = 0
+  end
+  local weighted = prev * (window - elapsed) / window + cur
+  if weighted + 1 <= limit then
+    return true, 0, math.floor(limit - weighted - 1), function()
+      redis.call('HSET', key, 'w', idx, 'c', cur + 1, 'p', prev)
+      redis.call('PEXPIRE', key, 2 * window)
+    end
+  end
+  local retry
+  if cur + 1 <= limit and prev > 0 then
+    -- previous window's share decays enough within this window
+    retry = window * (1 - (limit - 1 - cur) / prev) - elapsed
+  else
+    -- wait for the next window, where this one's count is the decaying share
+    retry = window - elapsed
+    if cur > 0 and limit > 1 then
+      retry = retry + window * math.max(0, 1 - (limit - 1) / cur)
+    elseif limit <= 1 then
+      retry = retry + window
+    end
+  end
+  return false, math.max(1, math.ceil(retry))
+end
+""" + _CHECK_ALL
+
+SLIDING_LOG = _NOW_MS + """
+local function decide(key, limit, window)
+  redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+  local count = redis.call('ZCARD', key)
+  if count >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry = window
+    if oldest[2] then retry = tonumber(oldest[2]) + window - now end
+    return false, math.max(1, retry)
+  end
+  return true, 0, limit - count - 1, function()
+    redis.call('ZADD', key, now, t[1] .. t[2] .. ':' .. count)
+    redis.call('PEXPIRE', key, window)
+  end
+end
+""" + _CHECK_ALL
+
+GCRA = _NOW_MS + """
+local function decide(key, limit, window)
+  local interval = window / limit
+  local tat = math.max(tonumber(redis.call('GET', key)) or now, now)
+  local new_tat = tat + interval
+  local allow_at = new_tat - window
+  if now < allow_at then
+    return false, math.max(1, math.ceil(allow_at - now))
+  end
+  return true, 0, math.floor((now - allow_at) / interval), function()
+    redis.call('SET', key, math.ceil(new_tat), 'PX', math.ceil(new_tat - now))
+  end
+end
+""" + _CHECK_ALL
+
+RATE_LIMIT_SCRIPTS: Dict[str, LuaScript] = {
+    "fixed_window": LuaScript(FIXED_WINDOW),
+    "sliding_window": LuaScript(SLIDING_WINDOW),
+    "sliding_log": LuaScript(SLIDING_LOG),
+    "gcra": LuaScript(GCRA),
+}
@@ -3,36 +3,236 @@
 """
 app/core/rate_limiter.py
 
-Implements rate limiting (fixed window) using Redis for FastAPI endpoints.
+Implements rate limiting using Redis for FastAPI endpoints.
 Prevents brute-force attacks and request flooding by IP or user identifier.
+
+Each check is one atomic ``EVALSHA`` of a Lua script (see
+``app.core.rate_limit_scripts``), selected by ``RATE_LIMIT_ALGORITHM``.
+With ``RATE_LIMIT_LOCAL_TIER`` enabled, checks go through the in-process
+tier in ``app.core.local_rate_limiter`` instead.
+
+Routes with several limits declare them in
+``app.core.rate_limit_policies`` and call :meth:`RateLimiter.enforce`.
+
+Direct Redis checks go through the ``rate_limit`` circuit breaker and, by
+default, allow the request while Redis is unavailable; the local tier has
+its own degraded mode.
 """
 
-from typing import Optional
+import math
+from typing import (
+    Awaitable,
+    Callable,
+    Collection,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import redis.asyncio as aioredis
 from fastapi import Depends, HTTPException, Request, status
 
+from app.core.circuit_breaker import rate_limit_breaker
 from app.core.config import settings
+from app.core.local_rate_limiter import LocalRateTier
+from app.core.rate_limit_policies import (
+    RATE_LIMIT_POLICIES,
+    identity_digest,
+    policy_key,
+)
+from app.core.rate_limit_scripts import RATE_LIMIT_SCRIPTS, RateLimitDecision
+from app.core.redis_cache import get_redis
+
+local_tier: Optional[LocalRateTier] = (
+    LocalRateTier(
+        allowance=settings.rate_limit.local_allowance,
+        sync_interval=settings.rate_limit.sync_interval,
+        max_keys=settings.rate_limit.local_max_keys,
+    )
+    if settings.rate_limit.local_tier
+    else None
+)
+
+# Shared identity of requests without a client address (e.g. a Unix socket)
+UNKNOWN_CLIENT = "unknown"
+
+# Decision used when the breaker fails open
+FAIL_OPEN_DECISION = RateLimitDecision(True, 0.0, 0)
 
 
 class RateLimiter:
     """
-    Fixed-window rate limiter backed by Redis.
+    Rate limiter backed by Redis.
 
     Parameters
     ----------
-    redis_url : str
-        Redis connection string.
+    redis : aioredis.Redis
+        Shared Redis client.
     limit : int
         Maximum allowed requests in the window.
     window : int
         Time window in seconds.
+    algorithm : str
+        Key of ``RATE_LIMIT_SCRIPTS`` (default ``"fixed_window"``).
+    local : LocalRateTier, optional
+        In-process tier to count through; replaces ``algorithm`` with
+        batched fixed-window counting.
     """
 
-    def __init__(self, redis_url: str, limit: int, window: int) -> None:
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        limit: int,
+        window: int,
+        algorithm: str = "fixed_window",
+        local: Optional[LocalRateTier] = None,
+    ) -> None:
         self.limit = limit
         self.window = window
-        self.redis = aioredis.from_url(redis_url, decode_responses=True)
+        self.redis = redis
+        self.local = local
+        self.script = RATE_LIMIT_SCRIPTS[algorithm]
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        """
+        Count one request against ``key``.
+
+        Parameters
+        ----------
+        key : str
+            Redis key identifying the limited subject.
+
+        Returns
+        -------
+        RateLimitDecision
+            Whether the request is allowed, when to retry and what is left.
+        """
+        if self.local is not None:
+            return await self.local.hit(self.redis, key, self.limit, self.window)
+        return await self.hit_many([(key, self.limit, self.window)])
+
+    async def hit_many(
+        self,
+        counters: Sequence[Tuple[str, int, int]],
+        check_only: Collection[str] = (),
+    ) -> RateLimitDecision:
+        """
+        Count one request against several counters in one round trip.
+
+        Every counter is checked first, and the request is counted only if
+        all of them allow it, so a request one limit rejects (per IP, say)
+        does not use up the others (route-wide).
+
+        Parameters
+        ----------
+        counters : Sequence[tuple[str, int, int]]
+            ``(key, limit, window)`` for each counter.
+        check_only : Collection[str]
+            Keys of ``counters`` that are checked but not counted.
+
+        Returns
+        -------
+        RateLimitDecision
+            Allowed only if every counter allows it; the longest retry and
+            the smallest remaining count.
+        """
+        if self.local is not None:
+            decisions = await self._hit_many_local(self.local, counters, check_only)
+        else:
+            args: List[int] = []
+            for key, limit, window in counters:
+                args += [limit, window, int(key not in check_only)]
+            replies = await self.script(
+                self.redis, [key for key, _, _ in counters], args
+            )
+            decisions = [
+                RateLimitDecision(bool(allowed), retry_after_ms / 1000, remaining)
+                for allowed, retry_after_ms, remaining in replies
+            ]
+        return RateLimitDecision(
+            all(d.allowed for d in decisions),
+            max((d.retry_after for d in decisions if not d.allowed), default=0),
+            min((d.remaining for d in decisions), default=0),
+        )
+
+    async def _hit_many_local(
+        self,
+        local: LocalRateTier,
+        counters: Sequence[Tuple[str, int, int]],
+        check_only: Collection[str],
+    ) -> List[RateLimitDecision]:
+        decisions = [local.check(key, limit, window) for key, limit, window in counters]
+        if not all(d.allowed for d in decisions):
+            return decisions
+        # A counter may still reject once synced; later ones are then not hit
+        decisions = []
+        for key, limit, window in counters:
+            if key not in check_only:
+                decisions.append(await local.hit(self.redis, key, limit, window))
+                if not decisions[-1].allowed:
+                    break
+        return decisions
+
+    async def _guarded(
+        self, decide: Callable[[], Awaitable[RateLimitDecision]]
+    ) -> RateLimitDecision:
+        # The local tier degrades on its own; only direct Redis calls are guarded
+        if self.local is not None:
+            return await decide()
+        return await rate_limit_breaker.guard(decide, FAIL_OPEN_DECISION)
+
+    async def enforce(
+        self, request: Request, route: str, email: Optional[str] = None
+    ) -> None:
+        """
+        Apply every policy registered for ``route``.
+
+        Policies marked ``failures_only`` are checked here but counted by
+        :meth:`count_failure`.
+
+        Parameters
+        ----------
+        request : Request
+            FastAPI request instance.
+        route : str
+            Key of ``RATE_LIMIT_POLICIES``.
+        email : str, optional
+            Submitted email, for email-scoped policies.
+
+        Raises
+        ------
+        HTTPException
+            If any policy's limit is exceeded.
+        DependencyUnavailableError
+            If Redis is unavailable and rate limiting fails closed.
+        """
+        counters, failure_keys = _counters(request, route, email)
+        _raise_if_denied(
+            await self._guarded(lambda: self.hit_many(counters, failure_keys))
+        )
+
+    async def count_failure(
+        self, request: Request, route: str, email: Optional[str] = None
+    ) -> None:
+        """
+        Count a failed attempt (a wrong password) against the ``failures_only``
+        policies of ``route``.
+
+        Parameters
+        ----------
+        request : Request
+            FastAPI request instance.
+        route : str
+            Key of ``RATE_LIMIT_POLICIES``.
+        email : str, optional
+            Submitted email, for email-scoped policies.
+        """
+        counters, failure_keys = _counters(request, route, email)
+        failures = [counter for counter in counters if counter[0] in failure_keys]
+        if failures:
+            await self._guarded(lambda: self.hit_many(failures))
 
     async def check(
         self,
@@ -55,46 +255,70 @@ class RateLimiter:
         HTTPException
             If request limit exceeded.
         """
-        client_ip = request.client.host
+        client_ip = client_ip_of(request)
         if identifier:
             key_id = f"user:{identifier}:ip:{client_ip}"
         else:
             key_id = f"ip:{client_ip}"
 
         endpoint = request.url.path
-        key = f"rl:{endpoint}:{key_id}"
-
-        current_count = await self.redis.incr(key)
-        if current_count == 1:
-            await self.redis.expire(key, self.window)
-
-        if current_count > self.limit:
-            ttl = await self.redis.ttl(key)
-            retry_after = max(ttl, 1)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many requests. Please try again later.",
-                headers={"Retry-After": str(retry_after)},
-            )
+        key = f"rl:{endpoint}:{identity_digest(key_id)}"
+
+        _raise_if_denied(await self._guarded(lambda: self.hit(key)))
+
+
+def client_ip_of(request: Request) -> str:
+    """Client address, or ``"unknown"`` when the server gives none."""
+    return request.client.host if request.client else UNKNOWN_CLIENT
 
 
-def get_rate_limiter() -> RateLimiter:
+def _counters(
+    request: Request, route: str, email: Optional[str]
+) -> Tuple[List[Tuple[str, int, int]], Set[str]]:
+    """``(key, limit, window)`` of every policy of ``route`` that applies, and
+    the keys of the ``failures_only`` ones."""
+    client_ip = client_ip_of(request)
+    counters = []
+    failure_keys = set()
+    for policy in RATE_LIMIT_POLICIES[route]:
+        key = policy_key(route, policy, client_ip, email)
+        if key is not None:
+            counters.append((key, policy.limit, policy.window))
+            if policy.failures_only:
+                failure_keys.add(key)
+    return counters, failure_keys
+
+
+def _raise_if_denied(decision: RateLimitDecision) -> None:
+    if not decision.allowed:
+        retry_after = max(math.ceil(decision.retry_after), 1)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests. Please try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def get_rate_limiter(redis: aioredis.Redis = Depends(get_redis)) -> RateLimiter:
     """
     Dependency factory for rate limiter.
 
+    Parameters
+    ----------
+    redis : aioredis.Redis
+        Shared Redis client from the process-wide pool.
+
     Returns
     -------
     RateLimiter
         Configured rate limiter instance using settings.
     """
-    redis_url = (
-        f"redis://:{settings.redis.password}@{settings.redis.host}:"
-        f"{settings.redis.port}/{settings.redis.db}"
-    )
     return RateLimiter(
-        redis_url=redis_url,
+        redis=redis,
         limit=settings.rate_limit.count,
         window=settings.rate_limit.window,
+        algorithm=settings.rate_limit.algorithm,
+        local=local_tier,
     )
 
 
@@ -1,12 +1,90 @@
 # app/core/redis_cache.py
+"""
+Process-wide Redis connection pool.
+
+Every Redis user (token blacklist, rate limiter, health checks) goes through
+:data:`redis_manager`, so a worker holds at most ``REDIS_MAX_CONNECTIONS``
+connections. The pool is opened in the FastAPI lifespan and closed on
+shutdown; code running outside the app (scripts, benchmarks) gets it lazily
+on first use.
+
+When every connection is busy, callers wait up to ``REDIS_POOL_TIMEOUT``
+seconds for one instead of opening more, then get a ``ConnectionError``.
+"""
+
+from typing import Any, Dict, Optional
+
 import redis.asyncio as redis
 
-from app.core.config import settings
+from app.core.config import RedisSettings, settings
+
+
+class RedisManager:
+    """
+    Owner of the shared Redis client and its connection pool.
+
+    Parameters
+    ----------
+    config : RedisSettings
+        Connection, pool and timeout settings.
+    """
+
+    def __init__(self, config: RedisSettings) -> None:
+        self.config = config
+        self._client: Optional[redis.Redis] = None
+
+    def _build_client(self) -> redis.Redis:
+        pool = redis.BlockingConnectionPool(
+            host=self.config.host,
+            port=self.config.port,
+            password=self.config.password,
+            db=self.config.db,
+            max_connections=self.config.max_connections,
+            timeout=self.config.pool_timeout,
+            socket_timeout=self.config.socket_timeout,
+            socket_connect_timeout=self.config.socket_connect_timeout,
+            health_check_interval=self.config.health_check_interval,
+            decode_responses=True,
+        )
+        # from_pool: closing the client also disconnects the pool
+        return redis.Redis.from_pool(pool)
+
+    @property
+    def client(self) -> redis.Redis:
+        """The shared client, creating the pool on first use."""
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self) -> None:
+        """Create the pool (connections are opened on demand)."""
+        if self._client is None:
+            self._client = self._build_client()
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and in-use/idle connection counts."""
+        stats: Dict[str, Any] = {
+            "max_connections": self.config.max_connections,
+            "in_use": 0,
+            "idle": 0,
+        }
+        if self._client is not None:
+            pool = self._client.connection_pool
+            # redis-py exposes no public counters for these
+            stats["in_use"] = len(pool._in_use_connections)
+            stats["idle"] = len(pool._available_connections)
+        return stats
+
+
+redis_manager = RedisManager(settings.redis)
+
 
-redis_client = redis.Redis(
-    host=settings.redis.host,
-    port=settings.redis.port,
-    password=settings.redis.password,
-    db=settings.redis.db,
-    decode_responses=True,
-)
+def get_redis() -> redis.Redis:
+    """FastAPI dependency returning the shared Redis client."""
+    return redis_manager.client
@@ -0,0 +1,117 @@
+# app/core/redis_scripts.py
+"""
+Lua scripts run by SHA.
+
+A :class:`LuaScript` is built once, at import, and only ever sends
+``EVALSHA``: its SHA1 is computed locally, and the script is loaded with
+``SCRIPT LOAD`` only when Redis answers ``NOSCRIPT`` (after a restart or a
+``SCRIPT FLUSH``), then the call is retried. :func:`preload_scripts` loads
+every script at startup, so the retry is rare.
+
+redis-py's ``register_script`` is not used: queued on a pipeline, its scripts
+make ``execute()`` send a ``SCRIPT EXISTS`` round trip first, and registering
+per call hashes the source every time.
+"""
+
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, List, Sequence, cast
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import NoScriptError
+
+logger = logging.getLogger(__name__)
+
+_scripts: List["LuaScript"] = []
+
+
+class LuaScript:
+    """
+    A Lua script, called by SHA.
+
+    Parameters
+    ----------
+    source : str
+        Lua source.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+        _scripts.append(self)
+
+    async def __call__(
+        self, redis: Redis, keys: Sequence[str], args: Sequence[Any]
+    ) -> Any:
+        """Run the script in one ``EVALSHA``, loading it if Redis lacks it."""
+        try:
+            return await self._evalsha(redis, keys, args)
+        except NoScriptError:
+            await self.load(redis)
+            return await self._evalsha(redis, keys, args)
+
+    def _evalsha(
+        self, redis: Redis, keys: Sequence[str], args: Sequence[Any]
+    ) -> Awaitable[Any]:
+        # redis-py types commands as sync-or-async
+        return cast(Awaitable[Any], redis.evalsha(self.sha, len(keys), *keys, *args))
+
+    def queue(self, pipe: Pipeline, keys: Sequence[str], args: Sequence[Any]) -> None:
+        """Queue an ``EVALSHA`` on ``pipe``; run it with :func:`execute_pipeline`."""
+        pipe.evalsha(self.sha, len(keys), *keys, *args)
+
+    async def load(self, redis: Redis) -> None:
+        """``SCRIPT LOAD`` the script."""
+        await redis.script_load(self.source)
+
+
+async def execute_pipeline(
+    redis: Redis, build: Callable[[Pipeline], None], scripts: Sequence[LuaScript]
+) -> List[Any]:
+    """
+    Execute a non-transactional pipeline of queued scripts in one round trip.
+
+    Parameters
+    ----------
+    redis : Redis
+        Client to open the pipeline on.
+    build : Callable[[Pipeline], None]
+        Queues the commands; called again for the retry.
+    scripts : Sequence[LuaScript]
+        Scripts ``build`` queues, loaded if Redis answers ``NOSCRIPT``.
+
+    Returns
+    -------
+    list
+        One reply per queued command.
+
+    Notes
+    -----
+    On ``NOSCRIPT`` the whole pipeline is sent again, so the commands other
+    than the failed ``EVALSHA`` calls must be safe to repeat.
+    """
+    pipe = redis.pipeline(transaction=False)
+    build(pipe)
+    try:
+        return await pipe.execute()
+    except NoScriptError:
+        for script in scripts:
+            await script.load(redis)
+        pipe = redis.pipeline(transaction=False)
+        build(pipe)
+        return await pipe.execute()
+
+
+async def preload_scripts(redis: Redis) -> None:
+    """
+    ``SCRIPT LOAD`` every :class:`LuaScript`.
+
+    Called at startup so the first requests already hit ``EVALSHA``. Failure
+    is not fatal: a missing script is loaded on first use.
+    """
+    try:
+        for script in _scripts:
+            await script.load(redis)
+    except Exception:
+        logger.warning("Could not preload Lua scripts", exc_info=True)
@@ -1,20 +1,32 @@
 # app/core/security.py
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
-
-import jwt
+from typing import Any, Dict, Mapping
 
 from app.core.config import settings
+from app.core.keys import KeyRing
 
-SECRET_KEY = settings.jwt.secret_key
-ALGORITHM = settings.jwt.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt.access_expire_minutes
 REFRESH_TOKEN_EXPIRE_DAYS = settings.jwt.refresh_expire_days
 
+# "typ" claim values
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Parsed once; see app/core/keys.py for modes and rotation.
+key_ring = KeyRing.load(
+    algorithm=settings.jwt.algorithm,
+    secret_key=settings.jwt.secret_key,
+    keys_dir=settings.jwt.keys_dir,
+    active_kid=settings.jwt.active_kid,
+)
+
 
 def create_access_token(
-    email: str, role: str, expires_delta: timedelta | None = None
+    email: str,
+    role: str,
+    expires_delta: timedelta | None = None,
+    generation: int = 0,
 ) -> str:
     now = datetime.now(timezone.utc)
     expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -23,13 +35,22 @@ def create_access_token(
         "role": role,
         "iat": now,
         "exp": expire,
+        "jti": str(uuid.uuid4()),
+        "gen": generation,
+        "typ": ACCESS_TOKEN_TYPE,
     }
-    return str(jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM))
+    return key_ring.encode(payload)
 
 
 def create_refresh_token(
-    email: str, role: str, expires_delta: timedelta | None = None
+    email: str,
+    role: str,
+    expires_delta: timedelta | None = None,
+    generation: int = 0,
+    family: str | None = None,
 ) -> tuple[str, str]:
+    # family links rotated tokens (app/services/refresh_tokens.py); None
+    # starts a new one, as at login
     now = datetime.now(timezone.utc)
     expire = now + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
     jti = str(uuid.uuid4())
@@ -39,10 +60,25 @@ def create_refresh_token(
         "iat": now,
         "exp": expire,
         "jti": jti,
+        "gen": generation,
+        "fam": family or str(uuid.uuid4()),
+        "typ": REFRESH_TOKEN_TYPE,
     }
-    token = str(jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM))
+    token = key_ring.encode(payload)
     return token, jti
 
 
 def decode_token(token: str) -> Dict[str, Any]:
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return key_ring.decode(token)
+
+
+def is_refresh_token(payload: Mapping[str, Any]) -> bool:
+    """
+    Whether decoded claims belong to a refresh token.
+
+    Refresh tokens minted before the ``typ`` claim existed are recognised by
+    their ``fam`` claim, which access tokens never carry.
+    """
+    if "typ" in payload:
+        return bool(payload["typ"] == REFRESH_TOKEN_TYPE)
+    return "fam" in payload
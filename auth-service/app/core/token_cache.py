@@ -0,0 +1,62 @@
+# app/core/token_cache.py
+"""
+Cache of verified tokens.
+
+Clients replay the same access token for its whole lifetime, so the result
+of signature verification and claim parsing is cached per token until the
+token's own ``exp``. Only verification is cached: revocation is checked by
+the caller on every request.
+"""
+
+import hashlib
+import sys
+
+from app.core.config import settings
+from app.core.lru_cache import TTLCache
+from app.core.principal import Principal
+from app.core.security import decode_token
+
+# Digest + OrderedDict node + tuple overhead, measured on CPython 3.11.
+_ENTRY_OVERHEAD = 200
+
+verified_token_cache: TTLCache[bytes, Principal] = TTLCache(
+    max_entries=settings.token_cache.max_entries,
+    max_bytes=settings.token_cache.max_bytes,
+)
+
+
+def token_digest(token: str) -> bytes:
+    """128-bit digest of the full token (header, claims and signature)."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _entry_size(principal: Principal) -> int:
+    size = _ENTRY_OVERHEAD + sys.getsizeof(principal)
+    for value in (principal.email, principal.role, principal.jti):
+        if value is not None:
+            size += sys.getsizeof(value)
+    return size
+
+
+def verify_token(token: str) -> Principal:
+    """
+    Verify ``token`` and return its principal, using the cache when possible.
+
+    Raises
+    ------
+    jwt.PyJWTError
+        If the token is malformed, badly signed or expired.
+    """
+    if not settings.token_cache.enabled:
+        return Principal.from_claims(decode_token(token))
+
+    key = token_digest(token)
+    principal = verified_token_cache.get(key)
+    if principal is None:
+        principal = Principal.from_claims(decode_token(token))
+        # Tokens without exp never expire on their own; don't pin them.
+        if principal.exp is not None:
+            verified_token_cache.set(
+                key, principal, principal.exp, size=_entry_size(principal)
+            )
+    return principal
@@ -0,0 +1,194 @@
+# app/db/batch_loader.py
+"""
+Micro-batched lookups (the DataLoader pattern).
+
+Under load, many concurrent requests each look up one user. A
+:class:`BatchLoader` collects the keys requested within a short window
+(``USER_LOADER_WINDOW_MS``, default 0.5 ms), or until
+``USER_LOADER_MAX_BATCH_SIZE`` keys are waiting, fetches them with one query
+and hands every caller its own result:
+
+* concurrent loads of the same key share one slot in the batch, and a load
+  of a key whose batch is already running waits for that batch;
+* a caller that is cancelled does not cancel the batch for the others;
+* a failed fetch raises in every caller of that batch.
+
+:data:`user_by_email_loader` batches the :data:`crud.AUTH_COLUMNS` lookups
+of the user cache into ``WHERE email = ANY($1)`` on a read session, and
+retries keys a replica does not have yet on the primary.
+"""
+
+import asyncio
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import crud
+from app.db.replicas import ReadSessionLocal, replica_router, uses_replica
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Coalesces concurrent :meth:`load` calls into batched fetches.
+
+    Parameters
+    ----------
+    name : str
+        Used in logs and stats.
+    fetch : Callable[[List[K]], Awaitable[Dict[K, V]]]
+        Fetches a batch of distinct keys; keys missing from the result load
+        as None.
+    max_batch_size : int
+        Keys per fetch; a full batch is dispatched at once.
+    window : float
+        Seconds to wait for more keys after the first one of a batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int,
+        window: float,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window
+        self._pending: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._inflight: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+        # Metrics
+        self.loads = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.full_batches = 0
+        self.keys_fetched = 0
+        self.failures = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        """Value for ``key`` (None if not found), fetched in a batch."""
+        self.loads += 1
+        future = self._inflight.get(key) or self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            # Retrieve the exception even if every caller was cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self.full_batches += 1
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # Shielded: one caller's cancellation must not fail the whole batch
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._inflight.update(batch)
+        self.batches += 1
+        self.keys_fetched += len(batch)
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[K, "asyncio.Future[Optional[V]]"]) -> None:
+        try:
+            results = await self.fetch(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            self.failures += 1
+            logger.warning("Batch %s of %d keys failed: %s", self.name, len(batch), exc)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            for key in batch:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts, average size and fill rate."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "window_ms": round(self.window * 1000, 3),
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "full_batches": self.full_batches,
+            "avg_batch_size": (
+                round(self.keys_fetched / self.batches, 2) if self.batches else 0.0
+            ),
+            "fill_rate": (
+                round(self.keys_fetched / (self.batches * self.max_batch_size), 4)
+                if self.batches
+                else 0.0
+            ),
+            "failures": self.failures,
+        }
+
+
+async def _fetch_users(
+    keys: List[K],
+    query: Callable[[AsyncSession, Sequence[K]], Awaitable[Sequence[Row[Any]]]],
+    key_of: Callable[[Row[Any]], K],
+) -> Dict[K, Row[Any]]:
+    """Run ``query`` on a read session; keys a replica lacks go to the primary."""
+    async with ReadSessionLocal() as db:
+        rows = {key_of(row): row for row in await query(db, keys)}
+        missing = [key for key in keys if key not in rows]
+        if missing and uses_replica(db):
+            replica_router.replica_misses += len(missing)
+            db.info["primary"] = True
+            rows.update({key_of(row): row for row in await query(db, missing)})
+    return rows
+
+
+async def _fetch_users_by_email(emails: List[str]) -> Dict[str, Row[Any]]:
+    return await _fetch_users(emails, crud.get_auth_users_by_emails, lambda r: r.email)
+
+
+_config = settings.user_loader
+
+user_by_email_loader: BatchLoader[str, Row[Any]] = BatchLoader(
+    "user_by_email",
+    _fetch_users_by_email,
+    max_batch_size=_config.max_batch_size,
+    window=_config.window_ms / 1000,
+)
@@ -1,10 +1,21 @@
 # app/db/crud.py
 """Async CRUD operations for User and related models."""
 
-from sqlalchemy import select
+from typing import Any, Sequence
+
+from sqlalchemy import (
+    Row,
+    String,
+    any_,
+    bindparam,
+    lambda_stmt,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.hashing import hash_password
+from app.core.hashing import hash_password_async
 from app.db import models, schemas
 
 # -----------------------------
@@ -24,9 +35,53 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> models.User | None:
     return result.scalar_one_or_none()
 
 
+# -----------------------------
+# Authentication hot path
+# -----------------------------
+
+# Only what login and the user cache read; no timestamps, no ORM entity
+AUTH_COLUMNS = (
+    models.User.id,
+    models.User.email,
+    models.User.hashed_password,
+    models.User.role,
+    models.User.is_active,
+    models.User.token_generation,
+)
+
+
+async def get_auth_user_by_email(db: AsyncSession, email: str) -> Row[Any] | None:
+    """
+    Fetch the :data:`AUTH_COLUMNS` of a user by email, as a plain row.
+
+    A lambda statement: SQL construction and compilation are cached after
+    the first call, and asyncpg reuses the prepared statement on each
+    connection. No entity is built or added to the identity map.
+    """
+    result = await db.execute(
+        lambda_stmt(lambda: select(*AUTH_COLUMNS).where(models.User.email == email))
+    )
+    return result.one_or_none()
+
+
+# One statement for any number of keys (``= ANY($1)``, not ``IN (...)``, whose
+# SQL changes with the list length), so it stays a single prepared statement
+_AUTH_USERS_BY_EMAILS = select(*AUTH_COLUMNS).where(
+    models.User.email == any_(bindparam("emails", type_=ARRAY(String)))
+)
+
+
+async def get_auth_users_by_emails(
+    db: AsyncSession, emails: Sequence[str]
+) -> Sequence[Row[Any]]:
+    """Fetch the :data:`AUTH_COLUMNS` of several users by email in one query."""
+    result = await db.execute(_AUTH_USERS_BY_EMAILS, {"emails": list(emails)})
+    return result.all()
+
+
 async def create_user(db: AsyncSession, user: schemas.UserCreate) -> models.User:
     """Create a new user (with hashed password)."""
-    hashed_pw = hash_password(user.password)
+    hashed_pw = await hash_password_async(user.password)
     db_user = models.User(email=user.email, hashed_password=hashed_pw)
 
     db.add(db_user)
@@ -35,6 +90,39 @@ async def create_user(db: AsyncSession, user: schemas.UserCreate) -> models.User
     return db_user
 
 
+async def update_password_hash(
+    db: AsyncSession, user_id: int, old_hash: str, new_hash: str
+) -> bool:
+    """Swap a user's password hash unless it changed since ``old_hash`` was read."""
+    result = await db.execute(
+        update(models.User)
+        .where(models.User.id == user_id, models.User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    await db.commit()
+    return bool(result.rowcount == 1)
+
+
+async def bump_token_generation(db: AsyncSession, email: str) -> int | None:
+    """Increment a user's token generation; returns the new value (None if no user)."""
+    result = await db.execute(
+        update(models.User)
+        .where(models.User.email == email)
+        .values(token_generation=models.User.token_generation + 1)
+        .returning(models.User.token_generation)
+    )
+    await db.commit()
+    return result.scalar_one_or_none()
+
+
+async def get_token_generation(db: AsyncSession, email: str) -> int:
+    """Current token generation of a user (0 if there is no such user)."""
+    result = await db.execute(
+        select(models.User.token_generation).where(models.User.email == email)
+    )
+    return result.scalar_one_or_none() or 0
+
+
 async def list_users(
     db: AsyncSession, skip: int = 0, limit: int = 10
 ) -> list[models.User]:
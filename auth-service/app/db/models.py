@@ -26,6 +26,10 @@ class User(Base):
 
     is_active: "Column[bool]" = Column(Boolean, default=True, nullable=False)
     is_superuser: "Column[bool]" = Column(Boolean, default=False, nullable=False)
+    # Bumped by "log out everywhere"; tokens minted under an older one are void
+    token_generation: "Column[int]" = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: "Column[datetime]" = Column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -0,0 +1,57 @@
+# app/db/pool.py
+"""
+Database connection pool with wait-time metrics.
+
+SQLAlchemy reports how many connections are checked out and how far the
+pool has overflowed, but not how long requests wait for a connection,
+which is the first sign of an undersized pool. :class:`MeteredQueuePool`
+times every pool get (queue wait plus, on overflow, connection setup).
+"""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """:class:`AsyncAdaptedQueuePool` that records connection wait times."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.gets = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.gets += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy and connection wait times."""
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "gets": self.gets,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": (
+                round(self.wait_seconds_total / self.gets * 1000, 3)
+                if self.gets
+                else 0.0
+            ),
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+        }
@@ -0,0 +1,298 @@
+# app/db/replicas.py
+"""
+Read-replica routing for read-only user lookups.
+
+Sessions from :data:`ReadSessionLocal` (dependency :func:`get_read_db`) send
+their queries to a replica (``DB_REPLICA1_HOST``, ``DB_REPLICA2_HOST``),
+chosen once per session by ``DB_REPLICA_STRATEGY``:
+
+* ``round_robin`` -- rotate over healthy replicas;
+* ``least_latency`` -- the healthy replica with the lowest probe latency.
+
+A background task probes every replica each ``DB_REPLICA_CHECK_INTERVAL``
+seconds for replication lag and latency. A replica that fails the probe or
+lags more than ``DB_REPLICA_MAX_LAG`` seconds gets no reads until it
+recovers; with no healthy replica, reads go to the primary. Flushes always
+go to the primary.
+
+Read-your-writes: after writing a user (register, "log out everywhere"),
+:meth:`ReplicaRouter.mark_written` keeps that user's reads on the primary
+for ``DB_READ_YOUR_WRITES_SECONDS`` on this worker, and
+:func:`read_user_by_email` retries a lookup that misses on a replica
+against the primary, which covers a user registered on another worker.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import AsyncGenerator
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Row, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import crud
+from app.db.session import engine, make_engine, pool_stats
+
+logger = logging.getLogger(__name__)
+
+db_config = settings.database
+
+# Seconds behind the primary; 0 when every received WAL record is replayed
+# (an idle primary would otherwise look like growing lag), NULL on a primary
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+    "END"
+)
+
+# Weight of the newest probe in the latency moving average
+LATENCY_ALPHA = 0.3
+
+
+def replica_url(host: str) -> URL:
+    """Primary ``DB_URI`` with the host (``name`` or ``name:port``) replaced."""
+    url = make_url(db_config.uri)
+    name, _, port = host.partition(":")
+    return url.set(host=name, port=int(port) if port else url.port)
+
+
+class Replica:
+    """
+    One read replica and its last probe results.
+
+    Parameters
+    ----------
+    host : str
+        Host as configured, used in logs and stats.
+    async_engine : AsyncEngine
+        Engine connected to the replica.
+    """
+
+    def __init__(self, host: str, async_engine: AsyncEngine) -> None:
+        self.host = host
+        self.engine = async_engine
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.reads = 0
+        self.probe_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "latency_ms": (
+                round(self.latency * 1000, 3) if self.latency is not None else None
+            ),
+            "reads": self.reads,
+            "probe_errors": self.probe_errors,
+            "pool": pool_stats(self.engine),
+        }
+
+
+class ReplicaRouter:
+    """
+    Chooses the replica of read-only sessions and tracks replica health.
+
+    Parameters
+    ----------
+    replicas : list of Replica
+        Configured replicas; empty to read from the primary only.
+    strategy : {"round_robin", "least_latency"}
+        How a healthy replica is chosen.
+    max_lag : float
+        Replication lag, in seconds, above which a replica gets no reads.
+    check_interval : float
+        Seconds between health probes.
+    read_your_writes : float
+        Seconds a written user's reads stay on the primary.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        strategy: str,
+        max_lag: float,
+        check_interval: float,
+        read_your_writes: float,
+    ) -> None:
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_your_writes = read_your_writes
+        self._turn = itertools.count()
+        # key -> monotonic deadline of its read-your-writes window
+        self._recent_writes: Dict[str, float] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+        # Metrics
+        self.primary_reads = 0
+        self.replica_misses = 0
+
+    def choose(self) -> Optional[Replica]:
+        """A healthy replica for a new read-only session, or None (primary)."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_latency":
+            replica = min(healthy, key=lambda r: r.latency or 0.0)
+        else:
+            replica = healthy[next(self._turn) % len(healthy)]
+        replica.reads += 1
+        return replica
+
+    def mark_written(self, key: str) -> None:
+        """Keep reads of ``key`` (a user's email) on the primary for a while."""
+        if not self.replicas or self.read_your_writes <= 0:
+            return
+        now = time.monotonic()
+        if len(self._recent_writes) >= 1024:
+            self._recent_writes = {
+                k: until for k, until in self._recent_writes.items() if until > now
+            }
+        self._recent_writes[key] = now + self.read_your_writes
+
+    def recently_written(self, key: str) -> bool:
+        """Whether ``key`` is inside its read-your-writes window."""
+        until = self._recent_writes.get(key)
+        return until is not None and until > time.monotonic()
+
+    async def _probe(self, replica: Replica) -> None:
+        start = time.perf_counter()
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(
+                    conn.scalar(LAG_QUERY), max(self.check_interval, 1.0)
+                )
+        except Exception as exc:
+            replica.probe_errors += 1
+            if replica.healthy:
+                logger.warning("Replica %s unavailable: %s", replica.host, exc)
+            replica.healthy = False
+            return
+        latency = time.perf_counter() - start
+        replica.latency = (
+            latency
+            if replica.latency is None
+            else LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * replica.latency
+        )
+        replica.lag = float(lag or 0.0)
+        healthy = replica.lag <= self.max_lag
+        if healthy != replica.healthy:
+            logger.info(
+                "Replica %s %s (lag %.3fs)",
+                replica.host,
+                "back in rotation" if healthy else "lagging",
+                replica.lag,
+            )
+        replica.healthy = healthy
+
+    async def check(self) -> None:
+        """Probe every replica once."""
+        await asyncio.gather(*(self._probe(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Start health probes in the background (no-op without replicas)."""
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing and close replica connections."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait({self._task}, timeout=self.check_interval + 1)
+            self._task = None
+        for replica in self.replicas:
+            replica.healthy = False
+            await replica.engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-replica health and routing counters."""
+        return {
+            "strategy": self.strategy,
+            "replicas": {replica.host: replica.stats() for replica in self.replicas},
+            "primary_reads": self.primary_reads,
+            "replica_misses": self.replica_misses,
+            "recent_writes": len(self._recent_writes),
+        }
+
+
+replica_router = ReplicaRouter(
+    [
+        Replica(host, make_engine(replica_url(host)))
+        for host in (db_config.replica1_host, db_config.replica2_host)
+        if host
+    ],
+    strategy=db_config.replica_strategy,
+    max_lag=db_config.replica_max_lag,
+    check_interval=db_config.replica_check_interval,
+    read_your_writes=db_config.read_your_writes_seconds,
+)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends a read-only session's queries to a replica.
+
+    The replica is chosen on first use and kept for the whole session, so
+    its queries see one consistent snapshot. Setting ``info["primary"]``
+    moves later queries to the primary.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        if self.info.get("read_only") and not self._flushing:
+            if not self.info.get("primary"):
+                replica = self.info.get("replica") or replica_router.choose()
+                if replica is not None:
+                    self.info["replica"] = replica
+                    return replica.engine.sync_engine
+                self.info["primary"] = True
+            replica_router.primary_reads += 1
+        return engine.sync_engine
+
+
+ReadSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    info={"read_only": True},
+)
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a read-only session routed to a replica when one is healthy."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def uses_replica(db: AsyncSession) -> bool:
+    """Whether ``db``'s queries currently go to a replica."""
+    return db.info.get("replica") is not None and not db.info.get("primary")
+
+
+async def read_user_by_email(db: AsyncSession, email: str) -> Row[Any] | None:
+    """
+    :func:`crud.get_auth_user_by_email` with read-your-writes on a read session.
+
+    Reads from the primary inside the user's read-your-writes window, and
+    retries on the primary when the replica does not have the user yet.
+    """
+    if replica_router.recently_written(email):
+        db.info["primary"] = True
+    user = await crud.get_auth_user_by_email(db, email)
+    if user is None and uses_replica(db):
+        replica_router.replica_misses += 1
+        db.info["primary"] = True
+        user = await crud.get_auth_user_by_email(db, email)
+    return user
@@ -1,21 +1,57 @@
 """Async SQLAlchemy session for PostgreSQL using asyncpg."""
 
+import asyncio
+import logging
 from collections.abc import AsyncGenerator
+from typing import Any, Dict
 
+from sqlalchemy.engine import URL
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from app.core.config import settings
+from app.db.pool import MeteredQueuePool
 
-# Async engine for NeonDB
-engine = create_async_engine(
-    settings.database.uri,
-    echo=True,
-    connect_args={"ssl": "require"},
-)
+logger = logging.getLogger(__name__)
+
+db_config = settings.database
+
+# asyncpg's own statement cache and SQLAlchemy's prepared statement cache
+# must both be 0 behind pgbouncer in transaction mode
+_connect_args: Dict[str, Any] = {
+    "statement_cache_size": db_config.statement_cache_size,
+    "prepared_statement_cache_size": db_config.statement_cache_size,
+}
+if db_config.ssl and db_config.ssl != "disable":
+    _connect_args["ssl"] = db_config.ssl
+
+
+def make_engine(url: str | URL) -> AsyncEngine:
+    """
+    Create an async engine configured from ``DatabaseSettings``.
+
+    ``DB_POOL_MIN`` connections are kept open, up to ``DB_POOL_MAX`` under
+    load.
+    """
+    return create_async_engine(
+        url,
+        echo=db_config.echo,
+        poolclass=MeteredQueuePool,
+        pool_size=db_config.pool_min,
+        max_overflow=max(db_config.pool_max - db_config.pool_min, 0),
+        pool_timeout=db_config.pool_timeout,
+        pool_recycle=db_config.pool_recycle,
+        pool_pre_ping=db_config.pool_pre_ping,
+        connect_args=_connect_args,
+    )
+
+
+# Async engine for NeonDB (primary)
+engine = make_engine(db_config.uri)
 
 # Async session factory with proper typing
 AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
@@ -28,3 +64,41 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Yield an async database session."""
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def warm_up_pool() -> None:
+    """
+    Open ``DB_POOL_MIN`` connections at startup.
+
+    Connections are opened concurrently and returned to the pool, so the
+    first requests do not pay for TCP, TLS and authentication. Failure is
+    logged, not raised: the service still starts and connects on demand.
+    """
+    if not db_config.pool_warm_up or db_config.pool_min <= 0:
+        return
+
+    async def _open_one() -> None:
+        async with engine.connect():
+            pass
+
+    results = await asyncio.gather(
+        *(_open_one() for _ in range(db_config.pool_min)), return_exceptions=True
+    )
+    failed = [r for r in results if isinstance(r, BaseException)]
+    if failed:
+        logger.warning(
+            "DB pool warm-up: %d of %d connections failed (%s)",
+            len(failed),
+            len(results),
+            failed[0],
+        )
+    else:
+        logger.info("DB pool warmed up with %d connections", len(results))
+
+
+def pool_stats(async_engine: AsyncEngine = engine) -> Dict[str, Any]:
+    """Occupancy and connection wait times of an engine's pool."""
+    pool = async_engine.pool
+    if isinstance(pool, MeteredQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
@@ -5,11 +5,52 @@ File: app/main.py
 FastAPI entrypoint for Auth Service with detailed OpenAPI documentation.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
+from starlette.routing import Route
 
 from app.api.v1 import api_v1_router
-from app.core.middleware import JWTBlacklistMiddleware
+from app.api.well_known import router as well_known_router
+from app.core.forward_auth import FORWARD_AUTH_PATH, forward_auth_app
+from app.core.hashing import hashing_pool
+from app.core.middleware import (
+    IPBlocklistMiddleware,
+    JWTAuthMiddleware,
+    ip_blocklist,
+)
+from app.core.rate_limiter import local_tier
+from app.core.redis_cache import redis_manager
+from app.core.redis_scripts import preload_scripts
+from app.db.replicas import replica_router
+from app.db.session import engine, warm_up_pool
+from app.services.token_blacklist import revocation_filter
+from app.services.user_cache import user_cache
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Start and stop process-wide resources."""
+    await redis_manager.start()
+    await preload_scripts(redis_manager.client)
+    if local_tier is not None:
+        local_tier.start(redis_manager.client)
+    revocation_filter.start(redis_manager.client)
+    user_cache.start(redis_manager.client)
+    await warm_up_pool()
+    replica_router.start()
+    yield
+    await replica_router.stop()
+    await user_cache.stop()
+    await revocation_filter.stop()
+    if local_tier is not None:
+        await local_tier.stop(redis_manager.client)
+    await redis_manager.close()
+    await engine.dispose()
+    hashing_pool.shutdown()
+
 
 app = FastAPI(
     title="Auth Service",
@@ -19,6 +60,7 @@ app = FastAPI(
         "rotation with revocation, and role-based access control (RBAC)."
     ),
     version="1.0.0",
+    lifespan=lifespan,
     contact={
         "name": "Job Board Dev Team",
         "url": "https://jobboard.example.com",
@@ -83,8 +125,20 @@ def custom_openapi() -> dict:
 # Override OpenAPI schema with custom version
 app.openapi = custom_openapi
 
-# Add middleware for token revocation checks
-app.add_middleware(JWTBlacklistMiddleware)
+# Add middleware for token verification and revocation checks
+app.add_middleware(JWTAuthMiddleware)
+
+# Reject blocklisted networks first (the last middleware added runs first)
+if ip_blocklist is not None:
+    app.add_middleware(IPBlocklistMiddleware, blocklist=ip_blocklist)
 
 # Include API v1 routers
 app.include_router(api_v1_router, prefix="/api/v1")
+
+# Key discovery (JWKS) at the root, where verifiers expect it
+app.include_router(well_known_router)
+
+# Traefik forward-auth: a bare ASGI route, matched before any API router
+app.router.routes.insert(
+    0, Route(FORWARD_AUTH_PATH, forward_auth_app, include_in_schema=False)
+)
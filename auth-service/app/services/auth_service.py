@@ -0,0 +1,86 @@
+# app/services/auth_service.py
+"""Authentication business logic."""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import jwt
+
+from app.core.principal import Principal
+from app.core.token_cache import verify_token
+from app.services.token_blacklist import are_revoked
+
+
+def _claims(principal: Principal) -> Dict[str, Any]:
+    return {
+        "email": principal.email,
+        "role": principal.role,
+        "jti": principal.jti,
+        "iat": principal.iat,
+        "exp": principal.exp,
+        "gen": principal.gen,
+        "typ": principal.typ,
+    }
+
+
+async def introspect_tokens(tokens: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Verify a batch of tokens and resolve their revocation status.
+
+    Signatures are checked locally (through the verified-token cache); all
+    revocation lookups (blacklist and token generation) go to Redis in a
+    single pipelined round trip.
+
+    Parameters
+    ----------
+    tokens : Sequence[str]
+        Encoded JWTs.
+
+    Returns
+    -------
+    list[dict]
+        One result per token, in order: ``active``, ``revoked``, ``typ``,
+        ``exp``, ``claims`` and, for unverifiable tokens, ``error``.
+    """
+    principals: List[Optional[Principal]] = []
+    errors: List[Optional[str]] = []
+    for token in tokens:
+        try:
+            principals.append(verify_token(token))
+            errors.append(None)
+        except jwt.PyJWTError as exc:
+            principals.append(None)
+            errors.append(str(exc))
+
+    verified = [p for p in principals if p is not None]
+    revoked_ids = {
+        id(principal)
+        for principal, revoked in zip(verified, await are_revoked(verified))
+        if revoked
+    }
+
+    results: List[Dict[str, Any]] = []
+    for principal, error in zip(principals, errors):
+        if principal is None:
+            results.append(
+                {
+                    "active": False,
+                    "revoked": False,
+                    "typ": None,
+                    "exp": None,
+                    "claims": None,
+                    "error": error,
+                }
+            )
+            continue
+        revoked = id(principal) in revoked_ids
+        results.append(
+            {
+                "active": not revoked,
+                "revoked": revoked,
+                "typ": principal.typ,
+                "exp": principal.exp,
+                "claims": _claims(principal),
+                "error": None,
+            }
+        )
+    return results
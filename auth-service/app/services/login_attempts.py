@@ -0,0 +1,119 @@
+# app/services/login_attempts.py
+"""
+Failed-login tracking with progressive account lockout.
+
+Per account (keyed by a digest of the lower-cased email, whether or not the
+account exists, so lockout behaviour does not reveal which emails are
+registered):
+
+* ``lf:<digest>`` counts failed logins; it expires ``LOGIN_FAILURE_WINDOW``
+  seconds after the first failure.
+* ``lk:<digest>`` exists while the account is locked; its TTL is the time
+  left.
+
+From the ``LOGIN_LOCKOUT_THRESHOLD``-th failure on, every failure locks the
+account for ``LOGIN_LOCKOUT_BASE_SECONDS * 2 ** (failures - threshold)``
+seconds, capped at ``LOGIN_LOCKOUT_MAX_SECONDS``. A successful login clears
+both keys. The lock is checked before the user lookup and password hash, so
+a locked account costs one Redis round trip.
+
+Calls go through the ``lockout`` circuit breaker; failing open (the
+default) means "not locked" and "failure not counted" while Redis is down.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from app.core.circuit_breaker import lockout_breaker
+from app.core.config import settings
+from app.core.rate_limit_policies import identity_digest
+from app.core.redis_cache import redis_manager
+from app.core.redis_scripts import LuaScript
+
+RECORD_FAILURE = LuaScript("""
+local failures = redis.call('INCR', KEYS[1])
+if failures == 1 then
+  redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+end
+local threshold = tonumber(ARGV[2])
+if failures < threshold then
+  return {failures, 0}
+end
+local lock = math.floor(math.min(
+  tonumber(ARGV[3]) * 2 ^ (failures - threshold), tonumber(ARGV[4])
+) * 1000)
+redis.call('SET', KEYS[2], failures, 'PX', lock)
+if redis.call('PTTL', KEYS[1]) < lock then
+  redis.call('PEXPIRE', KEYS[1], lock)
+end
+return {failures, lock}
+""")
+
+
+def _keys(email: str) -> List[str]:
+    digest = identity_digest(email.lower())
+    return [f"lf:{digest}", f"lk:{digest}"]
+
+
+async def lockout_remaining(email: str) -> float:
+    """Seconds until ``email`` may try to log in again; 0 if not locked."""
+    ttl_ms = await lockout_breaker.guard(
+        lambda: redis_manager.client.pttl(_keys(email)[1]), -2
+    )
+    return ttl_ms / 1000 if ttl_ms > 0 else 0.0
+
+
+async def record_failure(email: str) -> float:
+    """
+    Count a failed login for ``email``.
+
+    Returns
+    -------
+    float
+        Lockout this failure started, in seconds (0 below the threshold).
+    """
+    lockout = settings.login_lockout
+    _, lock_ms = await lockout_breaker.guard(
+        lambda: RECORD_FAILURE(
+            redis_manager.client,
+            _keys(email),
+            [
+                lockout.failure_window,
+                lockout.threshold,
+                lockout.base_seconds,
+                lockout.max_seconds,
+            ],
+        ),
+        [0, 0],
+    )
+    return lock_ms / 1000
+
+
+async def clear_failures(email: str) -> None:
+    """Forget failures and any lock for ``email`` after a successful login."""
+    await lockout_breaker.guard(lambda: redis_manager.client.delete(*_keys(email)), 0)
+
+
+async def get_lockouts(emails: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Failure count and lock state for many accounts in one round trip.
+
+    Returns
+    -------
+    list[dict]
+        ``{"email", "failures", "locked", "retry_after"}`` per email, in order.
+    """
+    pipe = redis_manager.client.pipeline(transaction=False)
+    for email in emails:
+        failures_key, lock_key = _keys(email)
+        pipe.get(failures_key)
+        pipe.pttl(lock_key)
+    results = await lockout_breaker.call(pipe.execute)
+    return [
+        {
+            "email": email,
+            "failures": int(failures or 0),
+            "locked": ttl_ms > 0,
+            "retry_after": ttl_ms / 1000 if ttl_ms > 0 else 0.0,
+        }
+        for email, failures, ttl_ms in zip(emails, results[::2], results[1::2])
+    ]
@@ -0,0 +1,137 @@
+# app/services/refresh_tokens.py
+"""
+Rotating refresh tokens with reuse detection.
+
+Every refresh token belongs to a *family* (``fam`` claim) started at login.
+Redis keeps one hash per family, ``rf:<family>``:
+
+* ``current`` -- JTI of the only refresh token that may be used next;
+* ``prev`` -- JTI of the token it replaced;
+* ``revoked`` -- set once the family is dead;
+
+and ``rf:<family>:pair``, the token pair issued by the last rotation, which
+lives only for the grace window.
+
+A refresh is one atomic script call (:data:`ROTATE`):
+
+* presenting ``current`` rotates: the new refresh token becomes ``current``;
+* presenting ``prev`` within ``REFRESH_TOKEN_GRACE_SECONDS`` of the rotation
+  returns the same ``pair`` again, so several tabs refreshing at once all
+  end up with one token pair;
+* presenting anything else is a replay of a rotated-away token: the family
+  is revoked and the legitimate holder has to log in again.
+
+The hash is created lazily by the first rotation, so login costs no Redis
+write; it expires with the newest refresh token of the family.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Literal, NamedTuple, Optional
+
+from app.core.circuit_breaker import blacklist_breaker
+from app.core.config import settings
+from app.core.redis_cache import redis_manager
+from app.core.redis_scripts import LuaScript
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rf:"
+
+# KEYS  family hash, last issued pair
+# ARGV  presented jti, new jti, new pair (JSON), grace (ms), family ttl (s)
+# Returns {status, pair}; status is rotated | grace | reused | revoked
+ROTATE = LuaScript("""
+local state = redis.call('HMGET', KEYS[1], 'current', 'prev', 'revoked')
+if state[3] then
+  return {'revoked', ''}
+end
+if not state[1] or state[1] == ARGV[1] then
+  redis.call('HSET', KEYS[1], 'current', ARGV[2], 'prev', ARGV[1])
+  redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+  if tonumber(ARGV[4]) > 0 then
+    redis.call('SET', KEYS[2], ARGV[3], 'PX', tonumber(ARGV[4]))
+  end
+  return {'rotated', ARGV[3]}
+end
+if state[2] == ARGV[1] then
+  local pair = redis.call('GET', KEYS[2])
+  if pair then
+    return {'grace', pair}
+  end
+end
+redis.call('HSET', KEYS[1], 'revoked', 1)
+redis.call('DEL', KEYS[2])
+return {'reused', ''}
+""")
+
+RotationStatus = Literal["rotated", "grace", "reused", "revoked"]
+
+
+class Rotation(NamedTuple):
+    """
+    Outcome of presenting a refresh token.
+
+    Attributes
+    ----------
+    status : {"rotated", "grace", "reused", "revoked"}
+        ``rotated`` and ``grace`` succeed; the others mean the family is
+        dead.
+    tokens : dict, optional
+        ``access_token`` and ``refresh_token`` to return on success.
+    """
+
+    status: RotationStatus
+    tokens: Optional[Dict[str, Any]]
+
+
+async def rotate_refresh_token(
+    family: str, jti: str, new_jti: str, new_tokens: Dict[str, Any]
+) -> Rotation:
+    """
+    Consume refresh token ``jti`` of ``family`` and issue ``new_tokens``.
+
+    Parameters
+    ----------
+    family : str
+        ``fam`` claim of the presented token.
+    jti : str
+        ``jti`` claim of the presented token.
+    new_jti : str
+        ``jti`` of the refresh token in ``new_tokens``.
+    new_tokens : dict
+        Freshly minted ``access_token`` / ``refresh_token``; only used when
+        the status is ``rotated``.
+
+    Returns
+    -------
+    Rotation
+        One Redis round trip.
+    """
+    key = f"{KEY_PREFIX}{family}"
+    status, pair = await blacklist_breaker.call(
+        lambda: ROTATE(
+            redis_manager.client,
+            [key, f"{key}:pair"],
+            [
+                jti,
+                new_jti,
+                json.dumps(new_tokens),
+                int(settings.jwt.refresh_grace_seconds * 1000),
+                settings.jwt.refresh_expire_days * 86400,
+            ],
+        )
+    )
+    if status == "reused":
+        logger.warning("Refresh token reuse detected; revoked family %s", family)
+    return Rotation(status, json.loads(pair) if pair else None)
+
+
+async def revoke_family(family: str) -> None:
+    """Kill every refresh token of ``family`` (logout)."""
+    key = f"{KEY_PREFIX}{family}"
+    pipe = redis_manager.client.pipeline(transaction=False)
+    pipe.hset(key, mapping={"revoked": 1})
+    pipe.expire(key, settings.jwt.refresh_expire_days * 86400)
+    pipe.delete(f"{key}:pair")
+    await blacklist_breaker.call(pipe.execute)
@@ -0,0 +1,301 @@
+# app/services/revocation_filter.py
+"""
+Worker-local copy of the token blacklist.
+
+Revocations are rare, so instead of one Redis ``EXISTS`` per authenticated
+request each worker keeps an exact set of revoked JTIs (with their ``exp``)
+and answers from memory. The set is kept current by pub/sub:
+``add_to_blacklist`` publishes ``"<jti> <exp>"`` on :data:`CHANNEL`.
+
+Per-user token generations ("log out everywhere", see
+:func:`app.services.token_blacklist.publish_generation`) travel the same
+way: ``tg:<digest>`` keys and ``"gen <digest> <generation> <expires_at>"``
+messages.
+
+Sync protocol, repeated after any disconnect:
+
+1. subscribe to :data:`CHANNEL` (messages queue up from here on);
+2. ``SCAN`` every ``bl:*``, ``blb:*`` and ``tg:*`` key and its TTL into a
+   fresh set;
+3. swap the set in, publish a marker and apply queued messages until the
+   marker comes back; the filter is now *ready*.
+
+Revoked JTIs are stored either as one ``bl:<jti>`` key each or, with
+``TOKEN_BLACKLIST_STORAGE=buckets``, as 16-byte IDs in one set per expiry
+hour (``blb:<hour>``) that expires as a whole; the filter reads both.
+
+Whenever the filter is not ready (startup, resync, or more than
+``REVOCATION_FILTER_MAX_ENTRIES`` live entries) callers must fall back to
+Redis. Entries are dropped once their token has expired.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.client import NEVER_DECODE
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bl:"
+BUCKET_PREFIX = "blb:"
+BUCKET_SECONDS = 3600
+GENERATION_PREFIX = "tg:"
+CHANNEL = "bl:revoked"
+GENERATION_MESSAGE_PREFIX = "gen "
+_MARKER_PREFIX = "sync "
+
+
+def revocation_id(jti: str) -> bytes:
+    """16-byte binary form of a JTI (a hash if it is not a UUID)."""
+    try:
+        return uuid.UUID(jti).bytes
+    except ValueError:
+        return hashlib.blake2b(jti.encode(), digest_size=16).digest()
+
+
+def bucket_key(exp: float) -> str:
+    """Set holding revoked IDs of tokens expiring in the same hour as ``exp``."""
+    return f"{BUCKET_PREFIX}{int(exp) // BUCKET_SECONDS}"
+
+
+def bucket_expires_at(exp: float) -> int:
+    """When the bucket of ``exp`` can be dropped (end of its hour)."""
+    return (int(exp) // BUCKET_SECONDS + 1) * BUCKET_SECONDS
+
+
+class RevocationFilter:
+    """
+    Exact in-process set of revoked JTIs and per-user token generations,
+    synchronized from Redis.
+
+    Parameters
+    ----------
+    max_entries : int
+        Live revocations and generations held locally; past this the filter
+        reports not ready and lookups go to Redis.
+    prune_interval : float
+        Seconds between sweeps of expired entries.
+    retry_delay : float
+        Seconds to wait before resyncing after a Redis error.
+    """
+
+    def __init__(
+        self, max_entries: int, prune_interval: float, retry_delay: float
+    ) -> None:
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self.retry_delay = retry_delay
+        # revocation_id(jti) -> exp (unix seconds)
+        self._revoked: Dict[bytes, float] = {}
+        # user digest -> (generation, expires_at)
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._needs_resync = False
+        self.ready = False
+
+        # Metrics
+        self.resyncs = 0
+        self.messages = 0
+        self.overflows = 0
+
+    def contains(self, jti: str) -> bool:
+        """Whether ``jti`` is revoked. Only meaningful while :attr:`ready`."""
+        exp = self._revoked.get(revocation_id(jti))
+        return exp is not None and exp > time.time()
+
+    def generation(self, digest: str) -> int:
+        """
+        Current token generation of a user (0 if never bumped). Only
+        meaningful while :attr:`ready`.
+        """
+        entry = self._generations.get(digest)
+        return entry[0] if entry is not None and entry[1] > time.time() else 0
+
+    def _size(self) -> int:
+        return len(self._revoked) + len(self._generations)
+
+    def _has_room(self) -> bool:
+        if self._size() < self.max_entries:
+            return True
+        self._prune()
+        if self._size() < self.max_entries:
+            return True
+        if self.ready:
+            # Incomplete from now on: serve from Redis until a resync fits
+            logger.warning("Revocation filter full; falling back to Redis")
+            self.ready = False
+            self.overflows += 1
+            self._needs_resync = True
+        return False
+
+    def add(self, jti: str, exp: float) -> None:
+        """Record a revocation (from this worker or a pub/sub message)."""
+        key = revocation_id(jti)
+        if key in self._revoked or self._has_room():
+            self._revoked[key] = exp
+
+    def set_generation(self, digest: str, generation: int, expires_at: float) -> None:
+        """Record a user's token generation; an older one never wins."""
+        current = self._generations.get(digest)
+        if current is not None:
+            if generation >= current[0]:
+                self._generations[digest] = (generation, expires_at)
+        elif self._has_room():
+            self._generations[digest] = (generation, expires_at)
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [key for key, exp in self._revoked.items() if exp <= now]
+        for key in expired:
+            del self._revoked[key]
+        stale = [d for d, (_, exp) in self._generations.items() if exp <= now]
+        for digest in stale:
+            del self._generations[digest]
+
+    def _on_reconnect(self, _connection: Any) -> None:
+        # redis-py resubscribes transparently; messages sent meanwhile are lost
+        self.ready = False
+        self._needs_resync = True
+
+    def _handle(self, message: Dict[str, Any]) -> None:
+        if message["data"].startswith(_MARKER_PREFIX):
+            return  # another worker's resync
+        self.messages += 1
+        try:
+            if message["data"].startswith(GENERATION_MESSAGE_PREFIX):
+                _, digest, generation, expires_at = message["data"].split(" ")
+                self.set_generation(digest, int(generation), float(expires_at))
+                return
+            jti, exp = message["data"].split(" ", 1)
+            self.add(jti, float(exp))
+        except (AttributeError, ValueError):
+            logger.warning("Ignoring malformed revocation %r", message["data"])
+
+    async def _seed(self, redis: Redis) -> bool:
+        """Load every live blacklist and generation entry; False if too many."""
+        revoked: Dict[bytes, float] = {}
+        generations: Dict[str, Tuple[int, float]] = {}
+        for prefix in (KEY_PREFIX, BUCKET_PREFIX, GENERATION_PREFIX):
+            cursor = 0
+            while True:
+                cursor, keys = await redis.scan(cursor, match=f"{prefix}*", count=1000)
+                if keys:
+                    pipe = redis.pipeline(transaction=False)
+                    for key in keys:
+                        pipe.pttl(key)
+                        if prefix == BUCKET_PREFIX:
+                            # Members are raw 16-byte IDs, not text
+                            pipe.execute_command(
+                                "SMEMBERS", key, **{NEVER_DECODE: True}
+                            )
+                        elif prefix == GENERATION_PREFIX:
+                            pipe.get(key)
+                    results = await pipe.execute()
+                    now = time.time()
+                    if prefix == KEY_PREFIX:
+                        for key, ttl_ms in zip(keys, results):
+                            if ttl_ms > 0:
+                                jti = key[len(prefix) :]
+                                revoked[revocation_id(jti)] = now + ttl_ms / 1000
+                    else:
+                        for key, ttl_ms, value in zip(
+                            keys, results[::2], results[1::2]
+                        ):
+                            if ttl_ms <= 0:
+                                continue
+                            expires_at = now + ttl_ms / 1000
+                            if prefix == BUCKET_PREFIX:
+                                revoked.update(dict.fromkeys(value, expires_at))
+                            else:
+                                name = key[len(prefix) :]
+                                generations[name] = (int(value), expires_at)
+                    if len(revoked) + len(generations) > self.max_entries:
+                        return False
+                if cursor == 0:
+                    break
+        self._revoked = revoked
+        self._generations = generations
+        return True
+
+    async def _sync(self, redis: Redis, pubsub: PubSub) -> None:
+        self.ready = False
+        self._needs_resync = False
+        await pubsub.subscribe(CHANNEL)
+        if pubsub.connection is not None:
+            pubsub.connection.register_connect_callback(self._on_reconnect)
+        self.resyncs += 1
+        if not await self._seed(redis):
+            self.overflows += 1
+            logger.warning("Too many revocations to hold locally; using Redis")
+            return
+        # Channel order is preserved: once our marker arrives, every
+        # revocation published during the scan has been applied.
+        marker = f"{_MARKER_PREFIX}{uuid.uuid4().hex}"
+        await redis.publish(CHANNEL, marker)
+        deadline = time.monotonic() + self.retry_delay + 5
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(timeout=1.0)
+            if message is None or message["type"] != "message":
+                continue
+            if message["data"] == marker:
+                self.ready = not self._needs_resync
+                return
+            self._handle(message)
+        raise TimeoutError("Revocation sync marker never arrived")
+
+    async def _run(self, redis: Redis) -> None:
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await self._sync(redis, pubsub)
+                next_prune = time.monotonic() + self.prune_interval
+                while not self._needs_resync:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._handle(message)
+                    if time.monotonic() >= next_prune:
+                        next_prune = time.monotonic() + self.prune_interval
+                        self._prune()
+                        if not self.ready:
+                            self._needs_resync = True  # retry after overflow
+            except Exception:
+                # Anything but cancellation: resync rather than end the task
+                self.ready = False
+                logger.warning("Revocation filter lost Redis; resyncing", exc_info=True)
+                await asyncio.sleep(self.retry_delay)
+            finally:
+                if pubsub.connection is not None:
+                    pubsub.connection.deregister_connect_callback(self._on_reconnect)
+                await pubsub.aclose()  # type: ignore[no-untyped-call]
+
+    def start(self, redis: Redis) -> None:
+        """Start syncing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self) -> None:
+        """Stop syncing; lookups fall back to Redis."""
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            # Bounded: shutdown must not hang on a stuck pub/sub read
+            await asyncio.wait({self._task}, timeout=self.retry_delay + 1)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and sync counters."""
+        return {
+            "ready": self.ready,
+            "entries": len(self._revoked),
+            "generations": len(self._generations),
+            "max_entries": self.max_entries,
+            "resyncs": self.resyncs,
+            "messages": self.messages,
+            "overflows": self.overflows,
+        }
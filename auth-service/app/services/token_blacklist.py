@@ -1,20 +1,83 @@
 # app/core/token_blacklist.py
-"""Redis-backed refresh token blacklist."""
+"""
+Redis-backed refresh token blacklist and per-user token generations.
 
+Lookups are answered by the worker's :data:`revocation_filter` while it is
+in sync with Redis, and by Redis otherwise.
+
+``TOKEN_BLACKLIST_STORAGE`` picks how revocations are written: one
+``bl:<jti>`` key per token (``keys``), or the token's 16-byte ID in a set
+per expiry hour, ``blb:<hour>``, that expires as a whole (``buckets``).
+Buckets cost far fewer keys and bytes per revocation; see
+``benchmarks/bench_blacklist_memory.py``. Lookups check both layouts in one
+round trip, so the setting can be changed on a live system.
+
+"Log out everywhere" bumps ``users.token_generation`` and copies it to
+``tg:<digest>`` in Redis. Every token carries the generation it was minted
+under (``gen`` claim) and is void once the user's generation is higher, so
+revoking all of a user's sessions is one write and checking it is one
+cached read. The Redis copy expires once every token minted under an older
+generation has expired; if Redis cannot be reached the generation is read
+from the database instead, at most once per user while the breaker is open.
+"""
+
+import logging
 import time
+from typing import Any, List, Optional, Sequence
 
-from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
 
+from app.core.circuit_breaker import DependencyUnavailableError, blacklist_breaker
 from app.core.config import settings
+from app.core.lru_cache import TTLCache
+from app.core.principal import Principal
+from app.core.rate_limit_policies import identity_digest
+from app.core.redis_cache import redis_manager
+from app.core.redis_scripts import LuaScript, execute_pipeline
+from app.db import crud
+from app.db.session import AsyncSessionLocal
+from app.services.revocation_filter import (
+    CHANNEL,
+    GENERATION_MESSAGE_PREFIX,
+    GENERATION_PREFIX,
+    KEY_PREFIX,
+    RevocationFilter,
+    bucket_expires_at,
+    bucket_key,
+    revocation_id,
+)
+
+logger = logging.getLogger(__name__)
 
-# Create a Redis client (async)
-redis = Redis(
-    host=settings.redis.host,
-    port=settings.redis.port,
-    password=settings.redis.password,
-    decode_responses=True,  # store as str instead of bytes
+revocation_filter = RevocationFilter(
+    max_entries=settings.revocation_filter.max_entries,
+    prune_interval=settings.revocation_filter.prune_interval,
+    retry_delay=settings.revocation_filter.retry_delay,
 )
 
+# Generations read from the database while Redis is unavailable, per digest
+database_generations: TTLCache[str, int] = TTLCache(
+    max_entries=settings.revocation_filter.max_entries
+)
+
+# Longest any token minted before a generation bump can stay valid
+GENERATION_TTL = (
+    settings.jwt.refresh_expire_days * 86400 + settings.jwt.access_expire_minutes * 60
+)
+
+# Keep the highest generation when bumps race
+SET_GENERATION = LuaScript("""
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tonumber(ARGV[1]) >= current then
+  redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+end
+return current
+""")
+
+
+def _generation_digest(email: str) -> str:
+    return identity_digest(email.lower())
+
 
 async def add_to_blacklist(jti: str, exp: int) -> None:
     """
@@ -24,11 +87,167 @@ async def add_to_blacklist(jti: str, exp: int) -> None:
     """
     ttl = exp - int(time.time())
     if ttl > 0:
-        await redis.setex(f"bl:{jti}", ttl, "revoked")
+        pipe = redis_manager.client.pipeline(transaction=False)
+        if settings.token_blacklist.storage == "buckets":
+            bucket = bucket_key(exp)
+            pipe.sadd(bucket, revocation_id(jti))
+            pipe.expireat(bucket, bucket_expires_at(exp))
+        else:
+            pipe.setex(f"{KEY_PREFIX}{jti}", ttl, "revoked")
+        pipe.publish(CHANNEL, f"{jti} {exp}")
+        await blacklist_breaker.call(pipe.execute)
+        revocation_filter.add(jti, exp)
+
+
+def _queue_lookup(pipe: Any, jti: str, exp: Optional[int]) -> None:
+    # Two replies per lookup: the per-key entry, then the bucket membership.
+    # Without exp the bucket is unknown; blb:0 (1970) never exists.
+    pipe.exists(f"{KEY_PREFIX}{jti}")
+    pipe.sismember(bucket_key(exp or 0), revocation_id(jti))
 
 
-async def is_blacklisted(jti: str) -> bool:
+async def is_blacklisted(jti: str, exp: Optional[int] = None) -> bool:
     """
     Check if a token JTI is blacklisted.
+    - exp: the token's expiry, needed to find its bucket in ``buckets`` storage
+    """
+    if revocation_filter.ready:
+        return revocation_filter.contains(jti)
+
+    async def lookup() -> bool:
+        pipe = redis_manager.client.pipeline(transaction=False)
+        _queue_lookup(pipe, jti, exp)
+        listed, in_bucket = await pipe.execute()
+        return bool(listed or in_bucket)
+
+    return await blacklist_breaker.guard(lookup, False)
+
+
+async def publish_generation(email: str, generation: int) -> None:
     """
-    return await redis.exists(f"bl:{jti}") == 1
+    Make a user's new token generation visible to every worker.
+    - email: user email
+    - generation: value just stored in ``users.token_generation``
+    """
+    digest = _generation_digest(email)
+    expires_at = time.time() + GENERATION_TTL
+    database_generations.pop(digest)  # this worker sees the bump at once
+
+    # Safe to send twice on NOSCRIPT: the highest generation wins everywhere
+    def build(pipe: Pipeline) -> None:
+        SET_GENERATION.queue(
+            pipe, [f"{GENERATION_PREFIX}{digest}"], [generation, GENERATION_TTL]
+        )
+        pipe.publish(
+            CHANNEL,
+            f"{GENERATION_MESSAGE_PREFIX}{digest} {generation} {expires_at:.0f}",
+        )
+
+    await blacklist_breaker.call(
+        lambda: execute_pipeline(redis_manager.client, build, [SET_GENERATION])
+    )
+    revocation_filter.set_generation(digest, generation, expires_at)
+
+
+async def _database_generation(email: str, retry_after: float) -> int:
+    # Read once per user until the breaker lets Redis calls through again,
+    # instead of opening a primary session on every request
+    digest = _generation_digest(email)
+    generation = database_generations.get(digest)
+    if generation is None:
+        logger.warning("Token generation unavailable from Redis; using database")
+        async with AsyncSessionLocal() as db:
+            generation = await crud.get_token_generation(db, email)
+        database_generations.set(digest, generation, time.time() + retry_after)
+    return generation
+
+
+async def session_generation(email: str) -> int:
+    """
+    Current token generation of a user: from the local filter, else Redis,
+    else (Redis unreachable) the database.
+    """
+    digest = _generation_digest(email)
+    if revocation_filter.ready:
+        return revocation_filter.generation(digest)
+    try:
+        value = await blacklist_breaker.call(
+            lambda: redis_manager.client.get(f"{GENERATION_PREFIX}{digest}")
+        )
+        return int(value or 0)
+    except DependencyUnavailableError as exc:
+        return await _database_generation(email, exc.retry_after)
+
+
+async def is_revoked(principal: Principal) -> bool:
+    """
+    Whether a verified token was revoked, by JTI or by a later
+    "log out everywhere" for its user.
+
+    Off the local filter, the blacklist and generation lookups share one
+    pipelined round trip.
+    """
+    jti, email = principal.jti, principal.email
+    if revocation_filter.ready:
+        return (jti is not None and revocation_filter.contains(jti)) or (
+            email is not None
+            and principal.gen < revocation_filter.generation(_generation_digest(email))
+        )
+    if jti is None and email is None:
+        return False
+
+    async def lookup() -> List[Any]:
+        pipe = redis_manager.client.pipeline(transaction=False)
+        _queue_lookup(pipe, jti or "", principal.exp)
+        pipe.get(f"{GENERATION_PREFIX}{_generation_digest(email or '')}")
+        return await pipe.execute()
+
+    try:
+        listed, in_bucket, generation = await blacklist_breaker.call(lookup)
+    except DependencyUnavailableError as exc:
+        if jti is not None and not blacklist_breaker.fail_open:
+            raise
+        # Blacklist failed open; "log out everywhere" is still honoured
+        listed = in_bucket = False
+        generation = (
+            await _database_generation(email, exc.retry_after)
+            if email is not None
+            else 0
+        )
+    if jti is not None and (listed or in_bucket):
+        return True
+    return email is not None and principal.gen < int(generation or 0)
+
+
+async def are_revoked(principals: Sequence[Principal]) -> List[bool]:
+    """
+    :func:`is_revoked` for many tokens in one pipelined round trip.
+    Returns one flag per principal, in order.
+    """
+    if not principals:
+        return []
+    if revocation_filter.ready:
+        return [
+            (p.jti is not None and revocation_filter.contains(p.jti))
+            or (
+                p.email is not None
+                and p.gen < revocation_filter.generation(_generation_digest(p.email))
+            )
+            for p in principals
+        ]
+
+    async def lookup() -> List[Any]:
+        pipe = redis_manager.client.pipeline(transaction=False)
+        for p in principals:
+            _queue_lookup(pipe, p.jti or "", p.exp)
+            pipe.get(f"{GENERATION_PREFIX}{_generation_digest(p.email or '')}")
+        return await pipe.execute()
+
+    results = await blacklist_breaker.guard(lookup, [0] * (3 * len(principals)))
+    return [
+        (p.jti is not None and bool(listed or in_bucket))
+        or (p.email is not None and p.gen < int(generation or 0))
+        for p, listed, in_bucket, generation in zip(
+            principals, results[::3], results[1::3], results[2::3]
+        )
+    ]
@@ -0,0 +1,343 @@
+# app/services/user_cache.py
+"""
+Two-level cache of user records (cache-aside).
+
+Lookups by email try, in order:
+
+1. a per-worker LRU (``USER_CACHE_LOCAL_MAX_ENTRIES`` entries, each kept
+   ``USER_CACHE_LOCAL_TTL`` seconds);
+2. Redis: ``uc:<digest>`` holds a compact JSON record for
+   ``USER_CACHE_TTL`` seconds;
+3. the database (through the replica-aware read path), filling both tiers.
+   Concurrent misses are batched into one query by
+   :mod:`app.db.batch_loader`.
+
+The password hash is kept in the local tier only. It is written to Redis
+only with ``USER_CACHE_SHARE_PASSWORD_HASH=true``; otherwise a login that
+misses locally reads the user from the database.
+
+:func:`UserCache.invalidate` must be called after every write to a user
+(create, update, deactivate). It replaces the Redis record with a
+tombstone and publishes the digest on :data:`CHANNEL`; every worker drops
+its local copy. For :func:`stale_read_window` seconds after an invalidation
+a database read may still return the old record (a lagging replica, or a
+read that started before the write), so meanwhile no worker caches the
+user: the Redis fill is ``SET NX`` and cannot replace the tombstone, and
+each worker holds off its local fill. The local tier is only used while
+this worker is subscribed, and is cleared on every (re)subscribe, since
+invalidations sent meanwhile are lost.
+
+Redis calls go through the ``user_cache`` circuit breaker, which fails open:
+with Redis down, lookups go to the database.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.circuit_breaker import user_cache_breaker
+from app.core.config import UserCacheSettings, settings
+from app.core.lru_cache import TTLCache
+from app.core.rate_limit_policies import identity_digest
+from app.core.redis_cache import redis_manager
+from app.db.batch_loader import user_by_email_loader
+from app.db.models import UserRole
+from app.db.replicas import read_user_by_email, replica_router
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "uc:"
+CHANNEL = "uc:invalidate"
+RETRY_DELAY = 1.0
+# Redis value of an invalidated record
+TOMBSTONE = "-"
+# Seconds added to the stale read window for reads in flight on the primary
+STALE_READ_MARGIN = 1.0
+
+
+class CachedUser(NamedTuple):
+    """
+    User record as cached: the :data:`crud.AUTH_COLUMNS` of a user, with the
+    same attribute names as :class:`models.User`.
+
+    ``hashed_password`` is None when the record came from Redis without it.
+    """
+
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+    token_generation: int
+    hashed_password: Optional[str]
+    cached_at: float
+
+    @classmethod
+    def from_row(cls, user: Row[Any]) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            token_generation=user.token_generation,
+            hashed_password=user.hashed_password,
+            cached_at=time.time(),
+        )
+
+    def dumps(self, with_password: bool) -> str:
+        """Compact JSON array, optionally without the password hash."""
+        return json.dumps(
+            [
+                self.id,
+                self.email,
+                self.role.value,
+                self.is_active,
+                self.token_generation,
+                self.hashed_password if with_password else None,
+                round(self.cached_at, 3),
+            ],
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def loads(cls, raw: str) -> "CachedUser":
+        user_id, email, role, is_active, generation, hashed, cached_at = json.loads(raw)
+        return cls(
+            user_id, email, UserRole(role), is_active, generation, hashed, cached_at
+        )
+
+
+def user_digest(email: str) -> str:
+    """Cache key of a user; emails never reach Redis or the channel."""
+    return identity_digest(email)
+
+
+def stale_read_window() -> float:
+    """
+    Seconds after a write during which a read may return the old record.
+
+    A replica in rotation lagged at most ``DB_REPLICA_MAX_LAG`` at its last
+    probe, and the next probe is up to ``DB_REPLICA_CHECK_INTERVAL`` away.
+    """
+    window = STALE_READ_MARGIN
+    if replica_router.replicas:
+        window += replica_router.max_lag + replica_router.check_interval
+    return window
+
+
+class UserCache:
+    """
+    Per-worker LRU in front of the shared Redis tier.
+
+    Parameters
+    ----------
+    config : UserCacheSettings
+        Sizes, TTLs and the password hash policy.
+    """
+
+    def __init__(self, config: UserCacheSettings) -> None:
+        self.config = config
+        self.local: TTLCache[str, CachedUser] = TTLCache(config.local_max_entries)
+        # Digests invalidated within the stale read window; not filled locally
+        self._held: TTLCache[str, bool] = TTLCache(config.local_max_entries)
+        # Bumped by every invalidation this worker sees; a database read that
+        # straddles one does not fill the cache
+        self._epoch = 0
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.subscribed = False
+
+        # Metrics
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+        self.resyncs = 0
+        self._hit_age_total = 0.0
+        self._hit_age_max = 0.0
+
+    # -- lookups -------------------------------------------------------------
+
+    async def get_by_email(
+        self, db: AsyncSession, email: str, with_password: bool = False
+    ) -> Optional[CachedUser]:
+        """
+        User with ``email``, or None.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            Session for a miss; a read session routes it to a replica.
+        email : str
+            Exact email, as stored.
+        with_password : bool
+            Whether the caller needs ``hashed_password`` (login).
+        """
+        if not self.config.enabled:
+            return self._uncached(await self._read_by_email(db, email))
+        digest = user_digest(email)
+        user = await self._cached(digest, with_password)
+        if user is not None:
+            return user
+        epoch = self._epoch
+        return await self._fill(await self._read_by_email(db, email), epoch)
+
+    async def _cached(self, digest: str, with_password: bool) -> Optional[CachedUser]:
+        if self.subscribed:
+            user = self.local.get(digest)
+            if user is not None and (not with_password or user.hashed_password):
+                self.local_hits += 1
+                return self._served(user)
+        if with_password and not self.config.share_password_hash:
+            return None  # shared records carry no hash
+        raw = await user_cache_breaker.guard(
+            lambda: redis_manager.client.get(f"{KEY_PREFIX}{digest}"), None
+        )
+        if raw is None or raw == TOMBSTONE:
+            return None
+        user = CachedUser.loads(raw)
+        if with_password and not user.hashed_password:
+            return None
+        self.shared_hits += 1
+        self._set_local(digest, user)
+        return self._served(user)
+
+    async def _read_by_email(self, db: AsyncSession, email: str) -> Optional[Row[Any]]:
+        # Inside its read-your-writes window a user is read on the primary
+        if settings.user_loader.enabled and not replica_router.recently_written(email):
+            return await user_by_email_loader.load(email)
+        return await read_user_by_email(db, email)
+
+    def _uncached(self, row: Optional[Row[Any]]) -> Optional[CachedUser]:
+        self.misses += 1
+        return CachedUser.from_row(row) if row is not None else None
+
+    async def _fill(self, row: Optional[Row[Any]], epoch: int) -> Optional[CachedUser]:
+        user = self._uncached(row)
+        if user is None or epoch != self._epoch:
+            return user
+        digest = user_digest(user.email)
+        if self._held.get(digest):
+            return user
+        self._set_local(digest, user)
+        # NX: a tombstone (recent invalidation) or a fresher fill wins
+        await user_cache_breaker.guard(
+            lambda: redis_manager.client.set(
+                f"{KEY_PREFIX}{digest}",
+                user.dumps(with_password=self.config.share_password_hash),
+                ex=self.config.ttl,
+                nx=True,
+            ),
+            None,
+        )
+        return user
+
+    def _set_local(self, digest: str, user: CachedUser) -> None:
+        if not self.subscribed:
+            return
+        self.local.set(digest, user, time.time() + self.config.local_ttl)
+
+    def _served(self, user: CachedUser) -> CachedUser:
+        age = max(time.time() - user.cached_at, 0.0)
+        self._hit_age_total += age
+        self._hit_age_max = max(self._hit_age_max, age)
+        return user
+
+    # -- invalidation --------------------------------------------------------
+
+    def _drop(self, digest: str) -> None:
+        self.local.pop(digest)
+        self._held.set(digest, True, time.time() + stale_read_window())
+        self._epoch += 1
+
+    async def invalidate(self, email: str) -> None:
+        """Forget ``email``'s record in every tier and on every worker."""
+        if not self.config.enabled:
+            return
+        digest = user_digest(email)
+        self._drop(digest)
+        pipe = redis_manager.client.pipeline(transaction=False)
+        pipe.set(
+            f"{KEY_PREFIX}{digest}",
+            TOMBSTONE,
+            px=math.ceil(stale_read_window() * 1000),
+        )
+        pipe.publish(CHANNEL, digest)
+        if await user_cache_breaker.guard(pipe.execute, None) is None:
+            logger.warning("User cache invalidation not delivered; Redis unavailable")
+        self.invalidations_sent += 1
+
+    def _on_reconnect(self, _connection: Any) -> None:
+        # redis-py resubscribes transparently; invalidations sent meanwhile
+        # are lost
+        self.local.clear()
+        self._epoch += 1
+
+    async def _run(self, redis: Redis) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                if pubsub.connection is not None:
+                    pubsub.connection.register_connect_callback(self._on_reconnect)
+                self._on_reconnect(None)
+                self.subscribed = True
+                self.resyncs += 1
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self.invalidations_received += 1
+                        self._drop(message["data"])
+            except Exception:
+                # Anything but cancellation: resubscribe rather than end the task
+                self.subscribed = False
+                logger.warning("User cache lost Redis; resubscribing", exc_info=True)
+                await asyncio.sleep(RETRY_DELAY)
+            finally:
+                if pubsub.connection is not None:
+                    pubsub.connection.deregister_connect_callback(self._on_reconnect)
+                await pubsub.aclose()  # type: ignore[no-untyped-call]
+
+    def start(self, redis: Redis) -> None:
+        """Subscribe to invalidations in the background."""
+        if self.config.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self) -> None:
+        """Unsubscribe; lookups skip the local tier from now on."""
+        self.subscribed = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait({self._task}, timeout=RETRY_DELAY + 1)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratios per tier, age of served records and invalidations."""
+        hits = self.local_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.config.enabled,
+            "subscribed": self.subscribed,
+            "local_entries": len(self.local),
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "local_hit_ratio": round(self.local_hits / lookups, 4) if lookups else 0.0,
+            "hit_age_avg_seconds": (
+                round(self._hit_age_total / hits, 3) if hits else 0.0
+            ),
+            "hit_age_max_seconds": round(self._hit_age_max, 3),
+            "invalidations_sent": self.invalidations_sent,
+            "invalidations_received": self.invalidations_received,
+            "resyncs": self.resyncs,
+        }
+
+
+user_cache = UserCache(settings.user_cache)
@@ -0,0 +1,53 @@
+# app/services/user_service.py
+"""User management business logic."""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import crud
+from app.db.replicas import replica_router
+from app.db.session import AsyncSessionLocal
+from app.services.token_blacklist import publish_generation
+from app.services.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def store_upgraded_password_hash(
+    user_id: int, email: str, old_hash: str, new_hash: str
+) -> None:
+    """
+    Persist a password re-hashed under the current hashing policy.
+
+    Runs as a background task after the login response is sent, on its own
+    session since the request session is closed by then. Failures are only
+    logged: the old hash stays valid and is upgraded on a later login.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            if await crud.update_password_hash(db, user_id, old_hash, new_hash):
+                await user_cache.invalidate(email)
+    except Exception:
+        logger.exception("Failed to store upgraded password hash for user %s", user_id)
+
+
+async def revoke_all_sessions(db: AsyncSession, email: str) -> int | None:
+    """
+    Void every access and refresh token issued to ``email`` so far.
+
+    Bumps the user's token generation in the database, then publishes it to
+    Redis and every worker. Call after a password change as well as on
+    "log out everywhere".
+
+    Returns
+    -------
+    int | None
+        The new generation, or None if there is no such user.
+    """
+    generation = await crud.bump_token_generation(db, email)
+    replica_router.mark_written(email)
+    await user_cache.invalidate(email)
+    if generation is not None:
+        await publish_generation(email, generation)
+    return generation
@@ -0,0 +1,70 @@
+# app/tests/integration/test_auth_middleware.py
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+
+from app.core.security import create_access_token, create_refresh_token
+from app.main import app
+from app.services.token_blacklist import revocation_filter
+
+
+@pytest.mark.asyncio
+async def test_valid_token_reaches_protected_route(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The principal verified by the middleware is what RBAC sees."""
+    monkeypatch.setattr(revocation_filter, "ready", True)  # as after a sync
+    token = create_access_token(email="mw@example.com", role="user")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/users/profile", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["data"]["email"] == "mw@example.com"
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_gets_clean_401() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/users/profile", headers={"Authorization": "Bearer not-a-jwt"}
+        )
+        assert resp.status_code == 401
+        assert resp.headers["www-authenticate"] == "Bearer"
+        assert resp.json() == {
+            "status": "error",
+            "message": "Invalid or expired token",
+        }
+
+        resp = await client.get("/api/v1/users/profile")
+        assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_public_path_skips_token_check() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/health/server", headers={"Authorization": "Bearer not-a-jwt"}
+        )
+        assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(revocation_filter, "ready", True)
+    token, _ = create_refresh_token(email="mw@example.com", role="user")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/users/profile", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp.status_code == 401
+
+        resp = await client.post("/api/v1/auth/introspect", json={"tokens": [token]})
+        assert resp.status_code == 200
+        assert resp.json()["data"]["results"][0]["typ"] == "refresh"
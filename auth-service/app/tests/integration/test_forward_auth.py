@@ -0,0 +1,53 @@
+# app/tests/integration/test_forward_auth.py
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+
+from app.core.security import create_access_token, create_refresh_token
+from app.main import app
+from app.services.token_blacklist import revocation_filter
+
+
+@pytest.mark.asyncio
+async def test_verify_returns_identity_headers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(revocation_filter, "ready", True)  # as after a sync
+    token = create_access_token(email="fa@example.com", role="admin")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(2):  # second call is served from the micro-cache
+            resp = await client.get(
+                "/api/v1/auth/verify", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert resp.status_code == 200
+            assert resp.headers["x-user-email"] == "fa@example.com"
+            assert resp.headers["x-user-role"] == "admin"
+            assert resp.content == b""
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_missing_or_invalid_token() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/auth/verify", headers={"Authorization": "Bearer not-a-jwt"}
+        )
+        assert resp.status_code == 401
+        assert "x-user-email" not in resp.headers
+
+        resp = await client.get("/api/v1/auth/verify")
+        assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_refresh_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(revocation_filter, "ready", True)
+    token, _ = create_refresh_token(email="fa@example.com", role="admin")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/v1/auth/verify", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp.status_code == 401
+        assert "x-user-email" not in resp.headers
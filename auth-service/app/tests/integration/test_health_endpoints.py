@@ -4,8 +4,9 @@ from unittest.mock import AsyncMock
 import pytest
 from httpx import AsyncClient
 from httpx._transports.asgi import ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import AsyncSession, get_db  # <- import get_db here
+from app.db.session import get_db  # <- import get_db here
 from app.main import app
 
 
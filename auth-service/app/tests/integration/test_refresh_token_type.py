@@ -0,0 +1,24 @@
+# app/tests/integration/test_refresh_token_type.py
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+
+from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.main import app
+
+
+def test_tokens_carry_their_type() -> None:
+    access = create_access_token(email="typ@example.com", role="user")
+    refresh, _ = create_refresh_token(email="typ@example.com", role="user")
+    assert decode_token(access)["typ"] == "access"
+    assert decode_token(refresh)["typ"] == "refresh"
+
+
+@pytest.mark.asyncio
+async def test_access_token_cannot_be_refreshed() -> None:
+    token = create_access_token(email="typ@example.com", role="user")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+        assert resp.status_code == 401
+        assert resp.json()["message"] == "Not a refresh token"
@@ -0,0 +1,49 @@
+# app/tests/unit/test_auth_queries.py
+import asyncio
+from typing import Any, List
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.db import crud
+
+DIALECT = postgresql.dialect()  # type: ignore[no-untyped-call]
+
+
+class CapturingSession:
+    """Stands in for AsyncSession; records the statements it is given."""
+
+    def __init__(self) -> None:
+        self.statements: List[Any] = []
+
+    async def execute(self, statement: Any, *args: Any) -> "CapturingSession":
+        self.statements.append(statement)
+        return self
+
+    def one_or_none(self) -> None:
+        return None
+
+
+def auth_query(email: str) -> StatementLambdaElement:
+    """Statement ``crud.get_auth_user_by_email`` sends for ``email``."""
+    db: Any = CapturingSession()
+    assert asyncio.run(crud.get_auth_user_by_email(db, email)) is None
+    (statement,) = db.statements
+    assert isinstance(statement, StatementLambdaElement)
+    return statement
+
+
+def test_auth_query_selects_only_hot_path_columns() -> None:
+    sql = str(auth_query("a@example.com").compile(dialect=DIALECT))
+    selected = sql.split("FROM")[0]
+    for column in ("id", "email", "hashed_password", "role", "is_active"):
+        assert f"users.{column}" in selected
+    assert "created_at" not in selected and "updated_at" not in selected
+
+
+def test_auth_query_is_cached_across_emails() -> None:
+    first = auth_query("a@example.com")._generate_cache_key()
+    second = auth_query("b@example.com")._generate_cache_key()
+    assert first is not None and second is not None
+    assert first.key == second.key
+    assert [p.effective_value for p in second.bindparams] == ["b@example.com"]
@@ -0,0 +1,79 @@
+# app/tests/unit/test_batch_loader.py
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from app.db.batch_loader import BatchLoader
+
+
+class FakeFetch:
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+        self.fail = False
+
+    async def __call__(self, keys: List[str]) -> Dict[str, str]:
+        self.batches.append(keys)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("db down")
+        return {key: key.upper() for key in keys if key != "missing"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_fetch() -> None:
+    fetch = FakeFetch()
+    loader = BatchLoader("test", fetch, max_batch_size=10, window=0.001)
+
+    results = await asyncio.gather(
+        *(loader.load(key) for key in ["a", "b", "a", "missing", "c"])
+    )
+
+    assert results == ["A", "B", "A", None, "C"]
+    assert fetch.batches == [["a", "b", "missing", "c"]]
+    stats = loader.stats()
+    assert stats["coalesced"] == 1
+    assert stats["batches"] == 1
+    assert stats["fill_rate"] == 0.4
+
+
+@pytest.mark.asyncio
+async def test_full_batch_dispatches_without_waiting() -> None:
+    fetch = FakeFetch()
+    loader = BatchLoader("test", fetch, max_batch_size=2, window=60)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(loader.load("a"), loader.load("b")), timeout=1
+    )
+
+    assert list(results) == ["A", "B"]
+    assert loader.full_batches == 1
+
+
+@pytest.mark.asyncio
+async def test_load_joins_inflight_batch() -> None:
+    fetch = FakeFetch()
+    loader = BatchLoader("test", fetch, max_batch_size=1, window=0.001)
+
+    first = asyncio.create_task(loader.load("a"))
+    await asyncio.sleep(0)  # batch of "a" is now running
+    assert await loader.load("a") == "A"
+    assert await first == "A"
+    assert len(fetch.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_and_cancellation() -> None:
+    fetch = FakeFetch()
+    loader = BatchLoader("test", fetch, max_batch_size=10, window=0.001)
+
+    cancelled = asyncio.create_task(loader.load("a"))
+    survivor = asyncio.create_task(loader.load("a"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert await survivor == "A"  # one caller's cancellation spares the batch
+
+    fetch.fail = True
+    with pytest.raises(RuntimeError):
+        await loader.load("b")
+    assert loader.failures == 1
@@ -0,0 +1,129 @@
+# app/tests/unit/test_circuit_breaker.py
+import asyncio
+from typing import List
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DependencyUnavailableError,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, fail_open: bool = False) -> CircuitBreaker:
+    return CircuitBreaker(
+        "test",
+        fail_open=fail_open,
+        failure_threshold=2,
+        reset_timeout=5,
+        call_timeout=0.05,
+        clock=clock,
+    )
+
+
+def state_of(breaker: CircuitBreaker) -> str:
+    # A call, so mypy does not narrow the property across assertions
+    return breaker.state
+
+
+async def fail() -> str:
+    raise RedisConnectionError("down")
+
+
+async def ok() -> str:
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_opens_after_threshold_and_rejects_without_calling() -> None:
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        with pytest.raises(DependencyUnavailableError):
+            await breaker.call(fail)
+    assert state_of(breaker) == "open"
+
+    calls: List[int] = []
+
+    async def tracked() -> str:
+        calls.append(1)
+        return "ok"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await breaker.call(tracked)
+    assert calls == []
+    assert exc_info.value.retry_after == 5
+    assert breaker.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens() -> None:
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        with pytest.raises(DependencyUnavailableError):
+            await breaker.call(fail)
+
+    clock.now = 5
+    assert state_of(breaker) == "half_open"
+    with pytest.raises(DependencyUnavailableError):
+        await breaker.call(fail)  # failed probe
+    assert state_of(breaker) == "open"
+    assert breaker.opens == 2
+
+    clock.now = 10
+    assert await breaker.call(ok) == "ok"  # successful probe
+    assert state_of(breaker) == "closed"
+
+
+@pytest.mark.asyncio
+async def test_only_one_probe_while_half_open() -> None:
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(2):
+        with pytest.raises(DependencyUnavailableError):
+            await breaker.call(fail)
+    clock.now = 5
+
+    release = asyncio.Event()
+
+    async def slow() -> str:
+        await release.wait()
+        return "ok"
+
+    breaker.call_timeout = 1
+    probe = asyncio.create_task(breaker.call(slow))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+    release.set()
+    assert await probe == "ok"
+    assert state_of(breaker) == "closed"
+
+
+@pytest.mark.asyncio
+async def test_deadline_and_policies() -> None:
+    clock = FakeClock()
+
+    async def hang() -> None:
+        await asyncio.sleep(1)
+
+    closed = make_breaker(clock)
+    with pytest.raises(DependencyUnavailableError):
+        await closed.guard(hang, None)
+    assert closed.timeouts == 1
+
+    open_ = make_breaker(clock, fail_open=True)
+    assert await open_.guard(fail, "fallback") == "fallback"
+    assert await open_.guard(ok, "fallback") == "ok"
+    assert open_.failed_open == 1
@@ -1,5 +1,18 @@
 # app/tests/unit/test_hashing.py
-from app.core.hashing import hash_password, verify_password
+import asyncio
+import time
+
+import pytest
+
+from app.core.hashing import (
+    HashingOverloadedError,
+    HashingPool,
+    build_crypt_context,
+    hash_password,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
 
 
 def test_hash_and_verify_password() -> None:
@@ -8,3 +21,61 @@ def test_hash_and_verify_password() -> None:
     assert hashed != password
     assert verify_password(password, hashed)
     assert not verify_password("wrongpass", hashed)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async() -> None:
+    password = "supersecret"
+    hashed = await hash_password_async(password)
+    assert await verify_password_async(password, hashed)
+    assert not await verify_password_async("wrongpass", hashed)
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_sheds_load_when_queue_full() -> None:
+    pool = HashingPool(executor="thread", workers=1, queue_size=1, queue_timeout=0.05)
+    running = asyncio.ensure_future(pool.run(time.sleep, 0.3))
+    await asyncio.sleep(0)
+    waiting = asyncio.ensure_future(pool.run(time.sleep, 0))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HashingOverloadedError) as rejected:
+        await pool.run(time.sleep, 0)
+    assert rejected.value.retry_after >= 1
+
+    with pytest.raises(HashingOverloadedError):
+        await waiting
+    await running
+
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    pool.shutdown()
+
+
+def test_outdated_hash_is_upgraded_on_verify() -> None:
+    legacy = build_crypt_context(
+        scheme="bcrypt",
+        bcrypt_rounds=4,
+        argon2_memory_cost=1024,
+        argon2_time_cost=1,
+        argon2_parallelism=1,
+    )
+    current = build_crypt_context(
+        scheme="argon2",
+        bcrypt_rounds=4,
+        argon2_memory_cost=1024,
+        argon2_time_cost=1,
+        argon2_parallelism=1,
+    )
+    old_hash = legacy.hash("supersecret")
+
+    valid, new_hash = current.verify_and_update("supersecret", old_hash)
+    assert valid
+    assert new_hash is not None and new_hash.startswith("$argon2id$")
+    assert not current.needs_update(new_hash)
+
+    valid, new_hash = current.verify_and_update("wrongpass", old_hash)
+    assert not valid and new_hash is None
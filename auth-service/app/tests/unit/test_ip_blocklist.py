@@ -0,0 +1,56 @@
+# app/tests/unit/test_ip_blocklist.py
+import os
+from pathlib import Path
+
+from app.core.ip_blocklist import IPBlocklist, compile_blocklist, parse_ranges
+
+SOURCE = """
+# comment
+10.0.0.0/8
+10.1.0.0/16          # inside the /8, merged away
+192.0.2.10-192.0.2.20
+198.51.100.7
+2001:db8::/32
+"""
+
+
+def test_parse_merges_overlapping_ranges() -> None:
+    v4, v6 = parse_ranges(SOURCE.splitlines())
+    assert len(v4) == 3
+    assert len(v6) == 1
+
+
+def test_lookup_ipv4_ipv6_and_mapped(tmp_path: Path) -> None:
+    path = str(tmp_path / "blocklist.bin")
+    compile_blocklist(SOURCE.splitlines(), path)
+    blocklist = IPBlocklist(path, reload_interval=0)
+
+    assert blocklist.contains("10.255.255.255")
+    assert blocklist.contains("192.0.2.10")
+    assert blocklist.contains("192.0.2.20")
+    assert not blocklist.contains("192.0.2.21")
+    assert blocklist.contains("198.51.100.7")
+    assert not blocklist.contains("198.51.100.8")
+    assert not blocklist.contains("9.255.255.255")
+    assert blocklist.contains("2001:db8::1")
+    assert not blocklist.contains("2001:db9::1")
+    assert blocklist.contains("::ffff:10.0.0.1")
+    assert not blocklist.contains("not-an-ip")
+
+
+def test_hot_reload_on_file_change(tmp_path: Path) -> None:
+    path = str(tmp_path / "blocklist.bin")
+    compile_blocklist(["203.0.113.0/24"], path)
+    blocklist = IPBlocklist(path, reload_interval=0)
+    assert blocklist.contains("203.0.113.5")
+
+    compile_blocklist(["198.51.100.0/24"], path)
+    os.utime(path, ns=(0, 10**18))  # make sure the mtime differs
+    assert not blocklist.contains("203.0.113.5")
+    assert blocklist.contains("198.51.100.5")
+    assert blocklist.reloads == 2
+
+
+def test_missing_file_blocks_nothing(tmp_path: Path) -> None:
+    blocklist = IPBlocklist(str(tmp_path / "absent.bin"), reload_interval=0)
+    assert not blocklist.contains("10.0.0.1")
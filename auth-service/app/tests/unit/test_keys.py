@@ -0,0 +1,49 @@
+# app/tests/unit/test_keys.py
+from pathlib import Path
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+
+from app.core.keys import KeyRing, generate_private_key
+
+
+def write_private_key(keys_dir: Path, kid: str, algorithm: str) -> None:
+    key = generate_private_key(algorithm)
+    (keys_dir / f"{kid}.pem").write_bytes(
+        key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+
+
+def test_rotation_keeps_old_tokens_valid(tmp_path: Path) -> None:
+    write_private_key(tmp_path, "2025-01", "EdDSA")
+    old_ring = KeyRing.load("EdDSA", None, str(tmp_path), "2025-01")
+    old_token = old_ring.encode({"email": "a@example.com"})
+
+    write_private_key(tmp_path, "2025-02", "EdDSA")
+    new_ring = KeyRing.load("EdDSA", None, str(tmp_path), "2025-02")
+    new_token = new_ring.encode({"email": "b@example.com"})
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "2025-02"
+    assert new_ring.decode(old_token)["email"] == "a@example.com"
+    assert new_ring.decode(new_token)["email"] == "b@example.com"
+    assert {k["kid"] for k in new_ring.jwks()["keys"]} == {"2025-01", "2025-02"}
+
+
+def test_hs256_migration_and_unknown_kid(tmp_path: Path) -> None:
+    legacy = KeyRing.load("HS256", "legacy-secret", None, None)
+    legacy_token = legacy.encode({"email": "a@example.com"})
+    assert legacy.jwks() == {"keys": []}
+
+    write_private_key(tmp_path, "k1", "ES256")
+    ring = KeyRing.load("ES256", "legacy-secret", str(tmp_path), "k1")
+    assert ring.decode(legacy_token)["email"] == "a@example.com"
+    assert [k["kid"] for k in ring.jwks()["keys"]] == ["k1"]
+
+    forged = jwt.encode({"email": "x"}, "legacy-secret", headers={"kid": "nope"})
+    with pytest.raises(jwt.PyJWTError):
+        ring.decode(forged)
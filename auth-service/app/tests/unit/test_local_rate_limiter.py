@@ -0,0 +1,92 @@
+# app/tests/unit/test_local_rate_limiter.py
+from typing import Any, Dict, List
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core.local_rate_limiter import LocalRateTier
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.ops: List[Any] = []
+
+    def incrby(self, key: str, amount: int) -> None:
+        self.ops.append((key, amount))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.ops.append(None)
+
+    async def execute(self) -> List[Any]:
+        self.redis.round_trips += 1
+        if self.redis.down:
+            raise ConnectionError("down")
+        results: List[Any] = []
+        for op in self.ops:
+            if op is None:
+                results.append(True)
+            else:
+                key, amount = op
+                self.redis.data[key] = self.redis.data.get(key, 0) + amount
+                results.append(self.redis.data[key])
+        return results
+
+
+class FakeRedis:
+    """Just enough of a pipelined INCRBY for the local tier."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, int] = {}
+        self.round_trips = 0
+        self.down = False
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+
+def make_tier(allowance: int) -> LocalRateTier:
+    return LocalRateTier(
+        allowance=allowance, sync_interval=1, max_keys=100, clock=lambda: 1000.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_over_limit_key_rejected_without_redis() -> None:
+    redis: Any = FakeRedis()
+    tier = make_tier(allowance=2)
+    decisions = [await tier.hit(redis, "k", limit=5, window=60) for _ in range(50)]
+
+    assert [d.allowed for d in decisions].count(True) == 5
+    assert redis.round_trips == 1  # only when the first allowance ran out
+    assert decisions[-1].retry_after == 20.0
+
+    await tier.flush(redis)
+    assert redis.data == {"k:16": 5}  # rejected hits are never sent
+
+
+@pytest.mark.asyncio
+async def test_overshoot_bounded_by_workers_times_allowance() -> None:
+    redis: Any = FakeRedis()
+    workers = [make_tier(allowance=3) for _ in range(4)]
+    allowed = 0
+    for _ in range(20):
+        for tier in workers:
+            allowed += (await tier.hit(redis, "k", limit=10, window=60)).allowed
+    assert 10 <= allowed <= 10 + 4 * 3
+
+
+@pytest.mark.asyncio
+async def test_local_only_when_redis_down() -> None:
+    redis: Any = FakeRedis()
+    redis.down = True
+    tier = make_tier(allowance=1)
+    decisions = [await tier.hit(redis, "k", limit=5, window=60) for _ in range(10)]
+
+    assert [d.allowed for d in decisions].count(True) == 5
+    assert tier.degraded
+
+    redis.down = False
+    await tier.flush(redis)
+    assert not tier.degraded
+    assert redis.data == {"k:16": 5}
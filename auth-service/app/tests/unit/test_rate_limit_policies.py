@@ -0,0 +1,23 @@
+# app/tests/unit/test_rate_limit_policies.py
+from app.core.rate_limit_policies import RateLimitPolicy, policy_key
+
+PER_EMAIL = RateLimitPolicy("email_day", "email", 100, 86400)
+PER_PAIR = RateLimitPolicy("ip_email", "ip_email", 5, 60)
+PER_ROUTE = RateLimitPolicy("route", "route", 5000, 60)
+
+
+def test_keys_are_compact_and_hide_identities() -> None:
+    email = "someone.with.a.very.long.address@example.com"
+    key = policy_key("login", PER_PAIR, "203.0.113.7", email)
+    assert key is not None
+    assert key.startswith("rl:login:ip_email:")
+    assert len(key) == len("rl:login:ip_email:") + 12
+    assert "example" not in key and "203.0" not in key
+
+
+def test_email_scope_is_case_insensitive_and_optional() -> None:
+    assert policy_key("login", PER_EMAIL, "1.1.1.1", "A@x.com") == policy_key(
+        "login", PER_EMAIL, "2.2.2.2", "a@X.com"
+    )
+    assert policy_key("login", PER_EMAIL, "1.1.1.1", None) is None
+    assert policy_key("login", PER_ROUTE, "1.1.1.1", None) == "rl:login:route"
@@ -0,0 +1,76 @@
+# app/tests/unit/test_rate_limiter.py
+from typing import Any, List, Tuple
+
+import pytest
+from starlette.requests import Request
+
+from app.core.local_rate_limiter import LocalRateTier
+from app.core.rate_limit_scripts import RATE_LIMIT_SCRIPTS
+from app.core.rate_limiter import UNKNOWN_CLIENT, RateLimiter, client_ip_of
+from app.tests.unit.test_local_rate_limiter import FakeRedis
+
+
+def login_counters(ip: str) -> List[Tuple[str, int, int]]:
+    # Per-IP limit of 3, route-wide limit of 10
+    return [(f"rl:login:ip:{ip}", 3, 60), ("rl:login:route", 10, 60)]
+
+
+async def flood_then_other_ip(limiter: RateLimiter) -> Tuple[int, bool]:
+    allowed = 0
+    for _ in range(50):
+        allowed += (await limiter.hit_many(login_counters("attacker"))).allowed
+    other = await limiter.hit_many(login_counters("someone-else"))
+    return allowed, other.allowed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", sorted(RATE_LIMIT_SCRIPTS))
+async def test_rejected_requests_do_not_use_up_route_limit(algorithm: str) -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    redis: Any = fakeredis.FakeAsyncRedis(decode_responses=True)
+    limiter = RateLimiter(redis, limit=3, window=60, algorithm=algorithm)
+
+    allowed, other_allowed = await flood_then_other_ip(limiter)
+
+    assert allowed == 3
+    assert other_allowed
+    # Only the 4 allowed requests used the route limit of 10
+    others = [await limiter.hit_many(login_counters(f"ip{i}")) for i in range(7)]
+    assert [d.allowed for d in others] == [True] * 6 + [False]
+
+
+@pytest.mark.asyncio
+async def test_rejected_requests_do_not_use_up_route_limit_locally() -> None:
+    redis: Any = FakeRedis()
+    tier = LocalRateTier(allowance=1, sync_interval=1, max_keys=100)
+    limiter = RateLimiter(redis, limit=3, window=60, local=tier)
+
+    allowed, other_allowed = await flood_then_other_ip(limiter)
+    await tier.flush(redis)
+
+    assert allowed == 3
+    assert other_allowed
+    route_counts = [v for k, v in redis.data.items() if k.startswith("rl:login:route")]
+    assert route_counts == [4]
+
+
+@pytest.mark.asyncio
+async def test_check_only_counters_are_not_counted() -> None:
+    redis: Any = FakeRedis()
+    tier = LocalRateTier(allowance=0, sync_interval=1, max_keys=100)
+    limiter = RateLimiter(redis, limit=3, window=60, local=tier)
+    counters = [("rl:login:ip", 100, 60), ("rl:login:email_day", 2, 86400)]
+
+    for _ in range(5):  # successful logins: checked, never counted
+        assert (await limiter.hit_many(counters, {"rl:login:email_day"})).allowed
+    for _ in range(2):  # failed logins
+        await limiter.hit_many(counters[1:])
+    assert not (await limiter.hit_many(counters, {"rl:login:email_day"})).allowed
+
+
+def test_request_without_client_address_has_a_shared_identity() -> None:
+    request = Request({"type": "http", "client": None, "headers": []})
+    assert client_ip_of(request) == UNKNOWN_CLIENT
+    request = Request({"type": "http", "client": ("203.0.113.7", 5000), "headers": []})
+    assert client_ip_of(request) == "203.0.113.7"
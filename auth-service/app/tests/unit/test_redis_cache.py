@@ -0,0 +1,29 @@
+# app/tests/unit/test_redis_cache.py
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limiter import get_rate_limiter
+from app.core.redis_cache import RedisManager
+
+
+@pytest.mark.asyncio
+async def test_one_pool_shared_by_every_user() -> None:
+    manager = RedisManager(settings.redis)
+    await manager.start()
+    client = manager.client
+    assert manager.client is client
+    assert get_rate_limiter(client).redis is client
+
+    pool = client.connection_pool
+    assert pool.max_connections == settings.redis.max_connections
+    assert pool.connection_kwargs["db"] == settings.redis.db
+    assert pool.connection_kwargs["socket_timeout"] == settings.redis.socket_timeout
+    assert manager.stats() == {
+        "max_connections": settings.redis.max_connections,
+        "in_use": 0,
+        "idle": 0,
+    }
+
+    await manager.close()
+    assert manager.client is not client  # reopened lazily after close
+    await manager.close()
@@ -0,0 +1,75 @@
+# app/tests/unit/test_redis_scripts.py
+from typing import Any, List, Set, Tuple
+
+import pytest
+from redis.exceptions import NoScriptError
+
+from app.core.redis_scripts import LuaScript, execute_pipeline
+
+SCRIPT = LuaScript("return KEYS[1]")
+
+
+class StubRedis:
+    """Records round trips; knows only the scripts loaded into it."""
+
+    def __init__(self) -> None:
+        self.loaded: Set[str] = set()
+        self.round_trips: List[str] = []
+
+    def _evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        if sha not in self.loaded:
+            raise NoScriptError("NOSCRIPT No matching script.")
+        return keys_and_args[0]
+
+    async def evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        self.round_trips.append("EVALSHA")
+        return self._evalsha(sha, numkeys, *keys_and_args)
+
+    async def script_load(self, source: str) -> str:
+        self.round_trips.append("SCRIPT LOAD")
+        assert source == SCRIPT.source
+        self.loaded.add(SCRIPT.sha)
+        return SCRIPT.sha
+
+    def pipeline(self, transaction: bool = True) -> "StubPipeline":
+        return StubPipeline(self)
+
+
+class StubPipeline:
+    def __init__(self, redis: StubRedis) -> None:
+        self.redis = redis
+        self.commands: List[Tuple[Any, ...]] = []
+
+    def evalsha(self, *args: Any) -> None:
+        self.commands.append(args)
+
+    async def execute(self) -> List[Any]:
+        self.redis.round_trips.append(f"PIPELINE x{len(self.commands)}")
+        return [self.redis._evalsha(*command) for command in self.commands]
+
+
+@pytest.mark.asyncio
+async def test_call_is_one_evalsha_once_loaded() -> None:
+    redis: Any = StubRedis()
+    assert await SCRIPT(redis, ["first"], []) == "first"
+    assert redis.round_trips == ["EVALSHA", "SCRIPT LOAD", "EVALSHA"]
+
+    redis.round_trips.clear()
+    assert await SCRIPT(redis, ["second"], []) == "second"
+    assert redis.round_trips == ["EVALSHA"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_is_one_round_trip_once_loaded() -> None:
+    redis: Any = StubRedis()
+
+    def build(pipe: Any) -> None:
+        for key in ("a", "b", "c"):
+            SCRIPT.queue(pipe, [key], [])
+
+    assert await execute_pipeline(redis, build, [SCRIPT]) == ["a", "b", "c"]
+    assert redis.round_trips == ["PIPELINE x3", "SCRIPT LOAD", "PIPELINE x3"]
+
+    redis.round_trips.clear()
+    assert await execute_pipeline(redis, build, [SCRIPT]) == ["a", "b", "c"]
+    assert redis.round_trips == ["PIPELINE x3"]
@@ -0,0 +1,79 @@
+# app/tests/unit/test_replica_routing.py
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import replicas
+from app.db.replicas import Replica, ReplicaRouter, RoutingSession
+from app.db.session import engine
+
+
+def make_replica(host: str, latency: float) -> Replica:
+    replica = Replica(host, SimpleNamespace(sync_engine=host))  # type: ignore[arg-type]
+    replica.healthy = True
+    replica.latency = latency
+    return replica
+
+
+def make_router(strategy: str, *replica_list: Replica) -> ReplicaRouter:
+    return ReplicaRouter(
+        list(replica_list),
+        strategy=strategy,
+        max_lag=1.0,
+        check_interval=1.0,
+        read_your_writes=5.0,
+    )
+
+
+def test_strategies_skip_unhealthy_replicas() -> None:
+    fast, slow = make_replica("fast", 0.001), make_replica("slow", 0.01)
+
+    round_robin = make_router("round_robin", fast, slow)
+    assert [round_robin.choose().host for _ in range(4)] == [  # type: ignore[union-attr]
+        "fast",
+        "slow",
+        "fast",
+        "slow",
+    ]
+    least_latency = make_router("least_latency", slow, fast)
+    assert least_latency.choose() is fast
+
+    fast.healthy = slow.healthy = False
+    assert round_robin.choose() is None
+
+
+def test_read_your_writes_window() -> None:
+    router = make_router("round_robin", make_replica("a", 0.001))
+    router.mark_written("new@example.com")
+    assert router.recently_written("new@example.com")
+    assert not router.recently_written("other@example.com")
+
+
+def test_session_sticks_to_replica_and_flushes_on_primary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first, second = make_replica("a", 0.001), make_replica("b", 0.001)
+    monkeypatch.setattr(
+        replicas, "replica_router", make_router("round_robin", first, second)
+    )
+
+    session = RoutingSession(info={"read_only": True})
+    assert session.get_bind() is first.engine.sync_engine
+    assert session.get_bind() is first.engine.sync_engine
+
+    session.info["primary"] = True  # read-your-writes / miss fallback
+    assert session.get_bind() is engine.sync_engine
+
+    writer = RoutingSession()
+    assert writer.get_bind() is engine.sync_engine
+
+
+def test_read_session_without_healthy_replica_uses_primary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    router = make_router("round_robin")
+    monkeypatch.setattr(replicas, "replica_router", router)
+
+    session = RoutingSession(info={"read_only": True})
+    assert session.get_bind() is engine.sync_engine
+    assert router.primary_reads == 1
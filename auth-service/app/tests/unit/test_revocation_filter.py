@@ -0,0 +1,139 @@
+# app/tests/unit/test_revocation_filter.py
+import asyncio
+import time
+import uuid
+from typing import Any, Callable, List
+
+import pytest
+
+from app.services.revocation_filter import (
+    RevocationFilter,
+    bucket_expires_at,
+    bucket_key,
+    revocation_id,
+)
+
+
+class StubConnection:
+    def __init__(self) -> None:
+        self.callbacks: List[Callable[[Any], None]] = []
+
+    def register_connect_callback(self, callback: Callable[[Any], None]) -> None:
+        self.callbacks.append(callback)
+
+    def deregister_connect_callback(self, callback: Callable[[Any], None]) -> None:
+        self.callbacks.remove(callback)
+
+
+class StubPubSub:
+    """Subscribes, then fails every read with a non-Redis error."""
+
+    def __init__(self) -> None:
+        self.connection = StubConnection()
+        self.closed = False
+
+    async def subscribe(self, *channels: str) -> None:
+        pass
+
+    async def get_message(self, timeout: float) -> Any:
+        raise RuntimeError("unexpected")
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class StubRedis:
+    def __init__(self) -> None:
+        self.pubsubs: List[StubPubSub] = []
+
+    def pubsub(self, **kwargs: Any) -> StubPubSub:
+        self.pubsubs.append(StubPubSub())
+        return self.pubsubs[-1]
+
+    async def scan(self, *args: Any, **kwargs: Any) -> Any:
+        raise RuntimeError("unexpected")
+
+
+async def run_until_retried(start: Callable[[Any], None], redis: StubRedis) -> bool:
+    """Start a pub/sub task on ``redis``; whether it kept retrying."""
+    start(redis)
+    for _ in range(100):
+        if len(redis.pubsubs) >= 3:
+            return True
+        await asyncio.sleep(0)
+    return False
+
+
+def make_filter(max_entries: int = 10) -> RevocationFilter:
+    revocations = RevocationFilter(max_entries, prune_interval=60, retry_delay=1)
+    revocations.ready = True  # as after a successful sync
+    return revocations
+
+
+def test_contains_until_exp() -> None:
+    revocations = make_filter()
+    now = time.time()
+    revocations.add("live", now + 60)
+    revocations.add("expired", now - 1)
+    assert revocations.contains("live")
+    assert not revocations.contains("expired")
+    assert not revocations.contains("unknown")
+
+
+def test_pubsub_message_and_resync_marker() -> None:
+    revocations = make_filter()
+    exp = int(time.time()) + 60
+    revocations._handle({"type": "message", "data": f"abc {exp}"})
+    revocations._handle({"type": "message", "data": "sync 1234"})
+    assert revocations.contains("abc")
+    assert revocations.messages == 1
+
+
+def test_overflow_falls_back_to_redis() -> None:
+    revocations = make_filter(max_entries=2)
+    now = time.time()
+    revocations.add("a", now - 1)  # expired: pruned to make room
+    revocations.add("b", now + 60)
+    revocations.add("c", now + 60)
+    assert revocations.ready
+
+    revocations.add("d", now + 60)
+    assert not revocations.ready  # incomplete: callers must ask Redis
+    assert revocations.overflows == 1
+
+
+def test_generation_never_moves_backwards() -> None:
+    revocations = make_filter()
+    expires_at = time.time() + 60
+    assert revocations.generation("user") == 0
+    revocations._handle({"type": "message", "data": f"gen user 2 {expires_at:.0f}"})
+    revocations.set_generation("user", 1, expires_at)  # late, out-of-order bump
+    assert revocations.generation("user") == 2
+
+    revocations.set_generation("gone", 5, time.time() - 1)
+    assert revocations.generation("gone") == 0
+
+
+def test_revocation_ids_and_buckets() -> None:
+    jti = str(uuid.uuid4())
+    assert revocation_id(jti) == uuid.UUID(jti).bytes
+    assert len(revocation_id("not-a-uuid")) == 16
+
+    assert bucket_key(7199) == bucket_key(3600) != bucket_key(7200)
+    assert bucket_expires_at(3600) == bucket_expires_at(7199) == 7200
+
+    revocations = make_filter()
+    revocations.add(jti, time.time() + 60)
+    assert revocations.contains(jti)
+    assert revocation_id(jti) in revocations._revoked  # stored as 16 bytes
+
+
+@pytest.mark.asyncio
+async def test_sync_survives_unexpected_errors_and_releases_pubsub() -> None:
+    revocations = RevocationFilter(10, prune_interval=60, retry_delay=0)
+    redis = StubRedis()
+    assert await run_until_retried(revocations.start, redis)
+    assert not revocations.ready
+    await revocations.stop()
+
+    assert all(p.closed and not p.connection.callbacks for p in redis.pubsubs)
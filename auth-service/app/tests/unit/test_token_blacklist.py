@@ -0,0 +1,96 @@
+# app/tests/unit/test_token_blacklist.py
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, List, Optional
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.lru_cache import TTLCache
+from app.core.principal import Principal
+from app.db import crud
+from app.services import token_blacklist
+from app.services.token_blacklist import is_revoked
+
+
+class StubPipeline:
+    def __init__(self, redis: "StubRedis") -> None:
+        self.redis = redis
+        self.commands: List[str] = []
+
+    def exists(self, key: str) -> None:
+        self.commands.append("EXISTS")
+
+    def sismember(self, key: str, member: bytes) -> None:
+        self.commands.append("SISMEMBER")
+
+    def get(self, key: str) -> None:
+        self.commands.append("GET")
+
+    async def execute(self) -> List[Any]:
+        self.redis.round_trips.append(self.commands)
+        if self.redis.generation is None:
+            raise RedisConnectionError("down")
+        return [0, 0, self.redis.generation]
+
+
+class StubRedis:
+    """Answers blacklist lookups: never listed, at a fixed generation (None: down)."""
+
+    def __init__(self, generation: Optional[str]) -> None:
+        self.generation = generation
+        self.round_trips: List[List[str]] = []
+
+    def pipeline(self, transaction: bool = True) -> StubPipeline:
+        return StubPipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_revocation_lookup_is_one_round_trip(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis = StubRedis(generation="2")
+    monkeypatch.setattr(token_blacklist, "redis_manager", SimpleNamespace(client=redis))
+    monkeypatch.setattr(token_blacklist.revocation_filter, "ready", False)
+
+    assert await is_revoked(Principal("a@example.com", "user", jti="j", gen=1))
+    assert not await is_revoked(Principal("a@example.com", "user", jti="j", gen=2))
+    assert redis.round_trips == [["EXISTS", "SISMEMBER", "GET"]] * 2
+
+
+@pytest.mark.asyncio
+async def test_database_fallback_once_per_breaker_open_period(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    breaker = CircuitBreaker(
+        "blacklist",
+        fail_open=True,
+        failure_threshold=1,
+        reset_timeout=5,
+        call_timeout=1,
+        clock=lambda: 0.0,
+    )
+    sessions: List[str] = []
+
+    @asynccontextmanager
+    async def session() -> AsyncIterator[None]:
+        sessions.append("primary")
+        yield
+
+    async def get_token_generation(db: Any, email: str) -> int:
+        return 2
+
+    monkeypatch.setattr(token_blacklist, "blacklist_breaker", breaker)
+    monkeypatch.setattr(token_blacklist, "AsyncSessionLocal", session)
+    monkeypatch.setattr(crud, "get_token_generation", get_token_generation)
+    monkeypatch.setattr(
+        token_blacklist, "redis_manager", SimpleNamespace(client=StubRedis(None))
+    )
+    monkeypatch.setattr(token_blacklist.revocation_filter, "ready", False)
+    monkeypatch.setattr(token_blacklist, "database_generations", TTLCache(10))
+
+    principal = Principal("a@example.com", "user", jti="j", gen=1)
+    for _ in range(5):
+        assert await is_revoked(principal)
+    assert sessions == ["primary"]
@@ -0,0 +1,56 @@
+# app/tests/unit/test_token_cache.py
+import jwt
+import pytest
+
+from app.core.lru_cache import TTLCache
+from app.core.security import create_access_token
+from app.core.token_cache import token_digest, verified_token_cache, verify_token
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries_at_their_own_deadline() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_entries=10, clock=clock)
+    cache.set("a", 1, expires_at=1010)
+    cache.set("b", 2, expires_at=1100)
+
+    clock.now = 1050
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used_by_count_and_bytes() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, max_bytes=250)
+    cache.set("a", 1, expires_at=float("inf"), size=100)
+    cache.set("b", 2, expires_at=float("inf"), size=100)
+    assert cache.get("a") == 1  # "b" is now least recently used
+
+    cache.set("c", 3, expires_at=float("inf"), size=100)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.set("d", 4, expires_at=float("inf"), size=200)
+    assert len(cache) == 1
+    assert cache.stats()["evictions"] == 3
+
+
+def test_verify_token_caches_by_full_token() -> None:
+    token = create_access_token(email="cache@example.com", role="user")
+    verified_token_cache.pop(token_digest(token))
+    hits = verified_token_cache.hits
+
+    assert verify_token(token).email == "cache@example.com"
+    assert verify_token(token).email == "cache@example.com"
+    assert verified_token_cache.hits == hits + 1
+
+    # A tampered signature must not hit the cached entry.
+    with pytest.raises(jwt.PyJWTError):
+        verify_token(token[:-2] + ("AA" if token[-2:] != "AA" else "BB"))
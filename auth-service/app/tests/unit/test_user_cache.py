@@ -0,0 +1,107 @@
+# app/tests/unit/test_user_cache.py
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from app.core.circuit_breaker import user_cache_breaker
+from app.core.config import UserCacheSettings
+from app.db.models import UserRole
+from app.services.user_cache import (
+    STALE_READ_MARGIN,
+    CachedUser,
+    UserCache,
+    stale_read_window,
+    user_digest,
+)
+from app.tests.unit.test_revocation_filter import StubRedis, run_until_retried
+
+USER = CachedUser(
+    id=7,
+    email="alice@example.com",
+    role=UserRole.ADMIN,
+    is_active=True,
+    token_generation=3,
+    hashed_password="$2b$12$hash",
+    cached_at=1700000000.0,
+)
+
+
+def test_shared_record_omits_password_hash_by_default() -> None:
+    record = USER.dumps(with_password=False)
+    assert "$2b$" not in record
+    assert len(json.loads(record)) == 7
+
+    restored = CachedUser.loads(record)
+    assert restored.hashed_password is None
+    assert restored._replace(hashed_password=USER.hashed_password) == USER
+
+    assert CachedUser.loads(USER.dumps(with_password=True)) == USER
+
+
+def test_local_tier_only_while_subscribed_and_dropped_on_invalidation() -> None:
+    cache = UserCache(UserCacheSettings())  # type: ignore[call-arg]
+    digest = user_digest(USER.email)
+
+    cache._set_local(digest, USER)
+    assert len(cache.local) == 0  # not subscribed: invalidations could be missed
+
+    cache.subscribed = True
+    cache._set_local(digest, USER)
+    assert cache.local.get(digest) == USER
+
+    epoch = cache._epoch
+    cache._drop(digest)  # as on a message from another worker
+    assert cache.local.get(digest) is None
+    assert cache._epoch == epoch + 1
+
+
+def test_invalidated_user_is_not_refilled_within_stale_read_window() -> None:
+    cache = UserCache(UserCacheSettings())  # type: ignore[call-arg]
+    cache.subscribed = True
+    digest = user_digest(USER.email)
+
+    cache._drop(digest)
+    assert cache._held.get(digest)
+    assert stale_read_window() >= STALE_READ_MARGIN
+
+    # A replica read returning the pre-write record must not be cached
+    row = SimpleNamespace(**USER._asdict())
+    filled = asyncio.run(cache._fill(row, cache._epoch))  # type: ignore[arg-type]
+    assert filled is not None and filled.email == USER.email
+    assert cache.local.get(digest) is None
+
+
+def test_login_lookup_skips_shared_tier_without_password_hashes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = UserCache(UserCacheSettings())  # type: ignore[call-arg]
+    lookups: List[Any] = []
+
+    async def guard(func: Any, fail_open_value: Any) -> str:
+        lookups.append(func)
+        return USER.dumps(with_password=False)
+
+    monkeypatch.setattr(user_cache_breaker, "guard", guard)
+    digest = user_digest(USER.email)
+
+    assert asyncio.run(cache._cached(digest, with_password=True)) is None
+    assert lookups == []  # a shared record could never have the hash
+    assert asyncio.run(cache._cached(digest, with_password=False)) is not None
+    assert len(lookups) == 1
+
+
+@pytest.mark.asyncio
+async def test_subscriber_survives_unexpected_errors_and_releases_pubsub(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("app.services.user_cache.RETRY_DELAY", 0)
+    cache = UserCache(UserCacheSettings())  # type: ignore[call-arg]
+    redis = StubRedis()
+    assert await run_until_retried(cache.start, redis)
+    assert not cache.subscribed
+    await cache.stop()
+
+    assert all(p.closed and not p.connection.callbacks for p in redis.pubsubs)
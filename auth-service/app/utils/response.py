@@ -3,7 +3,7 @@ File: app/utils/response.py
 Standardized JSON response helpers for API endpoints.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from fastapi import status
 from fastapi.responses import JSONResponse
@@ -33,7 +33,12 @@ def success_response(data: Any, message: str = "Success") -> JSONResponse:
     return JSONResponse(status_code=status.HTTP_200_OK, content=response_content)
 
 
-def error_response(code: int, message: str, details: Any = None) -> JSONResponse:
+def error_response(
+    code: int,
+    message: str,
+    details: Any = None,
+    headers: Mapping[str, str] | None = None,
+) -> JSONResponse:
     """
     Standardized JSON response for API errors.
 
@@ -45,6 +50,8 @@ def error_response(code: int, message: str, details: Any = None) -> JSONResponse
         Human-readable error message.
     details : Any, optional
         Optional additional information about the error.
+    headers : Mapping[str, str], optional
+        Extra response headers (e.g. ``Retry-After``).
 
     Returns
     -------
@@ -54,4 +61,4 @@ def error_response(code: int, message: str, details: Any = None) -> JSONResponse
     response_content: Dict[str, Any] = {"status": "error", "message": message}
     if details is not None:
         response_content["details"] = details
-    return JSONResponse(status_code=code, content=response_content)
+    return JSONResponse(status_code=code, content=response_content, headers=headers)
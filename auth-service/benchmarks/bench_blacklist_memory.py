@@ -0,0 +1,100 @@
+"""
+File: benchmarks/bench_blacklist_memory.py
+Redis memory used by the token blacklist in each storage layout.
+
+Writes ``--count`` revocations with expiries spread over ``--hours`` hours,
+as ``add_to_blacklist`` does in ``keys`` mode (one ``bl:<jti>`` key each)
+and in ``buckets`` mode (16-byte IDs in one ``blb:<hour>`` set per hour),
+measures ``used_memory`` and extrapolates to ``--target`` revocations.
+
+Needs a real Redis server; the chosen ``--db`` must be empty and is flushed
+between runs.
+
+Usage
+-----
+    uv run python -m benchmarks.bench_blacklist_memory --db 15 --count 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.services.revocation_filter import (
+    KEY_PREFIX,
+    bucket_expires_at,
+    bucket_key,
+    revocation_id,
+)
+
+BATCH = 10000
+
+
+async def used_memory(redis: Redis) -> int:
+    """``used_memory`` from ``INFO memory``, in bytes."""
+    info = await redis.info("memory")
+    return int(info["used_memory"])
+
+
+async def fill(redis: Redis, storage: str, count: int, hours: int) -> None:
+    """Write ``count`` revocations in ``storage`` layout."""
+    now = int(time.time())
+    for start in range(0, count, BATCH):
+        pipe = redis.pipeline(transaction=False)
+        for _ in range(min(BATCH, count - start)):
+            jti = str(uuid.uuid4())
+            exp = now + random.randint(60, hours * 3600)
+            if storage == "buckets":
+                pipe.sadd(bucket_key(exp), revocation_id(jti))
+                pipe.expireat(bucket_key(exp), bucket_expires_at(exp))
+            else:
+                pipe.setex(f"{KEY_PREFIX}{jti}", exp - now, "revoked")
+        await pipe.execute()
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=int, default=15, help="Empty Redis DB to use")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument(
+        "--hours", type=int, default=settings.jwt.refresh_expire_days * 24
+    )
+    parser.add_argument("--target", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    redis = Redis(
+        host=settings.redis.host,
+        port=settings.redis.port,
+        password=settings.redis.password,
+        db=args.db,
+    )
+    if await redis.dbsize():
+        print(f"Redis DB {args.db} is not empty; pick an empty --db", file=sys.stderr)
+        return 1
+
+    print(
+        f"{args.count:,} revocations over {args.hours} h, "
+        f"extrapolated to {args.target:,}"
+    )
+    print(f"{'storage':<8} {'keys':>10} {'bytes/token':>12} {'at target':>12}")
+    try:
+        for storage in ("keys", "buckets"):
+            before = await used_memory(redis)
+            await fill(redis, storage, args.count, args.hours)
+            per_token = (await used_memory(redis) - before) / args.count
+            keys = await redis.dbsize()
+            at_target = per_token * args.target / 2**30
+            print(f"{storage:<8} {keys:>10,} {per_token:>12.1f} {at_target:>10.2f} GiB")
+            await redis.flushdb()
+    finally:
+        await redis.aclose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,91 @@
+"""
+File: benchmarks/bench_hashing.py
+p99 latency of ``/api/v1/health/server`` while bcrypt logins run concurrently.
+
+Compares the old synchronous ``verify_password`` call inside the handler
+("before") with ``verify_password_async`` ("after").
+
+Usage
+-----
+    uv run python -m benchmarks.bench_hashing --logins 40 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+
+from app.core.hashing import hash_password, verify_password, verify_password_async
+from app.main import app
+
+PASSWORD = "StrongPassword$123"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (milliseconds)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(
+    name: str,
+    verify: Callable[[str, str], Awaitable[bool]],
+    hashed: str,
+    logins: int,
+    concurrency: int,
+) -> None:
+    """Probe the health route every 10 ms while ``logins`` verifications run."""
+    latencies: List[float] = []
+    done = asyncio.Event()
+
+    async def login_worker(count: int) -> None:
+        for _ in range(count):
+            await verify(PASSWORD, hashed)
+
+    async def prober(client: AsyncClient) -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/api/v1/health/server")
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        probe_task = asyncio.create_task(prober(client))
+        per_worker = max(1, logins // concurrency)
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker(per_worker) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    print(
+        f"{name:<8} logins={per_worker * concurrency:<4} "
+        f"wall={elapsed:6.2f}s probes={len(latencies):<4} "
+        f"p50={statistics.median(latencies):8.2f}ms "
+        f"p99={percentile(latencies, 99):8.2f}ms"
+    )
+
+
+async def main(logins: int, concurrency: int) -> None:
+    hashed = hash_password(PASSWORD)
+
+    async def verify_blocking(plain: str, hashed_pw: str) -> bool:
+        # What the login handler did before: bcrypt on the event loop.
+        return verify_password(plain, hashed_pw)
+
+    await run_scenario("before", verify_blocking, hashed, logins, concurrency)
+    await run_scenario("after", verify_password_async, hashed, logins, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency))
@@ -0,0 +1,68 @@
+"""
+File: benchmarks/bench_jwt_algorithms.py
+Sign and verify cost per JWT algorithm through the service's KeyRing.
+
+Usage
+-----
+    uv run python -m benchmarks.bench_jwt_algorithms --iterations 2000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from cryptography.hazmat.primitives import serialization
+
+from app.core.keys import ASYMMETRIC_ALGORITHMS, KeyRing, generate_private_key
+
+
+def per_call_us(fn: Callable[[], Any], iterations: int) -> float:
+    for _ in range(min(100, iterations)):  # warm-up
+        fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def build_ring(algorithm: str, keys_dir: Path) -> KeyRing:
+    if algorithm == "HS256":
+        return KeyRing.load("HS256", "bench-secret-" + "x" * 32, None, None)
+    key = generate_private_key(algorithm)
+    (keys_dir / f"{algorithm}.pem").write_bytes(
+        key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    return KeyRing.load(algorithm, None, str(keys_dir), algorithm)
+
+
+def main(iterations: int) -> None:
+    now = datetime.now(timezone.utc)
+    payload: Dict[str, Any] = {
+        "email": "bench@example.com",
+        "role": "user",
+        "iat": now,
+        "exp": now + timedelta(minutes=15),
+    }
+    print(f"{'algorithm':<10} {'sign us':>10} {'verify us':>10} {'token bytes':>12}")
+    for algorithm in ("HS256",) + ASYMMETRIC_ALGORITHMS:
+        with tempfile.TemporaryDirectory() as tmp:
+            keys_dir = Path(tmp)
+            ring = build_ring(algorithm, keys_dir)
+        token = ring.encode(payload)
+        sign = per_call_us(lambda: ring.encode(payload), iterations)
+        verify = per_call_us(lambda: ring.decode(token), iterations)
+        print(f"{algorithm:<10} {sign:10.1f} {verify:10.1f} {len(token):12d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.iterations)
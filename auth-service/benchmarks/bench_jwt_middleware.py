@@ -0,0 +1,106 @@
+"""
+File: benchmarks/bench_jwt_middleware.py
+Requests/sec on ``/api/v1/users/profile``: BaseHTTPMiddleware vs pure ASGI.
+
+The app is driven directly through the ASGI interface (no HTTP client or
+sockets) so the numbers reflect the middleware and routing stack only.
+
+Usage
+-----
+    uv run python -m benchmarks.bench_jwt_middleware --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message
+
+from app.api.v1 import api_v1_router
+from app.core.middleware import JWTAuthMiddleware
+from app.core.principal import Principal
+from app.core.security import create_access_token, decode_token
+
+PATH = "/api/v1/users/profile"
+
+
+class LegacyJWTMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this benchmark replaces."""
+
+    async def dispatch(self, request: Request, call_next: Any) -> Any:
+        auth: HTTPAuthorizationCredentials = await HTTPBearer(auto_error=False)(request)
+        if auth:
+            try:
+                principal = Principal.from_claims(decode_token(auth.credentials))
+                request.state.principal = principal
+            except Exception:
+                raise HTTPException(status_code=401, detail="Invalid token")
+        return await call_next(request)
+
+
+def build_app(middleware: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+    app.include_router(api_v1_router, prefix="/api/v1")
+    return app
+
+
+async def call(app: ASGIApp, headers: List[tuple[bytes, bytes]]) -> int:
+    """Send one GET through ``app`` and return the status code."""
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(name: str, app: ASGIApp, token: str, requests: int) -> None:
+    headers = [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())]
+    for _ in range(200):  # warm-up
+        assert await call(app, headers) == 200
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, headers)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<18} {requests / elapsed:10.0f} req/s "
+        f"{elapsed / requests * 1e6:8.1f} us/req"
+    )
+
+
+async def main(requests: int) -> None:
+    token = create_access_token(email="bench@example.com", role="user")
+    await measure("BaseHTTPMiddleware", build_app(LegacyJWTMiddleware), token, requests)
+    await measure("pure ASGI", build_app(JWTAuthMiddleware), token, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,116 @@
+"""
+File: benchmarks/bench_login_query.py
+Login user lookup: full ORM entity vs. the lean hot-path query.
+
+Compares ``crud.get_user_by_email`` (``select(User)``, ORM entity, identity
+map) with ``crud.get_auth_user_by_email`` (lambda statement over
+``AUTH_COLUMNS``, plain row). Each call uses a fresh session, as a login
+request does. Reports per-call latency and rows/sec.
+
+The default mode queries the database in ``DB_URI`` for an existing
+``--email``. ``--offline`` needs no database: it runs the same two functions
+against a stub session and times only what happens in Python before the
+query is sent (statement construction and cache key), which is where the
+two differ most.
+
+Usage
+-----
+    uv run python -m benchmarks.bench_login_query --email alice@example.com
+    uv run python -m benchmarks.bench_login_query --offline
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.db import crud
+from app.db.session import AsyncSessionLocal, engine
+
+
+def report(name: str, samples: List[float], unit: str = "rows") -> None:
+    """Print p50/p99 in microseconds and throughput of ``samples`` (seconds)."""
+    samples.sort()
+    p50 = statistics.median(samples) * 1e6
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1e6
+    rate = len(samples) / sum(samples)
+    print(f"{name:<28} p50 {p50:>9.1f} us  p99 {p99:>9.1f} us  {rate:>10,.0f} {unit}/s")
+
+
+async def bench_db(email: str, calls: int) -> int:
+    variants: Dict[str, Callable[[Any, str], Awaitable[Any]]] = {
+        "crud.get_user_by_email": crud.get_user_by_email,
+        "crud.get_auth_user_by_email": crud.get_auth_user_by_email,
+    }
+    async with AsyncSessionLocal() as db:
+        if await crud.get_auth_user_by_email(db, email) is None:
+            print(f"No user {email!r} in the database", file=sys.stderr)
+            return 1
+    try:
+        for name, lookup in variants.items():
+            for _ in range(min(calls // 10, 500)):  # warm caches and the pool
+                async with AsyncSessionLocal() as db:
+                    await lookup(db, email)
+            samples = []
+            for _ in range(calls):
+                start = time.perf_counter()
+                async with AsyncSessionLocal() as db:
+                    await lookup(db, email)
+                samples.append(time.perf_counter() - start)
+            report(name, samples)
+    finally:
+        await engine.dispose()
+    return 0
+
+
+class OfflineSession:
+    """
+    Stands in for ``AsyncSession`` without a database: ``execute`` does what
+    SQLAlchemy does first with a statement, computing its cache key.
+    """
+
+    async def execute(self, statement: Any, *args: Any) -> "OfflineSession":
+        statement._generate_cache_key()
+        return self
+
+    def one_or_none(self) -> None:
+        return None
+
+    def scalar_one_or_none(self) -> None:
+        return None
+
+
+async def bench_offline(calls: int) -> int:
+    db: Any = OfflineSession()
+    variants: Dict[str, Callable[[Any, str], Awaitable[Any]]] = {
+        "crud.get_user_by_email": crud.get_user_by_email,
+        "crud.get_auth_user_by_email": crud.get_auth_user_by_email,
+    }
+    for name, lookup in variants.items():
+        samples = []
+        for i in range(calls):
+            start = time.perf_counter()
+            await lookup(db, f"user{i}@example.com")
+            samples.append(time.perf_counter() - start)
+        report(name, samples, unit="stmts")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--email", help="Existing user to look up")
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--offline", action="store_true", help="No database")
+    args = parser.parse_args()
+
+    if args.offline:
+        return asyncio.run(bench_offline(args.calls))
+    if not args.email:
+        parser.error("--email is required unless --offline")
+    return asyncio.run(bench_db(args.email, args.calls))
+
+
+if __name__ == "__main__":
+    sys.exit(main())